@@ -15,6 +15,10 @@ if [ -z "$VIRTUAL_ENV" ]; then
     fi
 fi
 
+echo "🗄️  Applying database migrations..."
+python3 scripts/migrations/migrate.py || exit 1
+echo ""
+
 echo "🔧 Starting FastAPI server on http://localhost:8000"
 echo "📖 API Docs available at http://localhost:8000/docs"
 echo ""
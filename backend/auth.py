@@ -3,7 +3,11 @@ JWT Authentication Module for Senegal Mass Times Platform
 Provides token-based authentication for parish administrators
 """
 
+import hashlib
 import os
+import threading
+import time
+from collections import OrderedDict
 from datetime import datetime, timedelta
 from typing import Optional
 from jose import JWTError, jwt
@@ -12,17 +16,25 @@ from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from sqlalchemy.orm import Session
 
+from database import get_db
+
 # Security configuration
 SECRET_KEY = os.getenv("SECRET_KEY", "09d25e094faa6ca2556c818166b7a9563b93f7099f6f0f4caa6cf63b88e8d3e7")
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 60 * 24  # 24 hours
 
-# Password hashing context
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# Password hashing context; hashes made with another work factor still
+# verify and are upgraded on the next login (see password_needs_rehash)
+BCRYPT_ROUNDS = int(os.getenv("BCRYPT_ROUNDS", "12"))
+pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto", bcrypt__rounds=BCRYPT_ROUNDS)
 
 # HTTP Bearer scheme for JWT tokens
 security = HTTPBearer()
 
+# Verified tokens and principals kept in memory (see TokenCache / PrincipalCache)
+TOKEN_CACHE_MAX_ENTRIES = int(os.getenv("TOKEN_CACHE_MAX_ENTRIES", "1024"))
+PRINCIPAL_CACHE_TTL_SECONDS = float(os.getenv("PRINCIPAL_CACHE_TTL_SECONDS", "30"))
+
 
 def get_password_hash(password: str) -> str:
     """
@@ -51,6 +63,11 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
     return pwd_context.verify(plain_password, hashed_password)
 
 
+def password_needs_rehash(hashed_password: str) -> bool:
+    """True if the hash was made with another scheme or work factor than BCRYPT_ROUNDS"""
+    return pwd_context.needs_update(hashed_password)
+
+
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
     """
     Create a JWT access token
@@ -75,6 +92,116 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -
     return encoded_jwt
 
 
+# ============ Token and Principal Caches ============
+
+class TokenCache:
+    """
+    Bounded LRU of verified token payloads, keyed by a hash of the token
+
+    A hit skips the signature check; entries are dropped once the token's
+    exp has passed, so an expired token is never accepted from the cache.
+    """
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[bytes, dict]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _key(token: str) -> bytes:
+        return hashlib.blake2b(token.encode(), digest_size=16).digest()
+
+    def get(self, token: str) -> Optional[dict]:
+        key = self._key(token)
+        with self._lock:
+            payload = self._entries.get(key)
+            if payload is None:
+                self.misses += 1
+                return None
+            if payload.get("exp", 0) <= time.time():
+                del self._entries[key]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return payload
+
+    def put(self, token: str, payload: dict):
+        with self._lock:
+            self._entries[self._key(token)] = payload
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"entries": len(self._entries), "hits": self.hits, "misses": self.misses}
+
+
+class PrincipalCache:
+    """
+    Short-lived cache of the account state behind a token (role, approval)
+
+    Loaded from the database on a miss and kept PRINCIPAL_CACHE_TTL_SECONDS.
+    The master admin endpoints that change that state call invalidate();
+    other server processes see the change when their entry expires.
+    """
+
+    def __init__(self, ttl_seconds: float):
+        self.ttl_seconds = ttl_seconds
+        self.hits = 0
+        self.misses = 0
+        self._entries = {}
+        self._lock = threading.Lock()
+
+    def get(self, db: Session, parish_id: int) -> Optional[dict]:
+        with self._lock:
+            entry = self._entries.get(parish_id)
+            if entry is not None and time.monotonic() - entry[1] <= self.ttl_seconds:
+                self.hits += 1
+                return entry[0]
+            self.misses += 1
+
+        import queries  # Import here to avoid circular dependency
+
+        row = db.execute(queries.PRINCIPAL_BY_ID, {"parish_id": parish_id}).first()
+        principal = None
+        if row is not None:
+            principal = {
+                "parish_id": row.id,
+                "email": row.admin_email,
+                "is_master_admin": bool(row.is_master_admin),
+                "is_approved": bool(row.is_approved),
+            }
+        with self._lock:
+            self._entries[parish_id] = (principal, time.monotonic())
+        return principal
+
+    def invalidate(self, parish_id: int):
+        with self._lock:
+            self._entries.pop(parish_id, None)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"entries": len(self._entries), "hits": self.hits, "misses": self.misses}
+
+
+token_cache = TokenCache(TOKEN_CACHE_MAX_ENTRIES)
+principal_cache = PrincipalCache(PRINCIPAL_CACHE_TTL_SECONDS)
+
+
+def invalidate_principal(parish_id: int):
+    """Drop the cached account state of a parish after changing it"""
+    principal_cache.invalidate(parish_id)
+
+
+def get_auth_cache_stats() -> dict:
+    return {"tokens": token_cache.stats(), "principals": principal_cache.stats()}
+
+
+# ============ Token Verification ============
+
 def verify_token(token: str) -> dict:
     """
     Verify and decode a JWT token
@@ -88,8 +215,12 @@ def verify_token(token: str) -> dict:
     Raises:
         HTTPException: If token is invalid or expired
     """
+    payload = token_cache.get(token)
+    if payload is not None:
+        return payload
     try:
         payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+        token_cache.put(token, payload)
         return payload
     except JWTError:
         raise HTTPException(
@@ -129,25 +260,31 @@ def get_current_parish_id(
 
 
 def get_current_user(
-    credentials: HTTPAuthorizationCredentials = Depends(security)
+    credentials: HTTPAuthorizationCredentials = Depends(security),
+    db: Session = Depends(get_db)
 ) -> dict:
     """
     Dependency to extract user info from JWT token (parish_id and is_master_admin)
 
+    The role and approval state come from the (cached) account, not from
+    the token, so a deleted, rejected or re-credentialed account stops
+    working without waiting for its tokens to expire.
+
     Args:
         credentials: HTTP Authorization credentials with Bearer token
+        db: Database session (shared with the endpoint)
 
     Returns:
-        Dictionary with parish_id and is_master_admin
+        Dictionary with parish_id, email, is_master_admin and is_approved
 
     Raises:
-        HTTPException: If token is invalid or missing required fields
+        HTTPException 401: If token is invalid or its account no longer matches
+        HTTPException 403: If the account is awaiting approval
     """
     token = credentials.credentials
     payload = verify_token(token)
 
     parish_id = payload.get("parish_id")
-    is_master_admin = payload.get("is_master_admin", False)
 
     if parish_id is None:
         raise HTTPException(
@@ -156,7 +293,21 @@ def get_current_user(
             headers={"WWW-Authenticate": "Bearer"},
         )
 
-    return {"parish_id": parish_id, "is_master_admin": is_master_admin}
+    principal = principal_cache.get(db, parish_id)
+    if principal is None or principal["email"] != payload.get("email"):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Token invalide",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+
+    if not principal["is_master_admin"] and not principal["is_approved"]:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Votre compte est en attente d'approbation par l'administrateur principal.",
+        )
+
+    return dict(principal)
 
 
 def get_current_parish(
@@ -179,9 +330,9 @@ def get_current_parish(
     Note:
         The db dependency will be properly injected when used in routes
     """
-    from backend_api import Parish  # Import here to avoid circular dependency
+    import queries  # Import here to avoid circular dependency
 
-    parish = db.query(Parish).filter(Parish.id == parish_id).first()
+    parish = queries.get_parish(db, parish_id)
     if not parish:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
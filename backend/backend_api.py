@@ -8,13 +8,17 @@ from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
 from database import engine, Base
+from responses import CompressionMiddleware
+from schema_migrations import check_schema_version
+import password_hashing
+import email_outbox
 
 # Import models to register them with SQLAlchemy
-from models import Diocese, Parish, MassTime, ParochialNews  # noqa: F401
+from models import Diocese, Parish, MassTime, ParochialNews, ChangeLog, BackfillCheckpoint, ArchivedNews, ThrottleBucket, EmailOutbox, EmailBroadcast  # noqa: F401
 
 # Re-export for backward compatibility
 # (routers, auth, and scripts all import from backend_api)
-from database import SessionLocal, get_db  # noqa: F401, F811
+from database import SessionLocal, get_db, get_async_db, get_async_read_db  # noqa: F401, F811
 from schemas import *  # noqa: F401, F403
 
 # ============ FastAPI App ============
@@ -35,11 +39,14 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+app.add_middleware(CompressionMiddleware)
+
 
 @app.on_event("startup")
 def startup():
-    """Create tables and initialize master admin on first run"""
-    Base.metadata.create_all(bind=engine)
+    """Check the schema version and initialize master admin on first run"""
+    # Migrations are applied by scripts/migrations/migrate.py, not here
+    check_schema_version(engine)
 
     master_email = os.getenv("MASTER_ADMIN_EMAIL")
     master_password = os.getenv("MASTER_ADMIN_PASSWORD")
@@ -68,6 +75,15 @@ def startup():
         finally:
             db.close()
 
+    password_hashing.start()
+    email_outbox.start_worker()
+
+
+@app.on_event("shutdown")
+def shutdown():
+    email_outbox.stop_worker()
+    password_hashing.shutdown()
+
 # ============ Include Routers ============
 
 from routers import auth, public, admin  # noqa: E402
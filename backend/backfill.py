@@ -0,0 +1,271 @@
+"""
+Batched, resumable data backfills
+
+A backfill walks one table in primary key order, a batch at a time:
+
+  1. read the next batch (id > checkpoint) in a short transaction
+  2. compute the new values, in a process pool for CPU-heavy work (bcrypt)
+  3. write the batch and advance the checkpoint in the same transaction
+
+Progress is kept in backfill_checkpoints, so a backfill that crashed or was
+interrupted resumes after its last committed batch. A completed backfill
+does nothing on later runs (pass restart to walk the table again), unless
+its filter only matches rows still to process (pending_only): then each run
+scans again from the first row and picks up rows that match it since, e.g.
+accounts created with an old password hash. Writes are guarded by
+the values read in step 1: a row the app modified in between is left alone
+and counted as skipped, never overwritten with stale data.
+
+Pauses between batches and an optional rows/second cap keep a backfill from
+starving the app of database locks (SQLite has a single writer) and CPU.
+
+Usage:
+    run_backfill("approve_legacy", Parish, ("is_approved",), approve,
+                 where=Parish.is_approved.is_(None), pending_only=True)
+"""
+
+import time as timer
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from typing import Callable, List, Optional, Sequence, Tuple
+
+from sqlalchemy import bindparam, select, update
+
+from database import SessionLocal
+from models import BackfillCheckpoint
+from sync import record_changes
+
+
+class BackfillStats:
+    def __init__(self):
+        self.batches = 0
+        self.read = 0
+        self.updated = 0
+        self.skipped = 0
+        self.last_id = 0
+
+
+# ============ Checkpoints ============
+
+def load_checkpoint(name: str, restart: bool = False, rescan: bool = False) -> BackfillCheckpoint:
+    """
+    Return the checkpoint of a backfill, creating it (or resetting it) as needed
+
+    restart starts over with fresh counts; rescan starts a new pass from the
+    first row of a completed backfill, keeping its counts.
+    """
+    db = SessionLocal()
+    try:
+        checkpoint = db.get(BackfillCheckpoint, name)
+        if checkpoint is None:
+            checkpoint = BackfillCheckpoint(name=name, last_id=0, rows_updated=0)
+            db.add(checkpoint)
+        elif restart:
+            checkpoint.last_id = 0
+            checkpoint.rows_updated = 0
+            checkpoint.completed_at = None
+        elif rescan and checkpoint.completed_at:
+            checkpoint.last_id = 0
+            checkpoint.completed_at = None
+        db.commit()
+        db.refresh(checkpoint)
+        db.expunge(checkpoint)
+        return checkpoint
+    finally:
+        db.close()
+
+
+def _advance_checkpoint(db, name: str, last_id: int, updated: int, completed: bool = False):
+    values = {
+        "last_id": last_id,
+        "rows_updated": BackfillCheckpoint.rows_updated + updated,
+        "updated_at": datetime.utcnow(),
+    }
+    if completed:
+        values["completed_at"] = datetime.utcnow()
+    db.execute(update(BackfillCheckpoint).where(BackfillCheckpoint.name == name).values(**values))
+
+
+# ============ Batches ============
+
+def read_batch(model, columns: Sequence[str], where, after_id: int, size: int) -> List[tuple]:
+    """(id, *columns) rows with id > after_id, in id order"""
+    stmt = select(model.id, *(getattr(model, c) for c in columns)).where(model.id > after_id)
+    if where is not None:
+        stmt = stmt.where(where)
+    db = SessionLocal()
+    try:
+        return [tuple(row) for row in db.execute(stmt.order_by(model.id).limit(size))]
+    finally:
+        db.close()
+
+
+def _guarded_update(model, columns: Sequence[str], changed: Tuple[str, ...]):
+    """UPDATE of `changed` for one id, only if `columns` still hold the values read"""
+    table = model.__table__
+    return (
+        update(table)
+        .where(table.c.id == bindparam("_id"))
+        .where(*(table.c[c].is_not_distinct_from(bindparam(f"_old_{c}")) for c in columns))
+        .values({c: bindparam(f"_new_{c}") for c in changed})
+    )
+
+
+def write_batch(
+    name: str,
+    model,
+    columns: Sequence[str],
+    rows: List[tuple],
+    results: List[Optional[dict]],
+    entity: Optional[str],
+) -> Tuple[int, int]:
+    """
+    Apply one batch and advance the checkpoint in a single transaction
+
+    Returns:
+        (rows updated, rows skipped because they changed since they were read)
+    """
+    # One executemany per set of changed columns (usually a single one)
+    groups = {}
+    for row, result in zip(rows, results):
+        if not result:
+            continue
+        params = {"_id": row[0]}
+        params.update({f"_old_{c}": value for c, value in zip(columns, row[1:])})
+        params.update({f"_new_{c}": value for c, value in result.items()})
+        groups.setdefault(tuple(sorted(result)), []).append(params)
+
+    attempted = sum(len(params) for params in groups.values())
+    db = SessionLocal()
+    try:
+        updated = 0
+        for changed, params in groups.items():
+            result = db.execute(_guarded_update(model, columns, changed), params)
+            sane = db.get_bind().dialect.supports_sane_multi_rowcount
+            updated += result.rowcount if sane else len(params)
+        if entity and groups:
+            record_changes(db, entity, [p["_id"] for params in groups.values() for p in params])
+        _advance_checkpoint(db, name, rows[-1][0], updated)
+        db.commit()
+        return updated, attempted - updated
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
+# ============ Runner ============
+
+def run_backfill(
+    name: str,
+    model,
+    columns: Sequence[str],
+    transform: Callable[[tuple], Optional[dict]],
+    where=None,
+    batch_size: int = 200,
+    workers: int = 1,
+    pause: float = 0.0,
+    max_rows_per_second: Optional[float] = None,
+    entity: Optional[str] = None,
+    restart: bool = False,
+    pending_only: bool = False,
+    log: Callable[[str], None] = print,
+) -> BackfillStats:
+    """
+    Run (or resume) a backfill to completion
+
+    Args:
+        name: Checkpoint key; reuse it to resume, change it for a new backfill
+        model: ORM model of the table to walk (integer primary key "id")
+        columns: Columns read for each row and passed to transform
+        transform: (col1, col2, ...) -> {column: new value}, or None to
+            leave the row as is. Must be a module-level function (or a
+            functools.partial of one) when workers > 1.
+        where: Optional filter on the rows to visit, e.g. only rows still to migrate
+        batch_size: Rows per transaction
+        workers: Processes running transform; 1 runs it inline
+        pause: Seconds to sleep after each batch
+        max_rows_per_second: Cap on the overall rate (rows read)
+        entity: Record updated rows in the sync change_log as this entity
+        restart: Ignore the checkpoint and start over from the first row
+        pending_only: `where` only matches rows still to process, so a
+            completed backfill scans again (from the first row) for rows
+            that match it since, instead of returning right away
+        log: Called with one progress line per batch
+
+    Returns:
+        Counts for this run (rows already done by a previous run excluded)
+    """
+    stats = BackfillStats()
+    checkpoint = load_checkpoint(name, restart)
+    if checkpoint.completed_at and pending_only and where is not None:
+        log(f"↻ {name}: completed on {checkpoint.completed_at:%Y-%m-%d %H:%M}, "
+            f"scanning again for rows still to process")
+        checkpoint = load_checkpoint(name, rescan=True)
+    elif checkpoint.completed_at:
+        log(f"✓ {name}: already completed on {checkpoint.completed_at:%Y-%m-%d %H:%M} "
+            f"({checkpoint.rows_updated} rows updated)")
+        stats.last_id = checkpoint.last_id
+        return stats
+    if checkpoint.last_id:
+        log(f"↻ {name}: resuming after id {checkpoint.last_id}")
+
+    stats.last_id = checkpoint.last_id
+    start = timer.perf_counter()
+    pool = ProcessPoolExecutor(max_workers=workers) if workers > 1 else None
+
+    def compute(rows):
+        values = [row[1:] for row in rows]
+        if pool is None:
+            return rows, map(transform, values)
+        return rows, pool.map(transform, values, chunksize=max(1, len(rows) // (workers * 4)))
+
+    def write(rows, results):
+        updated, skipped = write_batch(name, model, columns, rows, list(results), entity)
+        stats.batches += 1
+        stats.read += len(rows)
+        stats.updated += updated
+        stats.skipped += skipped
+        stats.last_id = rows[-1][0]
+        log(f"  {name}: batch {stats.batches}, up to id {stats.last_id}: "
+            f"{updated} updated, {skipped} skipped")
+        throttle()
+
+    def throttle():
+        if pause:
+            timer.sleep(pause)
+        if max_rows_per_second:
+            ahead = stats.read / max_rows_per_second - (timer.perf_counter() - start)
+            if ahead > 0:
+                timer.sleep(ahead)
+
+    try:
+        # Compute batch N+1 in the pool while batch N is being written
+        pending = None
+        after_id = checkpoint.last_id
+        while True:
+            rows = read_batch(model, columns, where, after_id, batch_size)
+            if not rows:
+                break
+            after_id = rows[-1][0]
+            computing = compute(rows)
+            if pending:
+                write(*pending)
+            pending = computing
+        if pending:
+            write(*pending)
+    finally:
+        if pool is not None:
+            pool.shutdown(cancel_futures=True)
+
+    db = SessionLocal()
+    try:
+        _advance_checkpoint(db, name, stats.last_id, 0, completed=True)
+        db.commit()
+    finally:
+        db.close()
+
+    log(f"✓ {name}: {stats.updated} updated, {stats.skipped} skipped "
+        f"in {stats.batches} batches ({timer.perf_counter() - start:.1f}s)")
+    return stats
@@ -1,26 +1,333 @@
 """Database configuration and session management"""
 
+import itertools
 import os
-from sqlalchemy import create_engine
+import threading
+import time
+from sqlalchemy import create_engine, event
+from fastapi import Request
+from sqlalchemy.exc import DBAPIError, TimeoutError as PoolTimeoutError
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 
 DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./data/senegal_masses.db")
 
-# Render provides postgres:// but SQLAlchemy requires postgresql://
-if DATABASE_URL.startswith("postgres://"):
-    DATABASE_URL = DATABASE_URL.replace("postgres://", "postgresql://", 1)
 
-connect_args = {"check_same_thread": False} if DATABASE_URL.startswith("sqlite") else {}
-engine = create_engine(DATABASE_URL, connect_args=connect_args)
+def _normalize_url(url: str) -> str:
+    # Render provides postgres:// but SQLAlchemy requires postgresql://
+    if url.startswith("postgres://"):
+        return url.replace("postgres://", "postgresql://", 1)
+    return url
+
+
+DATABASE_URL = _normalize_url(DATABASE_URL)
+
+# Optional comma-separated read replicas, used by the public read path only
+DATABASE_REPLICA_URLS = [
+    _normalize_url(url.strip())
+    for url in os.getenv("DATABASE_REPLICA_URLS", "").split(",")
+    if url.strip()
+]
+# After a write, the same admin reads from the primary for this long
+READ_YOUR_WRITES_SECONDS = float(os.getenv("READ_YOUR_WRITES_SECONDS", "10"))
+# A replica that fails to connect is skipped for this long
+REPLICA_RETRY_SECONDS = float(os.getenv("REPLICA_RETRY_SECONDS", "30"))
+
+
+def _async_url(url: str) -> str:
+    """Map a sync URL to its async driver: aiosqlite for SQLite, asyncpg for Postgres"""
+    if url.startswith("sqlite:"):
+        return url.replace("sqlite:", "sqlite+aiosqlite:", 1)
+    if url.startswith("postgresql:"):
+        return url.replace("postgresql:", "postgresql+asyncpg:", 1)
+    return url
+
+
+# Override when the sync URL carries driver-specific options asyncpg rejects (e.g. sslmode)
+ASYNC_DATABASE_URL = os.getenv("ASYNC_DATABASE_URL") or _async_url(DATABASE_URL)
+
+IS_SQLITE = DATABASE_URL.startswith("sqlite")
+IS_SQLITE_MEMORY = IS_SQLITE and (":memory:" in DATABASE_URL or DATABASE_URL.rstrip("/") == "sqlite:")
+
+# Connection pool (ignored for in-memory SQLite, which needs a single connection).
+# Size it so that workers * (DB_POOL_SIZE + DB_MAX_OVERFLOW) stays below the
+# server's max_connections, and DB_POOL_SIZE covers one worker's threadpool load.
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "5"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "30"))
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "1800"))
+# Pre-ping guards against dropped server connections; a local SQLite file has none
+DB_POOL_PRE_PING = os.getenv("DB_POOL_PRE_PING", "false" if IS_SQLITE else "true").lower() in ("1", "true", "yes")
+
+# SQLite tuning, applied to every new connection
+SQLITE_SYNCHRONOUS = os.getenv("SQLITE_SYNCHRONOUS", "NORMAL")
+SQLITE_CACHE_SIZE_KB = int(os.getenv("SQLITE_CACHE_SIZE_KB", "65536"))
+SQLITE_MMAP_SIZE = int(os.getenv("SQLITE_MMAP_SIZE", str(256 * 1024 * 1024)))
+SQLITE_BUSY_TIMEOUT_MS = int(os.getenv("SQLITE_BUSY_TIMEOUT_MS", "5000"))
+
+connect_args = {"check_same_thread": False} if IS_SQLITE else {}
+
+engine_kwargs = {}
+if not IS_SQLITE_MEMORY:
+    engine_kwargs = {
+        "pool_size": DB_POOL_SIZE,
+        "max_overflow": DB_MAX_OVERFLOW,
+        "pool_timeout": DB_POOL_TIMEOUT,
+        "pool_recycle": DB_POOL_RECYCLE,
+        "pool_pre_ping": DB_POOL_PRE_PING,
+    }
+
+engine = create_engine(DATABASE_URL, connect_args=connect_args, **engine_kwargs)
+
+
+def _apply_sqlite_pragmas(dbapi_connection, connection_record):
+    """
+    WAL lets readers proceed while a writer holds the lock (the default
+    rollback journal serializes them); synchronous=NORMAL is safe under WAL.
+    """
+    cursor = dbapi_connection.cursor()
+    if not IS_SQLITE_MEMORY:
+        cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.execute(f"PRAGMA mmap_size={SQLITE_MMAP_SIZE}")
+    cursor.execute(f"PRAGMA synchronous={SQLITE_SYNCHRONOUS}")
+    # Negative cache_size is in KiB
+    cursor.execute(f"PRAGMA cache_size=-{SQLITE_CACHE_SIZE_KB}")
+    cursor.execute(f"PRAGMA busy_timeout={SQLITE_BUSY_TIMEOUT_MS}")
+    cursor.execute("PRAGMA temp_store=MEMORY")
+    cursor.close()
+
+
+# Async engine for the public read path; it has its own pool with the same sizing.
+# aiosqlite defaults to NullPool (a thread per connect), so request a real pool.
+async_engine_kwargs = dict(engine_kwargs)
+if IS_SQLITE and not IS_SQLITE_MEMORY:
+    async_engine_kwargs["poolclass"] = AsyncAdaptedQueuePool
+async_engine = create_async_engine(ASYNC_DATABASE_URL, connect_args=connect_args, **async_engine_kwargs)
+
+# Replicas get the same pool sizing each; they only ever serve public reads
+replica_engines = [
+    create_async_engine(_async_url(url), connect_args=connect_args, **async_engine_kwargs)
+    for url in DATABASE_REPLICA_URLS
+]
+
+if IS_SQLITE:
+    event.listen(engine, "connect", _apply_sqlite_pragmas)
+    event.listen(async_engine.sync_engine, "connect", _apply_sqlite_pragmas)
+    for replica in replica_engines:
+        event.listen(replica.sync_engine, "connect", _apply_sqlite_pragmas)
+
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
 Base = declarative_base()
 
 
-def get_db():
-    """Database session dependency"""
+# ============ Pool Instrumentation ============
+
+class PoolStats:
+    """Thread-safe counters for connection checkout wait times"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.timeouts = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+
+    def record(self, wait_seconds: float):
+        with self._lock:
+            self.checkouts += 1
+            self.total_wait += wait_seconds
+            self.max_wait = max(self.max_wait, wait_seconds)
+
+    def record_timeout(self):
+        with self._lock:
+            self.timeouts += 1
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                "checkouts": self.checkouts,
+                "timeouts": self.timeouts,
+                "wait_ms_avg": round(self.total_wait / self.checkouts * 1000, 3) if self.checkouts else 0.0,
+                "wait_ms_max": round(self.max_wait * 1000, 3),
+            }
+
+
+pool_stats = PoolStats()
+async_pool_stats = PoolStats()
+
+
+def _describe_pool(pool, counters: PoolStats) -> dict:
+    stats = {"pool": type(pool).__name__}
+
+    if hasattr(pool, "checkedout"):
+        capacity = pool.size() + max(DB_MAX_OVERFLOW, 0)
+        checked_out = pool.checkedout()
+        stats.update({
+            "size": pool.size(),
+            "max_overflow": DB_MAX_OVERFLOW,
+            "checked_out": checked_out,
+            "checked_in": pool.checkedin(),
+            "overflow": max(pool.overflow(), 0),
+            "utilization": round(checked_out / capacity, 3) if capacity else 0.0,
+        })
+
+    stats.update(counters.snapshot())
+    return stats
+
+
+def get_pool_stats() -> dict:
+    """
+    Current pool utilization and checkout wait statistics
+
+    Returns:
+        Dict with pool sizing, live counts and wait times since startup
+    """
+    return _describe_pool(engine.pool, pool_stats)
+
+
+def get_async_pool_stats() -> dict:
+    """Same as get_pool_stats(), for the async engine used by public endpoints"""
+    return _describe_pool(async_engine.pool, async_pool_stats)
+
+
+def get_replica_pool_stats() -> list:
+    """Same as get_pool_stats(), one entry per read replica"""
+    return [
+        {**_describe_pool(r.engine.pool, r.stats), "available": r.down_until <= time.monotonic()}
+        for r in replicas
+    ]
+
+
+def get_db(request: Request):
+    """Database session dependency (primary; commits pin the caller to it)"""
     db = SessionLocal()
+    db.info["pin_key"] = request.headers.get("authorization")
     try:
+        # Check out the connection up front so pool wait time is measured
+        start = time.perf_counter()
+        try:
+            db.connection()
+        except PoolTimeoutError:
+            pool_stats.record_timeout()
+            raise
+        pool_stats.record(time.perf_counter() - start)
         yield db
     finally:
         db.close()
+
+
+async def get_async_db():
+    """Async database session dependency (primary)"""
+    async with AsyncSessionLocal() as db:
+        start = time.perf_counter()
+        try:
+            await db.connection()
+        except PoolTimeoutError:
+            async_pool_stats.record_timeout()
+            raise
+        async_pool_stats.record(time.perf_counter() - start)
+        yield db
+
+
+# ============ Read/Write Routing ============
+
+class PrimaryPins:
+    """
+    Short-lived pins that send a client's public reads to the primary
+
+    Keyed by the Authorization header: the admin frontend sends its token on
+    every request, public ones included. Pins live in process memory, which
+    matches the single uvicorn worker this app runs with.
+    """
+
+    def __init__(self, ttl_seconds: float, max_entries: int = 10000):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._until = {}
+        self._lock = threading.Lock()
+
+    def pin(self, key: str):
+        now = time.monotonic()
+        with self._lock:
+            self._until[key] = now + self.ttl_seconds
+            if len(self._until) > self.max_entries:
+                self._until = {k: t for k, t in self._until.items() if t > now}
+
+    def is_pinned(self, key: str) -> bool:
+        with self._lock:
+            until = self._until.get(key)
+        return until is not None and until > time.monotonic()
+
+
+primary_pins = PrimaryPins(READ_YOUR_WRITES_SECONDS)
+
+
+@event.listens_for(SessionLocal, "after_commit")
+def _pin_after_commit(session: Session):
+    # Pin at commit time, before the response reaches the client
+    key = session.info.get("pin_key")
+    if key:
+        primary_pins.pin(key)
+
+
+class _Replica:
+    """A replica engine with its session factory, health and checkout stats"""
+
+    def __init__(self, engine):
+        self.sessionmaker = async_sessionmaker(engine, autoflush=False, expire_on_commit=False)
+        self.engine = engine
+        self.down_until = 0.0
+        self.stats = PoolStats()
+
+
+replicas = [_Replica(replica) for replica in replica_engines]
+_replica_cycle = itertools.cycle(replicas) if replicas else None
+
+
+def _available_replicas():
+    """Replicas that are not marked down, starting from the next in round-robin order"""
+    now = time.monotonic()
+    candidates = [next(_replica_cycle) for _ in range(len(replicas))]
+    return [replica for replica in candidates if replica.down_until <= now]
+
+
+async def get_async_read_db(request: Request):
+    """
+    Read-only async session dependency for public endpoints
+
+    Spreads requests round-robin across DATABASE_REPLICA_URLS. Falls back to
+    the primary when no replica is configured or reachable, and for clients
+    that wrote within the last READ_YOUR_WRITES_SECONDS.
+    """
+    key = request.headers.get("authorization")
+    candidates = []
+    if replicas and not (key and primary_pins.is_pinned(key)):
+        candidates = _available_replicas()
+
+    for replica in candidates:
+        db = replica.sessionmaker()
+        start = time.perf_counter()
+        try:
+            await db.connection()
+        except PoolTimeoutError:
+            replica.stats.record_timeout()
+            await db.close()
+            raise
+        except DBAPIError:
+            # Unreachable replica: skip it for a while and try the next one
+            replica.down_until = time.monotonic() + REPLICA_RETRY_SECONDS
+            await db.close()
+            continue
+
+        replica.stats.record(time.perf_counter() - start)
+        try:
+            yield db
+        finally:
+            await db.close()
+        return
+
+    async for db in get_async_db():
+        yield db
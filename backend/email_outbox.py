@@ -0,0 +1,465 @@
+"""
+Persistent email outbox and its delivery worker
+
+Endpoints never talk to the email provider. email_service.py adds a row to
+email_outbox in the request's own transaction, so the email exists if and
+only if the change that triggered it was committed. A background worker
+delivers due rows in batches:
+
+  - a batch is claimed by pushing next_attempt_at past EMAIL_CLAIM_SECONDS
+    (FOR UPDATE SKIP LOCKED on Postgres), so several workers never pick the
+    same row, and a worker that dies mid-batch only delays its rows
+  - failures are retried with exponential backoff, up to EMAIL_MAX_ATTEMPTS
+  - every row has an idempotency key, passed to the provider: a retry of an
+    email that was in fact accepted is not sent twice
+
+The transport is chosen with EMAIL_TRANSPORT:
+
+  resend - Resend API (default when RESEND_API_KEY is set)
+  file   - one JSON file per email in EMAIL_OUTBOX_DIR (local dev, tests)
+  null   - log and drop (default otherwise)
+
+A batch is sent by EMAIL_SEND_CONCURRENCY threads sharing one keep-alive
+HTTP session, each send first taking a token from the provider rate limiter
+(EMAIL_PROVIDER_RATE_PER_SECOND, shared across processes with
+THROTTLE_BACKEND=database), so large broadcasts drain quickly without
+tripping the provider's own throttling.
+
+The worker runs as a thread of the app (EMAIL_WORKER_ENABLED, on by default),
+or standalone with scripts/tools/email_worker.py.
+"""
+
+import json
+import logging
+import os
+import random
+import threading
+import time
+from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Tuple
+
+import requests
+import resend
+from requests.adapters import HTTPAdapter
+from resend.http_client import HTTPClient
+from sqlalchemy import event, func, insert, select, update
+from sqlalchemy.orm import Session
+
+from database import SessionLocal
+from models import EmailOutbox
+from throttle import RateLimiter
+
+logger = logging.getLogger(__name__)
+
+EMAIL_TRANSPORT = os.getenv("EMAIL_TRANSPORT", "")
+EMAIL_OUTBOX_DIR = os.getenv("EMAIL_OUTBOX_DIR", "./data/outbox")
+EMAIL_MAX_ATTEMPTS = int(os.getenv("EMAIL_MAX_ATTEMPTS", "8"))
+EMAIL_RETRY_BASE_SECONDS = float(os.getenv("EMAIL_RETRY_BASE_SECONDS", "30"))
+EMAIL_RETRY_MAX_SECONDS = float(os.getenv("EMAIL_RETRY_MAX_SECONDS", "3600"))
+EMAIL_CLAIM_SECONDS = float(os.getenv("EMAIL_CLAIM_SECONDS", "120"))
+EMAIL_WORKER_BATCH_SIZE = int(os.getenv("EMAIL_WORKER_BATCH_SIZE", "20"))
+EMAIL_WORKER_INTERVAL_SECONDS = float(os.getenv("EMAIL_WORKER_INTERVAL_SECONDS", "5"))
+EMAIL_WORKER_ENABLED = os.getenv("EMAIL_WORKER_ENABLED", "true").lower() == "true"
+EMAIL_SEND_CONCURRENCY = int(os.getenv("EMAIL_SEND_CONCURRENCY", "4"))
+# Resend allows 2 requests per second per team by default
+EMAIL_PROVIDER_RATE_PER_SECOND = float(os.getenv("EMAIL_PROVIDER_RATE_PER_SECOND", "2"))
+
+STATUS_PENDING = "pending"
+STATUS_SENT = "sent"
+STATUS_FAILED = "failed"
+
+
+# ============ Transports ============
+
+class Transport(ABC):
+    """Delivers one email; raises on failure"""
+
+    @abstractmethod
+    def send(self, message: EmailOutbox) -> Optional[str]:
+        """Returns the provider's message id, if any"""
+
+
+class PooledHTTPClient(HTTPClient):
+    """
+    HTTP client for the resend SDK over one keep-alive requests.Session
+
+    The SDK's default client calls requests.request(), which opens a new
+    TLS connection for every email.
+    """
+
+    def __init__(self, pool_size: int, timeout: float = 30):
+        self._session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+        self._session.mount("https://", adapter)
+        self._session.mount("http://", adapter)
+        self._timeout = timeout
+
+    def request(self, method, url, headers, json=None):
+        try:
+            resp = self._session.request(method=method, url=url, headers=headers, json=json, timeout=self._timeout)
+            return resp.content, resp.status_code, resp.headers
+        except requests.RequestException as e:
+            # The SDK wraps this into a ResendError, like its default client
+            raise RuntimeError(f"Request failed: {e}") from e
+
+
+class ResendTransport(Transport):
+    def __init__(self, from_email: str, pool_size: int = EMAIL_SEND_CONCURRENCY):
+        self.from_email = from_email
+        # The SDK only supports a module-wide client
+        resend.default_http_client = PooledHTTPClient(max(1, pool_size))
+
+    def send(self, message):
+        response = resend.Emails.send(
+            {
+                "from": self.from_email,
+                "to": [message.to_address],
+                "subject": message.subject,
+                "html": message.html,
+            },
+            {"idempotency_key": message.idempotency_key},
+        )
+        return response.get("id") if isinstance(response, dict) else None
+
+
+class FileTransport(Transport):
+    """Writes each email to <directory>/<id>.json instead of sending it"""
+
+    def __init__(self, directory: str):
+        self.directory = directory
+
+    def send(self, message):
+        os.makedirs(self.directory, exist_ok=True)
+        path = os.path.join(self.directory, f"{message.id}.json")
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({
+                "idempotency_key": message.idempotency_key,
+                "to": message.to_address,
+                "subject": message.subject,
+                "html": message.html,
+            }, f, ensure_ascii=False, indent=2)
+        return path
+
+
+class NullTransport(Transport):
+    def send(self, message):
+        logger.warning(f"Email non configuré (RESEND_API_KEY ou FROM_EMAIL manquant). Email ignoré: {message.subject}")
+        return None
+
+
+def create_transport(name: str = EMAIL_TRANSPORT) -> Transport:
+    from email_service import FROM_EMAIL, _is_configured
+
+    name = name or ("resend" if _is_configured() else "null")
+    if name == "resend":
+        return ResendTransport(FROM_EMAIL)
+    if name == "file":
+        return FileTransport(EMAIL_OUTBOX_DIR)
+    if name == "null":
+        return NullTransport()
+    raise ValueError(f"EMAIL_TRANSPORT inconnu: {name}")
+
+
+# ============ Enqueue ============
+
+def enqueue(db: Session, idempotency_key: str, to_address: str, subject: str, html: str) -> bool:
+    """
+    Queue an email inside the caller's transaction (sent after db.commit())
+
+    Args:
+        db: The request's database session
+        idempotency_key: Identifies this email; a key already queued is skipped
+        to_address: Recipient
+        subject: Subject line
+        html: Full HTML body
+
+    Returns:
+        False if an email with this key was already queued
+    """
+    exists = db.execute(
+        select(EmailOutbox.id).where(EmailOutbox.idempotency_key == idempotency_key)
+    ).first()
+    if exists:
+        return False
+    db.add(EmailOutbox(
+        idempotency_key=idempotency_key,
+        to_address=to_address,
+        subject=subject,
+        html=html,
+        status=STATUS_PENDING,
+        attempts=0,
+        next_attempt_at=datetime.utcnow(),
+    ))
+    # Wake the worker once the request commits (see _wake_after_commit)
+    db.info["outbox_wake"] = True
+    return True
+
+
+def enqueue_batch(db: Session, messages: List[Tuple[str, str, str, str]],
+                  broadcast_id: Optional[int] = None, chunk_size: int = 500) -> int:
+    """
+    Queue many emails with bulk inserts (one SELECT + one INSERT per chunk)
+
+    Args:
+        db: The request's database session
+        messages: (idempotency_key, to_address, subject, html) tuples;
+            keys already queued are skipped, like enqueue()
+        broadcast_id: EmailBroadcast the rows belong to
+        chunk_size: Rows per statement
+
+    Returns:
+        Number of emails queued
+    """
+    now = datetime.utcnow()
+    queued = 0
+    for i in range(0, len(messages), chunk_size):
+        chunk = messages[i:i + chunk_size]
+        existing = set(db.execute(
+            select(EmailOutbox.idempotency_key)
+            .where(EmailOutbox.idempotency_key.in_([m[0] for m in chunk]))
+        ).scalars())
+        rows = []
+        for key, to_address, subject, html in chunk:
+            if key in existing:
+                continue
+            existing.add(key)
+            rows.append({
+                "idempotency_key": key,
+                "to_address": to_address,
+                "subject": subject,
+                "html": html,
+                "status": STATUS_PENDING,
+                "attempts": 0,
+                "next_attempt_at": now,
+                "created_at": now,
+                "broadcast_id": broadcast_id,
+            })
+        if rows:
+            db.execute(insert(EmailOutbox), rows)
+            queued += len(rows)
+    if queued:
+        db.info["outbox_wake"] = True
+    return queued
+
+
+def enqueue_many(db: Session, recipients: List[Tuple[str, str]], subject: str, html: str,
+                 broadcast_id: Optional[int] = None) -> int:
+    """
+    Queue the same email to many recipients (see enqueue_batch())
+
+    Args:
+        recipients: (idempotency_key, to_address) pairs
+        subject: Subject line
+        html: Full HTML body, shared by every row
+
+    Returns:
+        Number of emails queued
+    """
+    return enqueue_batch(
+        db, [(key, to_address, subject, html) for key, to_address in recipients], broadcast_id
+    )
+
+
+# ============ Delivery ============
+
+provider_limiter = RateLimiter(
+    "email_provider",
+    burst=max(1, int(EMAIL_PROVIDER_RATE_PER_SECOND)),
+    per_minute=EMAIL_PROVIDER_RATE_PER_SECOND * 60,
+)
+
+
+def _wait_for_provider():
+    """Block until the provider rate limit allows one more request"""
+    while True:
+        retry_after = provider_limiter.hit("send")
+        if retry_after is None:
+            return
+        time.sleep(min(retry_after, 1.0))
+
+
+def retry_delay(attempts: int) -> float:
+    """Exponential backoff with jitter, in seconds, after `attempts` failures"""
+    delay = min(EMAIL_RETRY_MAX_SECONDS, EMAIL_RETRY_BASE_SECONDS * 2 ** (attempts - 1))
+    return delay * random.uniform(0.8, 1.2)
+
+
+def claim_batch(size: int = EMAIL_WORKER_BATCH_SIZE) -> List[EmailOutbox]:
+    """Lease up to `size` due emails to this worker for EMAIL_CLAIM_SECONDS"""
+    now = datetime.utcnow()
+    db = SessionLocal()
+    try:
+        messages = db.execute(
+            select(EmailOutbox)
+            .where(EmailOutbox.status == STATUS_PENDING, EmailOutbox.next_attempt_at <= now)
+            .order_by(EmailOutbox.next_attempt_at, EmailOutbox.id)
+            .limit(size)
+            .with_for_update(skip_locked=True)
+        ).scalars().all()
+        if messages:
+            db.execute(
+                update(EmailOutbox)
+                .where(EmailOutbox.id.in_([m.id for m in messages]))
+                .values(next_attempt_at=now + timedelta(seconds=EMAIL_CLAIM_SECONDS))
+            )
+        # Detach before commit so the rows stay loaded (commit would expire them)
+        db.expunge_all()
+        db.commit()
+        return messages
+    finally:
+        db.close()
+
+
+def _record_result(message: EmailOutbox, provider_id: Optional[str], error: Optional[Exception]):
+    now = datetime.utcnow()
+    attempts = message.attempts + 1
+    if error is None:
+        values = {"status": STATUS_SENT, "attempts": attempts, "sent_at": now,
+                  "provider_id": provider_id, "last_error": None}
+    elif attempts >= EMAIL_MAX_ATTEMPTS:
+        values = {"status": STATUS_FAILED, "attempts": attempts, "last_error": str(error)[:500]}
+    else:
+        values = {"attempts": attempts, "last_error": str(error)[:500],
+                  "next_attempt_at": now + timedelta(seconds=retry_delay(attempts))}
+
+    db = SessionLocal()
+    try:
+        db.execute(update(EmailOutbox).where(EmailOutbox.id == message.id).values(**values))
+        db.commit()
+    finally:
+        db.close()
+
+
+def _deliver(transport: Transport, message: EmailOutbox) -> bool:
+    """Send one claimed email and record the outcome; True if it was sent"""
+    _wait_for_provider()
+    try:
+        provider_id = transport.send(message)
+    except Exception as e:
+        logger.error(f"Échec d'envoi d'email à {message.to_address} (tentative {message.attempts + 1}): {e}")
+        _record_result(message, None, e)
+        return False
+    logger.info(f"Email envoyé à {message.to_address}: {message.subject}")
+    _record_result(message, provider_id, None)
+    return True
+
+
+def deliver_batch(transport: Transport, size: int = EMAIL_WORKER_BATCH_SIZE,
+                  concurrency: int = EMAIL_SEND_CONCURRENCY) -> Tuple[int, int]:
+    """
+    Claim and deliver one batch of due emails, `concurrency` at a time
+
+    Returns:
+        (emails sent, emails that failed this attempt)
+    """
+    messages = claim_batch(size)
+    if concurrency > 1 and len(messages) > 1:
+        with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="email-send") as pool:
+            results = list(pool.map(lambda m: _deliver(transport, m), messages))
+    else:
+        results = [_deliver(transport, m) for m in messages]
+    sent = sum(results)
+    return sent, len(results) - sent
+
+
+def deliver_all(transport: Transport, size: int = EMAIL_WORKER_BATCH_SIZE,
+                concurrency: int = EMAIL_SEND_CONCURRENCY) -> Tuple[int, int]:
+    """Deliver batches until no email is due"""
+    total_sent = total_failed = 0
+    while True:
+        sent, failed = deliver_batch(transport, size, concurrency)
+        total_sent += sent
+        total_failed += failed
+        if sent + failed < size:
+            return total_sent, total_failed
+
+
+def get_broadcast_counts(db: Session, broadcast_ids: List[int]) -> Dict[int, dict]:
+    """Pending / sent / failed recipients of each broadcast"""
+    counts = {bid: {STATUS_PENDING: 0, STATUS_SENT: 0, STATUS_FAILED: 0} for bid in broadcast_ids}
+    if broadcast_ids:
+        rows = db.execute(
+            select(EmailOutbox.broadcast_id, EmailOutbox.status, func.count())
+            .where(EmailOutbox.broadcast_id.in_(broadcast_ids))
+            .group_by(EmailOutbox.broadcast_id, EmailOutbox.status)
+        )
+        for broadcast_id, status, count in rows:
+            counts[broadcast_id][status] = count
+    return counts
+
+
+def get_outbox_stats() -> dict:
+    """Emails per status and the age of the oldest one still pending"""
+    db = SessionLocal()
+    try:
+        counts = dict(db.execute(
+            select(EmailOutbox.status, func.count()).group_by(EmailOutbox.status)
+        ).all())
+        oldest = db.execute(
+            select(func.min(EmailOutbox.created_at)).where(EmailOutbox.status == STATUS_PENDING)
+        ).scalar()
+    finally:
+        db.close()
+    return {
+        "pending": counts.get(STATUS_PENDING, 0),
+        "sent": counts.get(STATUS_SENT, 0),
+        "failed": counts.get(STATUS_FAILED, 0),
+        "oldest_pending_seconds": round((datetime.utcnow() - oldest).total_seconds()) if oldest else None,
+        "worker_running": _worker is not None and _worker.is_alive(),
+    }
+
+
+# ============ Worker Thread ============
+
+class OutboxWorker(threading.Thread):
+    """Polls the outbox every EMAIL_WORKER_INTERVAL_SECONDS, or sooner when woken"""
+
+    def __init__(self, transport: Transport, interval: float = EMAIL_WORKER_INTERVAL_SECONDS):
+        super().__init__(name="email-outbox", daemon=True)
+        self.transport = transport
+        self.interval = interval
+        self._wake = threading.Event()
+        self._stopping = threading.Event()
+
+    def wake(self):
+        self._wake.set()
+
+    def stop(self, timeout: Optional[float] = None):
+        self._stopping.set()
+        self._wake.set()
+        self.join(timeout)
+
+    def run(self):
+        while not self._stopping.is_set():
+            self._wake.clear()
+            try:
+                deliver_all(self.transport)
+            except Exception as e:
+                logger.error(f"Worker email: {e}")
+            self._wake.wait(self.interval)
+
+
+_worker: Optional[OutboxWorker] = None
+
+
+def start_worker():
+    """Start the delivery thread (called on app startup)"""
+    global _worker
+    if EMAIL_WORKER_ENABLED and _worker is None:
+        _worker = OutboxWorker(create_transport())
+        _worker.start()
+
+
+def stop_worker():
+    global _worker
+    if _worker is not None:
+        _worker.stop(timeout=10)
+        _worker = None
+
+
+@event.listens_for(SessionLocal, "after_commit")
+def _wake_after_commit(session: Session):
+    if session.info.pop("outbox_wake", False) and _worker is not None:
+        _worker.wake()
@@ -1,11 +1,22 @@
 """
 Service de notification par email via Resend.
-Tous les emails sont en français. L'envoi est best-effort : les erreurs sont loguées, jamais levées.
+Tous les emails sont en français. Les emails sont mis en file d'attente (table
+email_outbox) dans la transaction de la requête, puis envoyés par le worker de
+email_outbox.py : la requête n'attend jamais le fournisseur d'email.
 """
 
+import hashlib
+import html as html_lib
 import os
 import logging
 import resend
+from datetime import datetime
+from typing import List, Optional, Tuple
+from sqlalchemy.orm import Session
+
+from email_outbox import enqueue, enqueue_batch, enqueue_many
+from models import EmailBroadcast
+from queries import BROADCAST_RECIPIENTS
 
 logger = logging.getLogger(__name__)
 
@@ -57,24 +68,26 @@ def _btn(href: str, label: str) -> str:
     )
 
 
-def _send_email(to: str, subject: str, html: str):
-    if not _is_configured():
-        logger.warning("Email non configuré (RESEND_API_KEY ou FROM_EMAIL manquant). Email ignoré.")
-        return
+def _event_key(kind: str, parish_id: int, registered_at: Optional[datetime]) -> str:
+    """
+    Clé d'idempotence d'un événement : la même pour une requête rejouée.
 
-    try:
-        resend.Emails.send({
-            "from": FROM_EMAIL,
-            "to": [to],
-            "subject": subject,
-            "html": _wrap_html(html),
-        })
-        logger.info(f"Email envoyé à {to}: {subject}")
-    except Exception as e:
-        logger.error(f"Échec d'envoi d'email à {to}: {e}")
+    L'id de la paroisse seul ne suffit pas : SQLite réattribue l'id d'une
+    paroisse supprimée (rejet), et l'email de la nouvelle inscription serait
+    pris pour un doublon. La date d'inscription (created_at) distingue les
+    deux paroisses.
+    """
+    stamp = registered_at.strftime("%Y%m%dT%H%M%S%f") if registered_at else ""
+    return f"{kind}:{parish_id}:{stamp}"
 
 
-def notify_new_registration(parish_name: str, parish_city: str, admin_email: str):
+def _send_email(db: Session, key: str, to: str, subject: str, html: str):
+    """Met l'email en file d'attente ; il part après le commit de la transaction de db."""
+    enqueue(db, key, to, subject, _wrap_html(html))
+
+
+def notify_new_registration(db: Session, parish_id: int, parish_name: str, parish_city: str, admin_email: str,
+                            registered_at: Optional[datetime]):
     if not MASTER_ADMIN_EMAIL:
         logger.warning("MASTER_ADMIN_EMAIL non défini. Notification ignorée.")
         return
@@ -91,10 +104,11 @@ def notify_new_registration(parish_name: str, parish_city: str, admin_email: str
     <p>Connectez-vous au tableau de bord pour approuver ou rejeter cette demande.</p>
     {_btn(FRONTEND_URL + "/admin/login", "Accéder au tableau de bord")}
     """
-    _send_email(MASTER_ADMIN_EMAIL, subject, html)
+    _send_email(db, _event_key("registration", parish_id, registered_at), MASTER_ADMIN_EMAIL, subject, html)
 
 
-def notify_parish_approved(admin_email: str, parish_name: str):
+def _approved_email(parish_id: int, admin_email: str, parish_name: str,
+                    registered_at: Optional[datetime]) -> tuple:
     subject = f"Inscription approuvée : {parish_name}"
     html = f"""
     <h2 style="color:#1f2937;margin-top:0;">Votre inscription a été approuvée !</h2>
@@ -104,10 +118,15 @@ def notify_parish_approved(admin_email: str, parish_name: str):
     {_btn(FRONTEND_URL + "/admin/login", "Se connecter")}
     <p>Utilisez l'adresse email <strong>{admin_email}</strong> et le mot de passe que vous avez choisi lors de l'inscription.</p>
     """
-    _send_email(admin_email, subject, html)
+    return _event_key("approved", parish_id, registered_at), admin_email, subject, html
+
 
+def notify_parish_approved(db: Session, parish_id: int, admin_email: str, parish_name: str,
+                           registered_at: Optional[datetime]):
+    _send_email(db, *_approved_email(parish_id, admin_email, parish_name, registered_at))
 
-def notify_password_reset(admin_email: str, reset_link: str):
+
+def notify_password_reset(db: Session, admin_email: str, reset_link: str):
     subject = "Réinitialisation de votre mot de passe"
     html = f"""
     <h2 style="color:#1f2937;margin-top:0;">Réinitialisation de mot de passe</h2>
@@ -116,10 +135,13 @@ def notify_password_reset(admin_email: str, reset_link: str):
     {_btn(reset_link, "Réinitialiser mon mot de passe")}
     <p style="color:#6b7280;font-size:14px;">Ce lien expire dans 1 heure. Si vous n'avez pas demandé cette réinitialisation, vous pouvez ignorer cet email.</p>
     """
-    _send_email(admin_email, subject, html)
+    # Une clé par lien : chaque demande de réinitialisation envoie son email
+    key = "password_reset:" + hashlib.blake2b(reset_link.encode(), digest_size=16).hexdigest()
+    _send_email(db, key, admin_email, subject, html)
 
 
-def notify_parish_rejected(admin_email: str, parish_name: str):
+def _rejected_email(parish_id: int, admin_email: str, parish_name: str,
+                    registered_at: Optional[datetime]) -> tuple:
     subject = f"Inscription non approuvée : {parish_name}"
     html = f"""
     <h2 style="color:#1f2937;margin-top:0;">Votre demande d'inscription n'a pas été approuvée</h2>
@@ -127,4 +149,67 @@ def notify_parish_rejected(admin_email: str, parish_name: str):
     <strong>{parish_name}</strong> n'a pas été approuvée.</p>
     <p>Si vous pensez qu'il s'agit d'une erreur, veuillez contacter l'administrateur principal.</p>
     """
-    _send_email(admin_email, subject, html)
+    return _event_key("rejected", parish_id, registered_at), admin_email, subject, html
+
+
+def notify_parish_rejected(db: Session, parish_id: int, admin_email: str, parish_name: str,
+                           registered_at: Optional[datetime]):
+    _send_email(db, *_rejected_email(parish_id, admin_email, parish_name, registered_at))
+
+
+def notify_parishes_decided(db: Session, approved: bool,
+                            parishes: List[Tuple[int, str, str, Optional[datetime]]]) -> int:
+    """
+    Met en file d'attente, en une insertion groupée, les emails d'approbation
+    (ou de rejet) d'un lot de paroisses.
+
+    Args:
+        db: Session de la requête (les emails partent après db.commit())
+        approved: True pour les emails d'approbation, False pour les rejets
+        parishes: Tuples (parish_id, admin_email, parish_name, created_at)
+
+    Returns:
+        Nombre d'emails mis en file d'attente
+    """
+    build = _approved_email if approved else _rejected_email
+    messages = []
+    for parish_id, admin_email, parish_name, registered_at in parishes:
+        key, to, subject, html = build(parish_id, admin_email, parish_name, registered_at)
+        messages.append((key, to, subject, _wrap_html(html)))
+    return enqueue_batch(db, messages)
+
+
+def broadcast_to_parish_admins(db: Session, subject: str, message: str) -> EmailBroadcast:
+    """
+    Met en file d'attente une annonce pour chaque administrateur de paroisse approuvée.
+
+    Le gabarit HTML est rendu une seule fois pour tous les destinataires ;
+    le statut de chaque envoi est suivi dans email_outbox (broadcast_id).
+
+    Args:
+        db: Session de la requête (l'annonce part après db.commit())
+        subject: Objet de l'email
+        message: Texte brut ; les lignes vides séparent les paragraphes
+
+    Returns:
+        L'EmailBroadcast créé
+    """
+    paragraphs = [p.strip() for p in message.split("\n\n") if p.strip()]
+    body = "".join(
+        f"<p>{html_lib.escape(p).replace(chr(10), '<br>')}</p>" for p in paragraphs
+    )
+    html = _wrap_html(f'<h2 style="color:#1f2937;margin-top:0;">{html_lib.escape(subject)}</h2>{body}')
+
+    recipients = db.execute(BROADCAST_RECIPIENTS).all()
+    broadcast = EmailBroadcast(subject=subject, html=html, recipient_count=len(recipients))
+    db.add(broadcast)
+    db.flush()
+    enqueue_many(
+        db,
+        [(f"broadcast:{broadcast.id}:{parish_id}", admin_email) for parish_id, admin_email in recipients],
+        subject,
+        html,
+        broadcast_id=broadcast.id,
+    )
+    logger.info(f"Annonce {broadcast.id} en file d'attente pour {len(recipients)} destinataires")
+    return broadcast
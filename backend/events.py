@@ -0,0 +1,138 @@
+"""
+In-memory date-range index of parish events
+
+An event is a published news item of an approved parish with an
+event_start_date (event_end_date defaults to the start, for one-day events).
+The index holds every event sorted by start date, with a max-end segment
+tree on top, so "events overlapping [from, to]" is answered in
+O(log n + k) without touching the database.
+
+The index is loaded with one query (served by ix_parochial_news_event_dates)
+and tagged with the change_log version it was built from, like the response
+cache: a read at a newer version rebuilds it. The admin news endpoints also
+call invalidate() so the writing process doesn't wait for the next version
+check to drop it.
+"""
+
+import threading
+from bisect import bisect_right
+from datetime import date
+from typing import List, Optional
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from models import Parish, ParochialNews
+from queries import NEWS_COLUMNS, NEWS_KEYS
+from sync import current_version
+
+EVENT_PARISH_COLUMNS = (Parish.id, Parish.name, Parish.city, Parish.latitude, Parish.longitude)
+EVENT_PARISH_KEYS = ("parish_id", "parish_name", "parish_city", "latitude", "longitude")
+
+# Same parish filter as queries.public_parishes_select()
+PUBLIC_EVENTS = select(*NEWS_COLUMNS, *EVENT_PARISH_COLUMNS).join(
+    Parish, Parish.id == ParochialNews.parish_id
+).where(
+    ParochialNews.event_start_date.isnot(None),
+    ParochialNews.is_active == True,
+    Parish.is_approved == True,
+    Parish.is_master_admin == False,
+).order_by(ParochialNews.event_start_date, ParochialNews.id)
+
+
+class IntervalIndex:
+    """
+    Static interval index over (start, end, item) triples
+
+    Items are sorted by start; a segment tree stores the maximum end of
+    each range of that order, so whole subtrees that end before the query
+    are skipped.
+    """
+
+    def __init__(self, intervals: List[tuple]):
+        intervals = sorted(intervals, key=lambda i: i[0])
+        self._starts = [start for start, _, _ in intervals]
+        self._ends = [end for _, end, _ in intervals]
+        self._items = [item for _, _, item in intervals]
+
+        self._size = 1
+        while self._size < len(intervals):
+            self._size *= 2
+        self._max_end: List[Optional[date]] = [None] * (2 * self._size)
+        for i, end in enumerate(self._ends):
+            self._max_end[self._size + i] = end
+        for node in range(self._size - 1, 0, -1):
+            left, right = self._max_end[2 * node], self._max_end[2 * node + 1]
+            self._max_end[node] = left if right is None or (left is not None and left >= right) else right
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def overlapping(self, start: date, end: date) -> list:
+        """Items whose [start, end] intersects the given range, by start date"""
+        # Only the prefix starting on or before `end` can overlap
+        limit = bisect_right(self._starts, end)
+        found = []
+        if limit:
+            self._collect(1, 0, self._size, limit, start, found)
+        found.sort()
+        return [self._items[i] for i in found]
+
+    def _collect(self, node: int, lo: int, hi: int, limit: int, start: date, found: list):
+        max_end = self._max_end[node]
+        if lo >= limit or max_end is None or max_end < start:
+            return
+        if hi - lo == 1:
+            found.append(lo)
+            return
+        mid = (lo + hi) // 2
+        self._collect(2 * node, lo, mid, limit, start, found)
+        self._collect(2 * node + 1, mid, hi, limit, start, found)
+
+
+class EventIndex:
+    """IntervalIndex of public events, rebuilt when the data version moves"""
+
+    def __init__(self):
+        self._index: Optional[IntervalIndex] = None
+        self._version = -1
+        self._lock = threading.Lock()
+
+    def invalidate(self):
+        with self._lock:
+            self._index = None
+
+    def _load(self, db: Session) -> IntervalIndex:
+        intervals = []
+        for row in db.execute(PUBLIC_EVENTS):
+            event = dict(zip(NEWS_KEYS + EVENT_PARISH_KEYS, row))
+            start = event["event_start_date"]
+            end = event["event_end_date"] or start
+            intervals.append((start, max(start, end), event))
+        return IntervalIndex(intervals)
+
+    def get(self, db: Session) -> IntervalIndex:
+        """Return the index, rebuilding it if the data changed since it was built"""
+        version = current_version(db)
+        with self._lock:
+            if self._index is not None and self._version >= version:
+                return self._index
+
+        # Loaded without the lock: on the async path this runs on the event
+        # loop thread, and waiting there for another loader's query (which
+        # needs that same loop) would never return. Concurrent misses each
+        # load; the newest result is kept.
+        index = self._load(db)
+        with self._lock:
+            # Like the response cache, never roll back to an older version
+            # read from a lagging replica
+            if self._index is None or version >= self._version:
+                self._index, self._version = index, version
+        return index
+
+    def overlapping(self, db: Session, start: date, end: date) -> List[dict]:
+        """Events overlapping [start, end], ordered by start date"""
+        return [dict(event) for event in self.get(db).overlapping(start, end)]
+
+
+event_index = EventIndex()
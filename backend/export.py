@@ -0,0 +1,150 @@
+"""
+Streaming bulk export of every parish with its mass times and news
+
+Parishes are read through a server-side cursor (yield_per) and written out
+one partition at a time, so memory stays bounded by EXPORT_BATCH_SIZE no
+matter how many parishes exist. Children are loaded per partition with one
+IN query each.
+
+Formats:
+    ndjson - one JSON object per parish, mass_times and news nested
+    csv    - one row per parish, mass_times and news as JSON arrays in
+             their own columns
+
+Both formats are re-importable with importer.py, is_active flags and news
+included. Password hashes are never exported: re-imported accounts get the
+importer's default password, or none (see importer.run_import).
+"""
+
+import csv
+import io
+import os
+from datetime import datetime
+from typing import Dict, Iterator, List
+
+import orjson
+from sqlalchemy import select
+
+from database import SessionLocal
+from models import Parish, MassTime, ParochialNews
+
+EXPORT_BATCH_SIZE = int(os.getenv("EXPORT_BATCH_SIZE", "500"))
+
+EXPORT_FORMATS = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv",
+}
+
+# admin_password_hash is deliberately never exported
+PARISH_COLUMNS = (
+    Parish.id,
+    Parish.name,
+    Parish.diocese_id,
+    Parish.city,
+    Parish.region,
+    Parish.address,
+    Parish.latitude,
+    Parish.longitude,
+    Parish.phone,
+    Parish.email,
+    Parish.website,
+    Parish.admin_email,
+    Parish.is_approved,
+    Parish.created_at,
+    Parish.updated_at,
+)
+PARISH_KEYS = [c.key for c in PARISH_COLUMNS]
+
+MASS_TIME_COLUMNS = (
+    MassTime.id,
+    MassTime.day_of_week,
+    MassTime.time,
+    MassTime.language,
+    MassTime.mass_type,
+    MassTime.notes,
+    MassTime.is_active,
+)
+MASS_TIME_KEYS = [c.key for c in MASS_TIME_COLUMNS]
+
+NEWS_COLUMNS = (
+    ParochialNews.id,
+    ParochialNews.title,
+    ParochialNews.content,
+    ParochialNews.category,
+    ParochialNews.is_active,
+    ParochialNews.event_start_date,
+    ParochialNews.event_end_date,
+    ParochialNews.publish_date,
+)
+NEWS_KEYS = [c.key for c in NEWS_COLUMNS]
+
+CSV_HEADER = PARISH_KEYS + ["mass_times", "news"]
+
+
+def _children(db, columns, keys, parish_column, order_column, parish_ids) -> Dict[int, List[dict]]:
+    grouped: Dict[int, List[dict]] = {pid: [] for pid in parish_ids}
+    stmt = select(parish_column, *columns).where(
+        parish_column.in_(parish_ids)
+    ).order_by(order_column)
+    for row in db.execute(stmt):
+        grouped[row[0]].append(dict(zip(keys, row[1:])))
+    return grouped
+
+
+def iter_parish_batches(batch_size: int = EXPORT_BATCH_SIZE) -> Iterator[List[dict]]:
+    """
+    Yield lists of parish dicts (with mass_times and news) from a server-side cursor
+
+    Opens its own session: the generator outlives the request's dependencies
+    when used with StreamingResponse.
+    """
+    db = SessionLocal()
+    try:
+        stmt = select(*PARISH_COLUMNS).where(
+            Parish.is_master_admin == False,
+        ).order_by(Parish.id).execution_options(yield_per=batch_size)
+
+        for partition in db.execute(stmt).partitions():
+            parishes = [dict(zip(PARISH_KEYS, row)) for row in partition]
+            ids = [p["id"] for p in parishes]
+            mass_times = _children(db, MASS_TIME_COLUMNS, MASS_TIME_KEYS,
+                                   MassTime.parish_id, MassTime.id, ids)
+            news = _children(db, NEWS_COLUMNS, NEWS_KEYS,
+                             ParochialNews.parish_id, ParochialNews.id, ids)
+            for parish in parishes:
+                parish["mass_times"] = mass_times[parish["id"]]
+                parish["news"] = news[parish["id"]]
+            yield parishes
+    finally:
+        db.close()
+
+
+def iter_ndjson() -> Iterator[bytes]:
+    """Stream the export as newline-delimited JSON, one chunk per batch"""
+    for batch in iter_parish_batches():
+        yield b"".join(orjson.dumps(p) + b"\n" for p in batch)
+
+
+def _csv_value(value):
+    return value.isoformat() if isinstance(value, datetime) else value
+
+
+def iter_csv() -> Iterator[bytes]:
+    """Stream the export as CSV, one chunk per batch"""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(CSV_HEADER)
+
+    for batch in iter_parish_batches():
+        for parish in batch:
+            row = [_csv_value(parish[key]) for key in PARISH_KEYS]
+            row.append(orjson.dumps(parish["mass_times"]).decode())
+            row.append(orjson.dumps(parish["news"]).decode())
+            writer.writerow(row)
+        yield buffer.getvalue().encode("utf-8")
+        buffer.seek(0)
+        buffer.truncate()
+
+    # Header only, when there is nothing to export
+    if buffer.tell():
+        yield buffer.getvalue().encode("utf-8")
@@ -0,0 +1,334 @@
+"""
+Bulk import of parishes with their mass times and news, straight into the database
+
+Rows are validated with the schemas.py models, admin passwords are hashed
+in a process pool (bcrypt dominates the cost of an import), and parishes
+are inserted in batched transactions: COPY on Postgres, multi-row INSERT
+... RETURNING elsewhere. Rows that fail validation or clash with existing
+data are skipped and reported; the rest is still imported.
+
+Input rows use the ParishCreateRequest fields plus optional "mass_times"
+(MassTimeCreate fields, plus is_active) and "news" (NewsCreate fields, plus
+is_active and publish_date) lists. The export.py formats are accepted as
+is: in CSV, mass_times and news are JSON arrays in their columns. Exports
+carry no password hashes, so a row without admin_password needs a default
+password, or allow_missing_password for accounts to be set up through
+"forgot password".
+"""
+
+import csv
+import io
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from typing import Iterator, List, Optional, Tuple
+
+from pydantic import ValidationError
+from sqlalchemy import func, insert, select, text
+
+from database import SessionLocal
+from models import Diocese, Parish, MassTime, ParochialNews
+from schemas import ParishCreateRequest, MassTimeCreate, NewsCreate
+from auth import get_password_hash
+from news_summary import summarize
+from sync import record_changes, ENTITY_PARISH
+
+PARISH_FIELDS = ("name", "diocese_id", "city", "region", "address", "latitude", "longitude",
+                 "phone", "email", "website", "admin_email")
+MASS_TIME_FIELDS = ("day_of_week", "time", "language", "mass_type", "notes", "is_active")
+NEWS_FIELDS = ("title", "content", "category", "is_active", "event_start_date", "event_end_date")
+
+
+class ImportMassTime(MassTimeCreate):
+    """A mass time of an import row; exports carry is_active and may have no language"""
+    language: Optional[str] = "French"
+    is_active: bool = True
+
+
+class ImportNews(NewsCreate):
+    """A news item of an import row; exports carry is_active and publish_date"""
+    category: Optional[str] = "General"
+    is_active: bool = True
+    publish_date: Optional[datetime] = None
+
+
+class ImportParish(ParishCreateRequest):
+    """A parish row of the import file"""
+    admin_password: Optional[str] = None
+    is_approved: bool = True
+    mass_times: List[ImportMassTime] = []
+    news: List[ImportNews] = []
+
+
+class ImportStats:
+    def __init__(self):
+        self.read = 0
+        self.parishes = 0
+        self.mass_times = 0
+        self.news = 0
+        self.errors: List[Tuple[int, str, str]] = []
+
+    def error(self, line: int, admin_email: Optional[str], message: str):
+        self.errors.append((line, admin_email or "", message))
+
+
+# ============ Reading ============
+
+def detect_format(path: str) -> str:
+    ext = os.path.splitext(path)[1].lower()
+    return {".csv": "csv", ".ndjson": "ndjson", ".jsonl": "ndjson", ".json": "json"}.get(ext, "ndjson")
+
+
+def read_rows(path: str, fmt: str) -> Iterator[Tuple[int, object]]:
+    """
+    Yield (line number, raw row) pairs; the row is a ValueError when it
+    cannot be parsed, so parsing errors end up in the report too
+    """
+    if fmt == "json":
+        with open(path, encoding="utf-8") as f:
+            for i, row in enumerate(json.load(f), 1):
+                yield i, row
+        return
+
+    with open(path, encoding="utf-8", newline="") as f:
+        if fmt == "ndjson":
+            for i, line in enumerate(f, 1):
+                if not line.strip():
+                    continue
+                try:
+                    yield i, json.loads(line)
+                except ValueError as e:
+                    yield i, ValueError(f"JSON invalide: {e}")
+            return
+
+        # Line 1 is the header
+        for i, row in enumerate(csv.DictReader(f), 2):
+            row = {k: (v if v != "" else None) for k, v in row.items()}
+            try:
+                for column in ("mass_times", "news"):
+                    row[column] = json.loads(row.get(column) or "[]")
+            except ValueError as e:
+                yield i, ValueError(f"{column}: JSON invalide: {e}")
+                continue
+            yield i, row
+
+
+def _describe(error: ValidationError) -> str:
+    return "; ".join(
+        f"{'.'.join(str(part) for part in e['loc'])}: {e['msg']}" for e in error.errors()
+    )
+
+
+def validated(
+    rows, default_password: Optional[str], allow_missing_password: bool, stats: ImportStats
+) -> Iterator[Tuple[int, ImportParish]]:
+    seen_emails = set()
+    for line, raw in rows:
+        stats.read += 1
+        if isinstance(raw, Exception):
+            stats.error(line, None, str(raw))
+            continue
+        try:
+            parish = ImportParish.model_validate(raw)
+        except ValidationError as e:
+            stats.error(line, raw.get("admin_email") if isinstance(raw, dict) else None, _describe(e))
+            continue
+
+        email = parish.admin_email.lower()
+        if email in seen_emails:
+            stats.error(line, parish.admin_email, "admin_email en double dans le fichier")
+            continue
+        seen_emails.add(email)
+
+        if parish.admin_password is None:
+            parish.admin_password = default_password
+        if parish.admin_password is None and not allow_missing_password:
+            stats.error(line, parish.admin_email, "admin_password manquant (utilisez --default-password)")
+            continue
+        yield line, parish
+
+
+def batched(items, size: int):
+    batch = []
+    for item in items:
+        batch.append(item)
+        if len(batch) == size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+# ============ Writing ============
+
+def _copy(cursor, table: str, columns: Tuple[str, ...], rows: List[tuple]):
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    for row in rows:
+        # None becomes an unquoted empty field, which COPY ... CSV reads as NULL
+        writer.writerow(["" if v is None else v for v in row])
+    buffer.seek(0)
+    cursor.copy_expert(
+        f"COPY {table} ({', '.join(columns)}) FROM STDIN WITH (FORMAT csv)", buffer
+    )
+
+
+def insert_batch(db, batch: List[Tuple[int, ImportParish]], hashes: List[Optional[str]]) -> Tuple[int, int, int]:
+    """Insert one batch in the caller's transaction; returns (parishes, mass times, news)"""
+    now = datetime.utcnow()
+    parish_rows = [
+        {
+            **{f: getattr(p, f) for f in PARISH_FIELDS},
+            "admin_password_hash": password_hash,
+            "is_master_admin": False,
+            "is_approved": p.is_approved,
+            "created_at": now,
+            "updated_at": now,
+        }
+        for (_, p), password_hash in zip(batch, hashes)
+    ]
+
+    if db.get_bind().dialect.name == "postgresql":
+        ids = db.execute(
+            text("SELECT nextval(pg_get_serial_sequence('parishes', 'id')) FROM generate_series(1, :n)"),
+            {"n": len(parish_rows)},
+        ).scalars().all()
+        cursor = db.connection().connection.cursor()
+        columns = ("id",) + tuple(parish_rows[0])
+        _copy(cursor, "parishes", columns, [(pid, *row.values()) for pid, row in zip(ids, parish_rows)])
+    else:
+        ids = db.execute(
+            insert(Parish).returning(Parish.id, sort_by_parameter_order=True), parish_rows
+        ).scalars().all()
+
+    mass_time_rows = [
+        {
+            "parish_id": parish_id,
+            **{f: getattr(m, f) for f in MASS_TIME_FIELDS},
+            "day_of_week": m.day_of_week.value,
+        }
+        for parish_id, (_, p) in zip(ids, batch)
+        for m in p.mass_times
+    ]
+    news_rows = [
+        {
+            "parish_id": parish_id,
+            **{f: getattr(n, f) for f in NEWS_FIELDS},
+            "summary": summarize(n.content),
+            "publish_date": n.publish_date or now,
+            "created_at": now,
+            "updated_at": now,
+        }
+        for parish_id, (_, p) in zip(ids, batch)
+        for n in p.news
+    ]
+    for model, rows in ((MassTime, mass_time_rows), (ParochialNews, news_rows)):
+        if not rows:
+            continue
+        if db.get_bind().dialect.name == "postgresql":
+            _copy(cursor, model.__tablename__, tuple(rows[0]), [tuple(r.values()) for r in rows])
+        else:
+            db.execute(insert(model), rows)
+
+    # Children of a changed parish are part of its sync delta, no rows needed for them
+    record_changes(db, ENTITY_PARISH, ids)
+    return len(ids), len(mass_time_rows), len(news_rows)
+
+
+def check_batch(db, batch, dioceses: set, stats: ImportStats) -> list:
+    """Drop rows that clash with the database (existing admin_email, unknown diocese)"""
+    # Case-insensitive, like the duplicate check within the file
+    emails = [p.admin_email.lower() for _, p in batch]
+    taken = set(db.execute(
+        select(func.lower(Parish.admin_email)).where(func.lower(Parish.admin_email).in_(emails))
+    ).scalars())
+
+    kept = []
+    for line, parish in batch:
+        if parish.admin_email.lower() in taken:
+            stats.error(line, parish.admin_email, "admin_email déjà utilisé")
+        elif parish.diocese_id not in dioceses:
+            stats.error(line, parish.admin_email, f"Diocèse {parish.diocese_id} non trouvé")
+        else:
+            kept.append((line, parish))
+    return kept
+
+
+def write_batch(batch, hashes, dioceses: set, stats: ImportStats, dry_run: bool):
+    db = SessionLocal()
+    try:
+        hashes = dict(zip((line for line, _ in batch), hashes))
+        batch = check_batch(db, batch, dioceses, stats)
+        if not batch or dry_run:
+            stats.parishes += len(batch)
+            stats.mass_times += sum(len(p.mass_times) for _, p in batch)
+            stats.news += sum(len(p.news) for _, p in batch)
+            return
+        try:
+            parishes, mass_times, news = insert_batch(db, batch, [hashes[line] for line, _ in batch])
+            db.commit()
+        except Exception as e:
+            db.rollback()
+            for line, parish in batch:
+                stats.error(line, parish.admin_email, f"Lot annulé: {e.__class__.__name__}: {e}")
+            return
+        stats.parishes += parishes
+        stats.mass_times += mass_times
+        stats.news += news
+    finally:
+        db.close()
+
+
+def _hash(password: Optional[str]) -> Optional[str]:
+    return get_password_hash(password) if password else None
+
+
+def run_import(
+    rows: Iterator[Tuple[int, object]],
+    batch_size: int = 500,
+    workers: Optional[int] = None,
+    default_password: Optional[str] = None,
+    dry_run: bool = False,
+    allow_missing_password: bool = False,
+) -> ImportStats:
+    """
+    Validate and import parish rows
+
+    Args:
+        rows: (line number, raw dict) pairs, e.g. from read_rows()
+        batch_size: Parishes per transaction
+        workers: Password hashing processes (default: CPU count)
+        default_password: Used for rows without admin_password
+        dry_run: Validate and check against the database, write nothing
+        allow_missing_password: Import rows that have no password (and no
+            default) without one; those accounts must use "forgot password".
+            Otherwise such rows are reported as errors.
+
+    Returns:
+        Counts of imported rows and the per-row errors
+    """
+    stats = ImportStats()
+    workers = workers or os.cpu_count() or 1
+
+    db = SessionLocal()
+    try:
+        dioceses = set(db.execute(select(Diocese.id)).scalars())
+    finally:
+        db.close()
+
+    rows = validated(rows, default_password, allow_missing_password, stats)
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        # Hash batch N+1 in the pool while batch N is being written
+        pending = None
+        for batch in batched(rows, batch_size):
+            passwords = [None if dry_run else p.admin_password for _, p in batch]
+            hashing = (batch, pool.map(_hash, passwords, chunksize=max(1, len(batch) // (workers * 4))))
+            if pending:
+                write_batch(pending[0], list(pending[1]), dioceses, stats, dry_run)
+            pending = hashing
+        if pending:
+            write_batch(pending[0], list(pending[1]), dioceses, stats, dry_run)
+
+    return stats
@@ -1,7 +1,7 @@
 """SQLAlchemy database models"""
 
 from datetime import datetime
-from sqlalchemy import Column, Integer, String, Float, Time, Boolean, ForeignKey, DateTime, Date
+from sqlalchemy import Column, Integer, String, Float, Time, Boolean, ForeignKey, DateTime, Date, Index
 from sqlalchemy.orm import relationship
 from database import Base
 
@@ -18,6 +18,14 @@ class Diocese(Base):
 
 class Parish(Base):
     __tablename__ = "parishes"
+    __table_args__ = (
+        Index("ix_parishes_approved_master", "is_approved", "is_master_admin"),
+        # Master admin list: keyset pagination per sort order, and filters
+        Index("ix_parishes_name_id", "name", "id"),
+        Index("ix_parishes_created_id", "created_at", "id"),
+        Index("ix_parishes_city", "city"),
+        Index("ix_parishes_diocese", "diocese_id"),
+    )
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String, nullable=False)
     diocese_id = Column(Integer, ForeignKey("dioceses.id"))
@@ -38,12 +46,13 @@ class Parish(Base):
     diocese = relationship("Diocese", back_populates="parishes")
     mass_times = relationship("MassTime", back_populates="parish", cascade="all, delete-orphan")
     news = relationship("ParochialNews", back_populates="parish", cascade="all, delete-orphan")
+    archived_news = relationship("ArchivedNews", back_populates="parish", cascade="all, delete-orphan")
 
 
 class MassTime(Base):
     __tablename__ = "mass_times"
     id = Column(Integer, primary_key=True, index=True)
-    parish_id = Column(Integer, ForeignKey("parishes.id"))
+    parish_id = Column(Integer, ForeignKey("parishes.id"), index=True)
     day_of_week = Column(String, nullable=False)
     time = Column(Time, nullable=False)
     language = Column(String, default="French")
@@ -55,10 +64,17 @@ class MassTime(Base):
 
 class ParochialNews(Base):
     __tablename__ = "parochial_news"
+    __table_args__ = (
+        Index("ix_parochial_news_parish_active_publish", "parish_id", "is_active", "publish_date"),
+        Index("ix_parochial_news_parish_publish_id", "parish_id", "publish_date", "id"),
+        Index("ix_parochial_news_event_dates", "event_start_date", "event_end_date"),
+    )
     id = Column(Integer, primary_key=True, index=True)
     parish_id = Column(Integer, ForeignKey("parishes.id"))
     title = Column(String, nullable=False)
     content = Column(String, nullable=False)
+    # Plain-text excerpt for listings (news_summary.py); NULL on rows not backfilled yet
+    summary = Column(String, nullable=True)
     category = Column(String, default="General")
     is_active = Column(Boolean, default=True)
     event_start_date = Column(Date, nullable=True)
@@ -67,3 +83,90 @@ class ParochialNews(Base):
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     parish = relationship("Parish", back_populates="news")
+
+
+class ArchivedNews(Base):
+    """
+    News moved out of parochial_news by news_archive.py
+
+    original_id is the id the item had while published, which clients know it
+    by. SQLite hands the ids of deleted rows out again, so it isn't unique here.
+    """
+    __tablename__ = "parochial_news_archive"
+    __table_args__ = (
+        Index("ix_parochial_news_archive_parish_publish", "parish_id", "publish_date"),
+    )
+    id = Column(Integer, primary_key=True, index=True)
+    original_id = Column(Integer, nullable=False, index=True)
+    parish_id = Column(Integer, ForeignKey("parishes.id"))
+    title = Column(String, nullable=False)
+    content = Column(String, nullable=False)
+    category = Column(String, default="General")
+    is_active = Column(Boolean, default=True)
+    event_start_date = Column(Date, nullable=True)
+    event_end_date = Column(Date, nullable=True)
+    publish_date = Column(DateTime, default=datetime.utcnow)
+    created_at = Column(DateTime, default=datetime.utcnow)
+    updated_at = Column(DateTime, default=datetime.utcnow)
+    archived_at = Column(DateTime, default=datetime.utcnow)
+    parish = relationship("Parish", back_populates="archived_news")
+
+
+class ChangeLog(Base):
+    """Append-only change sequence for public data; the row id is the sync version"""
+    __tablename__ = "change_log"
+    id = Column(Integer, primary_key=True, index=True)
+    entity = Column(String, nullable=False)
+    entity_id = Column(Integer, nullable=False)
+    parish_id = Column(Integer, index=True)
+    changed_at = Column(DateTime, default=datetime.utcnow)
+
+
+class BackfillCheckpoint(Base):
+    """Progress of a batched backfill (see backfill.py); one row per backfill name"""
+    __tablename__ = "backfill_checkpoints"
+    name = Column(String, primary_key=True)
+    last_id = Column(Integer, nullable=False, default=0)
+    rows_updated = Column(Integer, nullable=False, default=0)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    completed_at = Column(DateTime, nullable=True)
+
+
+class ThrottleBucket(Base):
+    """Token bucket of the database throttle backend (see throttle.py)"""
+    __tablename__ = "throttle_buckets"
+    key = Column(String, primary_key=True)
+    tokens = Column(Float, nullable=False)
+    updated_at = Column(Float, nullable=False)  # Unix time, compared in SQL arithmetic
+    allowed = Column(Boolean, nullable=False)  # Outcome of the last take
+
+
+class EmailBroadcast(Base):
+    """Announcement from the master admin to every approved parish admin"""
+    __tablename__ = "email_broadcasts"
+    id = Column(Integer, primary_key=True, index=True)
+    subject = Column(String, nullable=False)
+    html = Column(String, nullable=False)  # Rendered once, copied to each outbox row
+    recipient_count = Column(Integer, nullable=False, default=0)
+    created_at = Column(DateTime, default=datetime.utcnow)
+
+
+class EmailOutbox(Base):
+    """Email queued by a request, delivered by the outbox worker (see email_outbox.py)"""
+    __tablename__ = "email_outbox"
+    __table_args__ = (
+        Index("ix_email_outbox_status_next_attempt", "status", "next_attempt_at"),
+    )
+    id = Column(Integer, primary_key=True, index=True)
+    idempotency_key = Column(String, unique=True, nullable=False)
+    to_address = Column(String, nullable=False)
+    subject = Column(String, nullable=False)
+    html = Column(String, nullable=False)
+    status = Column(String, nullable=False, default="pending")  # pending, sent, failed
+    attempts = Column(Integer, nullable=False, default=0)
+    next_attempt_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+    last_error = Column(String, nullable=True)
+    provider_id = Column(String, nullable=True)
+    created_at = Column(DateTime, default=datetime.utcnow)
+    sent_at = Column(DateTime, nullable=True)
+    broadcast_id = Column(Integer, ForeignKey("email_broadcasts.id"), nullable=True, index=True)
@@ -0,0 +1,123 @@
+"""
+Archival of expired and inactive parochial news
+
+parochial_news only ever grows: every listing scans everything a parish has
+posted. archive_news() moves news that is inactive, or whose event ended
+more than NEWS_ARCHIVE_GRACE_DAYS ago, into parochial_news_archive, in
+batches committed one at a time. Archived items keep their id (as
+original_id; the archive has its own key) and stay readable through the archive endpoints; for sync clients they become
+tombstones, like any news that is no longer published.
+
+Run periodically (e.g. nightly from cron):
+
+    python3 scripts/tools/archive_news.py
+"""
+
+import os
+from datetime import date, datetime, timedelta
+from typing import Callable, List, Optional
+
+from sqlalchemy import delete, func, insert, literal, or_, select, text
+from sqlalchemy.orm import Session
+
+from database import SessionLocal, engine
+from models import ArchivedNews, ParochialNews
+from sync import record_changes, ENTITY_NEWS
+
+NEWS_ARCHIVE_GRACE_DAYS = int(os.getenv("NEWS_ARCHIVE_GRACE_DAYS", "30"))
+
+# Columns copied as is from parochial_news to the archive (id goes to original_id)
+_COPIED = (
+    "parish_id", "title", "content", "category", "is_active",
+    "event_start_date", "event_end_date", "publish_date", "created_at", "updated_at",
+)
+
+
+def archivable(today: date, grace_days: int):
+    """Filter on parochial_news for the rows the archival policy moves out"""
+    # A one-day event only has a start date: it ends that day
+    event_end = func.coalesce(ParochialNews.event_end_date, ParochialNews.event_start_date)
+    return or_(
+        ParochialNews.is_active == False,
+        event_end < today - timedelta(days=grace_days),
+    )
+
+
+def _archive_batch(db: Session, ids: List[int], archived_at: datetime):
+    """Copy the rows to the archive and remove them from the hot table"""
+    db.execute(insert(ArchivedNews).from_select(
+        ["original_id", *_COPIED, "archived_at"],
+        select(ParochialNews.id, *(getattr(ParochialNews, c) for c in _COPIED), literal(archived_at))
+        .where(ParochialNews.id.in_(ids)),
+    ))
+    db.execute(delete(ParochialNews).where(ParochialNews.id.in_(ids)))
+
+
+def archive_news(
+    grace_days: int = NEWS_ARCHIVE_GRACE_DAYS,
+    batch_size: int = 500,
+    today: Optional[date] = None,
+    dry_run: bool = False,
+    log: Callable[[str], None] = print,
+) -> int:
+    """
+    Move archivable news to parochial_news_archive
+
+    Args:
+        grace_days: Days after an event ends (event_end_date, else event_start_date)
+            before it is archived
+        batch_size: News items per transaction
+        today: Reference date (default: today)
+        dry_run: Only count what would be archived
+        log: Called with one line per batch
+
+    Returns:
+        Number of news items archived (or archivable, for a dry run)
+    """
+    policy = archivable(today or date.today(), grace_days)
+    archived = 0
+    last_id = 0
+
+    while True:
+        db = SessionLocal()
+        try:
+            rows = db.execute(
+                select(ParochialNews.id, ParochialNews.parish_id)
+                .where(policy, ParochialNews.id > last_id)
+                .order_by(ParochialNews.id)
+                .limit(batch_size)
+            ).all()
+            if not rows:
+                break
+            last_id = rows[-1][0]
+
+            if not dry_run:
+                _archive_batch(db, [news_id for news_id, _ in rows], datetime.utcnow())
+                by_parish = {}
+                for news_id, parish_id in rows:
+                    by_parish.setdefault(parish_id, []).append(news_id)
+                for parish_id, ids in by_parish.items():
+                    record_changes(db, ENTITY_NEWS, ids, parish_id)
+                db.commit()
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
+
+        archived += len(rows)
+        log(f"  {'would archive' if dry_run else 'archived'} {len(rows)} news (up to id {last_id})")
+
+    return archived
+
+
+def compact():
+    """
+    Give the space freed by archive_news() back (SQLite) or refresh the
+    planner statistics (Postgres). Runs outside a transaction.
+    """
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+        if conn.dialect.name == "postgresql":
+            conn.execute(text("VACUUM ANALYZE parochial_news"))
+        else:
+            conn.execute(text("VACUUM"))
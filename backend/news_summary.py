@@ -0,0 +1,46 @@
+"""
+Plain-text summaries of news items
+
+News listings return a short excerpt instead of the full content; the body
+is fetched per item. The excerpt is computed once at write time and stored
+in parochial_news.summary, so listing queries never read the content
+column. Rows written before the column existed are filled in by
+scripts/migrations/backfill_news_summaries.py; until then, reads fall back
+to a prefix of the content (see queries.NEWS_SUMMARY).
+"""
+
+import html
+import os
+import re
+
+NEWS_SUMMARY_LENGTH = int(os.getenv("NEWS_SUMMARY_LENGTH", "280"))
+
+_TAG = re.compile(r"<[^>]*>")
+_WHITESPACE = re.compile(r"\s+")
+ELLIPSIS = "…"
+
+
+def summarize(content: str, length: int = NEWS_SUMMARY_LENGTH) -> str:
+    """
+    Plain-text excerpt of a news body
+
+    Args:
+        content: News content (plain text, possibly with HTML markup)
+        length: Maximum length of the excerpt, ellipsis included
+
+    Returns:
+        The text without markup and with whitespace collapsed, cut at a word
+        boundary and ended with an ellipsis when it is longer than `length`
+    """
+    text = _WHITESPACE.sub(" ", html.unescape(_TAG.sub(" ", content or ""))).strip()
+    if len(text) <= length:
+        return text
+
+    cut = text[:length - len(ELLIPSIS) + 1]
+    # Back up to the last space unless that would drop most of the excerpt
+    space = cut.rfind(" ")
+    if space > length // 2:
+        cut = cut[:space]
+    else:
+        cut = cut[:length - len(ELLIPSIS)]
+    return cut.rstrip(" ,;:.-") + ELLIPSIS
@@ -0,0 +1,84 @@
+"""
+Keyset (cursor) pagination
+
+OFFSET pagination makes the database walk past every skipped row, so deep
+pages get slower as a table grows, and rows shift between pages when
+something is inserted meanwhile. A keyset page instead continues from the
+sort key of the last row returned:
+
+    WHERE (sort_col, id) > (:last_value, :last_id) ORDER BY sort_col, id
+
+which an index on (sort_col, id) answers by seeking straight to the page.
+The cursor handed to clients is that last key, JSON-encoded and base64url'd;
+it is opaque to them and only valid for the sort order it was issued for.
+"""
+
+import base64
+import json
+from datetime import date, datetime
+from typing import Any, List, Optional, Sequence, Tuple
+
+from sqlalchemy import Select, tuple_
+
+
+def encode_cursor(sort: str, values: Sequence[Any]) -> str:
+    """Cursor for the row whose sort key is `values`, under sort order `sort`"""
+    payload = [sort, [v.isoformat() if isinstance(v, (date, datetime)) else v for v in values]]
+    return base64.urlsafe_b64encode(json.dumps(payload, separators=(",", ":")).encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, sort: str, columns: Sequence) -> Tuple[Any, ...]:
+    """
+    Sort key stored in a cursor, converted back to the columns' Python types
+
+    Raises:
+        ValueError: If the cursor is malformed, was issued for another sort
+            order or holds a value that doesn't fit its column
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        cursor_sort, values = json.loads(raw)
+    except Exception as e:
+        raise ValueError("malformed cursor") from e
+    if cursor_sort != sort or not isinstance(values, list) or len(values) != len(columns):
+        raise ValueError("cursor does not match the sort order")
+
+    return tuple(_decode_value(column, value) for column, value in zip(columns, values))
+
+
+# JSON types a cursor value may have, per column type (bool is an int subclass, so checked apart)
+_JSON_TYPES = {int: (int,), float: (int, float), str: (str,), bool: (bool,)}
+
+
+def _decode_value(column, value: Any) -> Any:
+    """One cursor value, checked against its column's type and converted to it"""
+    if value is None:
+        return None
+    python_type = column.type.python_type
+    if python_type in (datetime, date):
+        if not isinstance(value, str):
+            raise ValueError(f"cursor value for {column.key} is not a date")
+        return python_type.fromisoformat(value)
+    allowed = _JSON_TYPES.get(python_type, ())
+    if not isinstance(value, allowed) or (isinstance(value, bool) and python_type is not bool):
+        raise ValueError(f"cursor value for {column.key} is not a {python_type.__name__}")
+    return value
+
+
+def keyset_select(stmt: Select, columns: Sequence, descending: bool, after: Optional[tuple], limit: int) -> Select:
+    """
+    Order stmt by `columns` and restrict it to the page following `after`
+
+    The last column must be unique (the primary key) so the order is total.
+    One extra row is fetched; pass the result to split_page().
+    """
+    if after is not None:
+        key, bound = tuple_(*columns), tuple_(*after)
+        stmt = stmt.where(key < bound if descending else key > bound)
+    order = [c.desc() if descending else c.asc() for c in columns]
+    return stmt.order_by(*order).limit(limit + 1)
+
+
+def split_page(rows: List, limit: int) -> Tuple[List, bool]:
+    """(the page, whether more rows follow) from the limit + 1 rows of keyset_select()"""
+    return rows[:limit], len(rows) > limit
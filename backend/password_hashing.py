@@ -0,0 +1,153 @@
+"""
+Password hashing off the request threads
+
+bcrypt costs ~200 ms of CPU per call at the default work factor. Run inline
+in a sync endpoint, it holds a threadpool worker and competes for the GIL
+with the event loop serving the async public endpoints, so a burst of
+logins slows everyone down. Here the work is sent to a small process pool;
+the calling thread (or coroutine) only waits for the result.
+
+The number of hashes queued or running is bounded: beyond
+PASSWORD_HASH_MAX_PENDING, callers get a 503 instead of piling up behind
+minutes of bcrypt work. get_hashing_stats() reports the queue depth for
+/api/admin/master/metrics.
+
+PASSWORD_HASH_WORKERS=0 hashes inline (no pool). The work factor is
+BCRYPT_ROUNDS (see auth.py).
+"""
+
+import asyncio
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Optional
+
+from fastapi import HTTPException, status
+
+from auth import BCRYPT_ROUNDS, get_password_hash, verify_password
+
+PASSWORD_HASH_WORKERS = int(os.getenv("PASSWORD_HASH_WORKERS", str(max(1, (os.cpu_count() or 1) // 2))))
+PASSWORD_HASH_MAX_PENDING = int(os.getenv("PASSWORD_HASH_MAX_PENDING", "64"))
+
+
+class _HashingStats:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.pending = 0
+        self.max_pending = 0
+        self.completed = 0
+        self.rejected = 0
+        self.total_ms = 0.0
+
+    def snapshot(self) -> dict:
+        with self.lock:
+            return {
+                "workers": PASSWORD_HASH_WORKERS,
+                "bcrypt_rounds": BCRYPT_ROUNDS,
+                "pending": self.pending,
+                "max_pending": self.max_pending,
+                "pending_limit": PASSWORD_HASH_MAX_PENDING,
+                "completed": self.completed,
+                "rejected": self.rejected,
+                "avg_ms": round(self.total_ms / self.completed, 1) if self.completed else None,
+            }
+
+
+_stats = _HashingStats()
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_lock = threading.Lock()
+
+
+def _get_pool() -> ProcessPoolExecutor:
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            # spawn: forking the multi-threaded server process can deadlock the child
+            _pool = ProcessPoolExecutor(
+                max_workers=PASSWORD_HASH_WORKERS,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return _pool
+
+
+def start():
+    """Start the workers ahead of the first login (called on app startup)"""
+    if PASSWORD_HASH_WORKERS > 0:
+        pool = _get_pool()
+        for future in [pool.submit(int) for _ in range(PASSWORD_HASH_WORKERS)]:
+            future.result()
+
+
+def shutdown():
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown(cancel_futures=True)
+            _pool = None
+
+
+def _submit(fn, *args) -> Future:
+    """Run fn in the pool (or inline), counting it against the pending limit"""
+    with _stats.lock:
+        if _stats.pending >= PASSWORD_HASH_MAX_PENDING:
+            _stats.rejected += 1
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Serveur momentanément surchargé, veuillez réessayer.",
+                headers={"Retry-After": "1"},
+            )
+        _stats.pending += 1
+        _stats.max_pending = max(_stats.max_pending, _stats.pending)
+
+    start = time.perf_counter()
+
+    def done(_future):
+        with _stats.lock:
+            _stats.pending -= 1
+            _stats.completed += 1
+            _stats.total_ms += (time.perf_counter() - start) * 1000
+
+    if PASSWORD_HASH_WORKERS > 0:
+        try:
+            future = _get_pool().submit(fn, *args)
+        except Exception:
+            with _stats.lock:
+                _stats.pending -= 1
+            raise
+    else:
+        future = Future()
+        try:
+            future.set_result(fn(*args))
+        except Exception as e:
+            future.set_exception(e)
+    future.add_done_callback(done)
+    return future
+
+
+# ============ Sync API (def endpoints, in the threadpool) ============
+
+def hash_password(password: str) -> str:
+    """get_password_hash() in the pool; blocks the calling thread without using its CPU"""
+    return _submit(get_password_hash, password).result()
+
+
+def check_password(plain_password: str, hashed_password: str) -> bool:
+    """verify_password() in the pool"""
+    return _submit(verify_password, plain_password, hashed_password).result()
+
+
+# ============ Async API (async def endpoints) ============
+
+async def hash_password_async(password: str) -> str:
+    return await asyncio.wrap_future(_submit(get_password_hash, password))
+
+
+async def check_password_async(plain_password: str, hashed_password: str) -> bool:
+    return await asyncio.wrap_future(_submit(verify_password, plain_password, hashed_password))
+
+
+def get_hashing_stats() -> dict:
+    """Queue depth and timings of the hashing pool"""
+    return _stats.snapshot()
@@ -0,0 +1,343 @@
+"""
+Fast read path for the public API
+
+Public endpoints only need the public columns of parishes, mass times and
+news. These helpers select exactly those columns with SQLAlchemy Core (no ORM
+identity map, no admin columns like admin_password_hash, no pydantic
+validation) and assemble plain dicts whose keys follow the field order of the
+response schemas, so the encoded JSON is byte-compatible with
+ParishResponse / NewsResponse.
+
+Hot-path statements are built once at import time with bound parameters.
+Each request then only binds values: no select() construction, and the
+statement's cache key is memoized, so SQLAlchemy goes straight to its
+compiled-statement cache. See scripts/benchmarks/bench_statement_cache.py.
+"""
+
+from typing import Dict, List, Optional
+from sqlalchemy import bindparam, case, func, select
+from sqlalchemy.orm import Session
+
+from models import Parish, MassTime, ParochialNews, ArchivedNews, ChangeLog
+from news_summary import ELLIPSIS, NEWS_SUMMARY_LENGTH
+from pagination import decode_cursor, encode_cursor, keyset_select, split_page
+
+# Column order must match schemas.ParishResponse / MassTimeResponse / NewsResponse
+PARISH_COLUMNS = (
+    Parish.id,
+    Parish.name,
+    Parish.diocese_id,
+    Parish.city,
+    Parish.region,
+    Parish.address,
+    Parish.latitude,
+    Parish.longitude,
+    Parish.phone,
+    Parish.email,
+    Parish.website,
+)
+PARISH_KEYS = tuple(c.key for c in PARISH_COLUMNS)
+
+MASS_TIME_COLUMNS = (
+    MassTime.id,
+    MassTime.day_of_week,
+    MassTime.time,
+    MassTime.language,
+    MassTime.mass_type,
+    MassTime.notes,
+    MassTime.is_active,
+)
+MASS_TIME_KEYS = tuple(c.key for c in MASS_TIME_COLUMNS)
+
+NEWS_COLUMNS = (
+    ParochialNews.id,
+    ParochialNews.title,
+    ParochialNews.content,
+    ParochialNews.category,
+    ParochialNews.is_active,
+    ParochialNews.event_start_date,
+    ParochialNews.event_end_date,
+    ParochialNews.publish_date,
+)
+NEWS_KEYS = tuple(c.key for c in NEWS_COLUMNS)
+
+# News listings: the stored summary instead of the content (schemas.NewsSummaryResponse).
+# Rows not backfilled yet fall back to a prefix of the content, ellipsized like summarize().
+NEWS_SUMMARY = func.coalesce(
+    ParochialNews.summary,
+    case(
+        (func.length(ParochialNews.content) <= NEWS_SUMMARY_LENGTH, ParochialNews.content),
+        else_=func.substr(ParochialNews.content, 1, NEWS_SUMMARY_LENGTH - 1) + ELLIPSIS,
+    ),
+).label("summary")
+NEWS_SUMMARY_COLUMNS = (
+    ParochialNews.id,
+    ParochialNews.title,
+    NEWS_SUMMARY,
+    ParochialNews.category,
+    ParochialNews.is_active,
+    ParochialNews.event_start_date,
+    ParochialNews.event_end_date,
+    ParochialNews.publish_date,
+)
+NEWS_SUMMARY_KEYS = tuple(c.key for c in NEWS_SUMMARY_COLUMNS)
+
+# Keyset order of news listings, newest first (see pagination.py)
+NEWS_PAGE_SORT = "-publish_date"
+NEWS_PAGE_KEY = (ParochialNews.publish_date, ParochialNews.id)
+
+# Same columns from the archive, plus archived_at (schemas.ArchivedNewsResponse)
+# Archived items are known by the id they had while published
+ARCHIVED_NEWS_COLUMNS = (
+    ArchivedNews.original_id.label("id"),
+    *(getattr(ArchivedNews, key) for key in NEWS_KEYS[1:]),
+    ArchivedNews.archived_at,
+)
+ARCHIVED_NEWS_KEYS = NEWS_KEYS + ("archived_at",)
+
+# Liturgical week order of schedules (schemas.DayOfWeek values)
+DAY_ORDER = ("Sunday", "Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday")
+
+# Keeps IN (...) lists well under SQLite's bound parameter limit
+_CHUNK_SIZE = 500
+
+
+def public_parishes_select():
+    """SELECT of public parish columns restricted to approved, non-master parishes"""
+    return select(*PARISH_COLUMNS).where(
+        Parish.is_approved == True,
+        Parish.is_master_admin == False,
+    )
+
+
+# ============ Cached Statements ============
+
+CURRENT_VERSION = select(func.max(ChangeLog.id))
+
+PUBLIC_PARISH_BY_ID = public_parishes_select().where(Parish.id == bindparam("parish_id"))
+
+PUBLIC_PARISHES_PAGE = public_parishes_select().offset(bindparam("skip")).limit(bindparam("limit"))
+
+PUBLIC_PARISHES_PAGE_BY_DIOCESE = public_parishes_select().where(
+    Parish.diocese_id == bindparam("diocese_id")
+).offset(bindparam("skip")).limit(bindparam("limit"))
+
+LOCATED_PARISHES = public_parishes_select().where(
+    Parish.latitude.isnot(None),
+    Parish.longitude.isnot(None),
+)
+
+MASS_TIMES_FOR_PARISHES = select(MassTime.parish_id, *MASS_TIME_COLUMNS).where(
+    MassTime.parish_id.in_(bindparam("parish_ids", expanding=True))
+).order_by(MassTime.id)
+
+SCHEDULE_FOR_PARISH = select(*MASS_TIME_COLUMNS).where(
+    MassTime.parish_id == bindparam("parish_id"),
+).order_by(
+    case({day: i for i, day in enumerate(DAY_ORDER)}, value=MassTime.day_of_week, else_=len(DAY_ORDER)),
+    MassTime.time,
+    MassTime.id,
+)
+
+PARISH_VERSION = select(func.max(ChangeLog.id)).where(ChangeLog.parish_id == bindparam("parish_id"))
+
+PUBLIC_NEWS_FOR_PARISH = select(*NEWS_COLUMNS).where(
+    ParochialNews.parish_id == bindparam("parish_id"),
+    ParochialNews.is_active == True,
+).order_by(ParochialNews.publish_date.desc()).offset(bindparam("skip")).limit(bindparam("limit"))
+
+NEWS_ITEM = select(*NEWS_COLUMNS).where(
+    ParochialNews.id == bindparam("news_id"),
+    ParochialNews.parish_id == bindparam("parish_id"),
+)
+
+PUBLIC_NEWS_ITEM = NEWS_ITEM.where(ParochialNews.is_active == True)
+
+ARCHIVED_NEWS_FOR_PARISH = select(*ARCHIVED_NEWS_COLUMNS).where(
+    ArchivedNews.parish_id == bindparam("parish_id"),
+).order_by(ArchivedNews.publish_date.desc()).offset(bindparam("skip")).limit(bindparam("limit"))
+
+# Withdrawn (inactive) news is archived too; only its parish's admins see it
+PUBLIC_ARCHIVED_NEWS_FOR_PARISH = ARCHIVED_NEWS_FOR_PARISH.where(ArchivedNews.is_active == True)
+
+PARISH_BY_ID = select(Parish).where(Parish.id == bindparam("parish_id"))
+
+PRINCIPAL_BY_ID = select(
+    Parish.id, Parish.admin_email, Parish.is_master_admin, Parish.is_approved,
+).where(Parish.id == bindparam("parish_id"))
+
+BROADCAST_RECIPIENTS = select(Parish.id, Parish.admin_email).where(
+    Parish.is_approved == True,
+    Parish.is_master_admin == False,
+    Parish.admin_email.isnot(None),
+).order_by(Parish.id)
+
+MANAGED_PARISH_BY_ID = select(Parish).where(
+    Parish.id == bindparam("parish_id"),
+    Parish.is_master_admin == False,
+)
+
+
+def fetch_parish_rows(db: Session, stmt, params: Optional[dict] = None) -> List[dict]:
+    """Run a parish SELECT built from public_parishes_select() and return dicts"""
+    return [dict(zip(PARISH_KEYS, row)) for row in db.execute(stmt, params)]
+
+
+def attach_mass_times(db: Session, parishes: List[dict]) -> List[dict]:
+    """
+    Load mass times for the given parishes in one query per chunk
+
+    Args:
+        db: Database session
+        parishes: Parish dicts from fetch_parish_rows()
+
+    Returns:
+        The same dicts, each with a "mass_times" list (ordered by id)
+    """
+    by_parish: Dict[int, List[dict]] = {}
+    for parish in parishes:
+        parish["mass_times"] = by_parish.setdefault(parish["id"], [])
+
+    ids = list(by_parish)
+    for i in range(0, len(ids), _CHUNK_SIZE):
+        params = {"parish_ids": ids[i:i + _CHUNK_SIZE]}
+        for row in db.execute(MASS_TIMES_FOR_PARISHES, params):
+            by_parish[row[0]].append(dict(zip(MASS_TIME_KEYS, row[1:])))
+
+    return parishes
+
+
+def fetch_public_parishes(
+    db: Session,
+    diocese_id: Optional[int] = None,
+    skip: int = 0,
+    limit: int = 100,
+) -> List[dict]:
+    """Approved parishes with their mass times, paginated like GET /parishes"""
+    params = {"skip": skip, "limit": limit}
+    stmt = PUBLIC_PARISHES_PAGE
+    if diocese_id:
+        stmt = PUBLIC_PARISHES_PAGE_BY_DIOCESE
+        params["diocese_id"] = diocese_id
+    return attach_mass_times(db, fetch_parish_rows(db, stmt, params))
+
+
+def fetch_public_parish(db: Session, parish_id: int) -> Optional[dict]:
+    """A single approved parish with its mass times, or None"""
+    rows = fetch_parish_rows(db, PUBLIC_PARISH_BY_ID, {"parish_id": parish_id})
+    if not rows:
+        return None
+    return attach_mass_times(db, rows)[0]
+
+
+def fetch_located_parishes(db: Session) -> List[dict]:
+    """Approved parishes that have coordinates (mass times not attached)"""
+    return fetch_parish_rows(db, LOCATED_PARISHES)
+
+
+def fetch_public_news(db: Session, parish_id: int, skip: int = 0, limit: int = 100) -> List[dict]:
+    """Active news for a parish, newest first, paginated"""
+    rows = db.execute(PUBLIC_NEWS_FOR_PARISH, {"parish_id": parish_id, "skip": skip, "limit": limit})
+    return [dict(zip(NEWS_KEYS, row)) for row in rows]
+
+
+def fetch_news_page(
+    db: Session, parish_id: int, limit: int, cursor: Optional[str] = None, active_only: bool = True
+) -> dict:
+    """
+    One keyset page of a parish's news summaries, newest first
+
+    Only the summary is read, never the content, so a page costs the same
+    however long the items are and however many the parish has published.
+
+    Args:
+        db: Database session
+        parish_id: Parish ID
+        limit: Page size
+        cursor: next_cursor of the previous page
+        active_only: Exclude inactive items (public listings)
+
+    Returns:
+        {"items", "next_cursor"}; next_cursor is None on the last page
+
+    Raises:
+        ValueError: If the cursor is invalid
+    """
+    after = decode_cursor(cursor, NEWS_PAGE_SORT, NEWS_PAGE_KEY) if cursor else None
+    stmt = select(*NEWS_SUMMARY_COLUMNS).where(ParochialNews.parish_id == parish_id)
+    if active_only:
+        stmt = stmt.where(ParochialNews.is_active == True)
+
+    rows = db.execute(keyset_select(stmt, NEWS_PAGE_KEY, True, after, limit)).all()
+    page, has_more = split_page(rows, limit)
+    items = [dict(zip(NEWS_SUMMARY_KEYS, row)) for row in page]
+
+    next_cursor = None
+    if has_more:
+        last = items[-1]
+        next_cursor = encode_cursor(NEWS_PAGE_SORT, [last["publish_date"], last["id"]])
+    return {"items": items, "next_cursor": next_cursor}
+
+
+def fetch_news_item(db: Session, parish_id: int, news_id: int, active_only: bool = True) -> Optional[dict]:
+    """A single news item of a parish with its full content, or None"""
+    stmt = PUBLIC_NEWS_ITEM if active_only else NEWS_ITEM
+    row = db.execute(stmt, {"parish_id": parish_id, "news_id": news_id}).first()
+    return dict(zip(NEWS_KEYS, row)) if row else None
+
+
+def fetch_archived_news(
+    db: Session, parish_id: int, skip: int = 0, limit: int = 100, active_only: bool = True
+) -> List[dict]:
+    """Archived news for a parish (see news_archive.py), newest first, paginated"""
+    stmt = PUBLIC_ARCHIVED_NEWS_FOR_PARISH if active_only else ARCHIVED_NEWS_FOR_PARISH
+    rows = db.execute(stmt, {"parish_id": parish_id, "skip": skip, "limit": limit})
+    return [dict(zip(ARCHIVED_NEWS_KEYS, row)) for row in rows]
+
+
+def fetch_parish_full(db: Session, parish_id: int, news_limit: int = 20) -> Optional[dict]:
+    """
+    A public parish with its schedule grouped by day and the first page of
+    its active news summaries, in three queries
+
+    Args:
+        db: Database session
+        parish_id: Parish ID
+        news_limit: Most recent active news items to include
+
+    Returns:
+        {"parish", "schedule", "news", "news_next_cursor"}, or None if the
+        parish isn't public. news_next_cursor continues the news listing
+        (GET /api/parishes/{id}/news?cursor=).
+        "schedule" lists only the days that have masses, Sunday first, each
+        with its masses sorted by time.
+    """
+    rows = fetch_parish_rows(db, PUBLIC_PARISH_BY_ID, {"parish_id": parish_id})
+    if not rows:
+        return None
+
+    schedule: List[dict] = []
+    for row in db.execute(SCHEDULE_FOR_PARISH, {"parish_id": parish_id}):
+        mass = dict(zip(MASS_TIME_KEYS, row))
+        # Rows arrive grouped by day already: start a new group on each change
+        if not schedule or schedule[-1]["day_of_week"] != mass["day_of_week"]:
+            schedule.append({"day_of_week": mass["day_of_week"], "masses": []})
+        schedule[-1]["masses"].append(mass)
+
+    news = fetch_news_page(db, parish_id, news_limit) if news_limit else {"items": [], "next_cursor": None}
+    return {
+        "parish": rows[0],
+        "schedule": schedule,
+        "news": news["items"],
+        "news_next_cursor": news["next_cursor"],
+    }
+
+
+def get_parish(db: Session, parish_id: int) -> Optional[Parish]:
+    """ORM lookup of any parish by id (admin and auth paths), or None"""
+    return db.execute(PARISH_BY_ID, {"parish_id": parish_id}).scalar_one_or_none()
+
+
+def get_managed_parish(db: Session, parish_id: int) -> Optional[Parish]:
+    """Like get_parish(), excluding the master admin account"""
+    return db.execute(MANAGED_PARISH_BY_ID, {"parish_id": parish_id}).scalar_one_or_none()
@@ -0,0 +1,469 @@
+"""
+Response compression, content negotiation and caching for the public API
+
+- CompressionMiddleware compresses any compressible response on the fly
+  (brotli or gzip, negotiated from Accept-Encoding), including streams.
+- Public endpoints answer in JSON, or in MessagePack when the client sends
+  Accept: application/msgpack (same field names as schemas.py; mass times
+  are encoded as minutes since midnight, datetimes as msgpack timestamps).
+- cached_response() serves cacheable public GET responses from an in-process
+  cache. The serialized body and its compressed variants are stored together,
+  so identical bytes are compressed once per data version, not once per request.
+
+Cache entries are keyed by URL and tagged with the change_log version (see
+sync.py): any write through the API makes every entry stale, in every worker.
+A TTL bounds staleness for writes made outside the API (seed scripts, tools).
+"""
+
+import gzip
+import hashlib
+import os
+import threading
+import time
+import zlib
+from collections import OrderedDict
+from datetime import date, datetime, time as dtime, timezone
+from typing import Any, Callable, Dict, Optional
+
+import brotli
+import msgpack
+import orjson
+from fastapi import Request, Response
+from pydantic import TypeAdapter
+from sqlalchemy.ext.asyncio import AsyncSession
+from starlette.concurrency import run_in_threadpool
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from sync import current_version
+
+PUBLIC_CACHE_MAX_ENTRIES = int(os.getenv("PUBLIC_CACHE_MAX_ENTRIES", "512"))
+PUBLIC_CACHE_TTL_SECONDS = float(os.getenv("PUBLIC_CACHE_TTL_SECONDS", "300"))
+COMPRESSION_MIN_SIZE = int(os.getenv("COMPRESSION_MIN_SIZE", "500"))
+
+# Preferred first when the client accepts several encodings equally
+SUPPORTED_ENCODINGS = ("br", "gzip")
+
+JSON_MEDIA_TYPE = "application/json"
+MSGPACK_MEDIA_TYPE = "application/msgpack"
+_MSGPACK_ALIASES = (MSGPACK_MEDIA_TYPE, "application/x-msgpack", "application/vnd.msgpack")
+
+# OpenAPI documentation for endpoints that honour Accept: application/msgpack
+MSGPACK_RESPONSES = {200: {"content": {MSGPACK_MEDIA_TYPE: {}}}}
+
+COMPRESSIBLE_TYPES = (
+    "application/json",
+    "application/msgpack",
+    "application/x-ndjson",
+    "text/",
+)
+
+# On-the-fly compression favours speed; cached bodies are compressed once,
+# so they use the maximum ratio.
+_STREAM_BROTLI_QUALITY = 5
+_STREAM_GZIP_LEVEL = 6
+_CACHED_BROTLI_QUALITY = 11
+_CACHED_GZIP_LEVEL = 9
+
+
+# ============ Content Negotiation ============
+
+def _parse_qvalues(header: str) -> Dict[str, float]:
+    """Parse an Accept-style header into {token: q}"""
+    weights = {}
+    for part in header.split(","):
+        token, *params = part.split(";")
+        token = token.strip().lower()
+        if not token:
+            continue
+        q = 1.0
+        for param in params:
+            name, _, value = param.strip().partition("=")
+            if name == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        weights[token] = q
+    return weights
+
+
+def negotiate_encoding(accept_encoding: Optional[str]) -> Optional[str]:
+    """
+    Pick the best supported encoding from an Accept-Encoding header
+
+    Args:
+        accept_encoding: Raw header value (e.g. "gzip, deflate, br;q=0.9")
+
+    Returns:
+        "br", "gzip", or None for identity
+    """
+    if not accept_encoding:
+        return None
+
+    weights = _parse_qvalues(accept_encoding)
+
+    best, best_q = None, 0.0
+    for encoding in SUPPORTED_ENCODINGS:
+        q = weights.get(encoding, weights.get("*", 0.0))
+        if q > best_q:
+            best, best_q = encoding, q
+    return best
+
+
+def negotiate_media_type(accept: Optional[str]) -> str:
+    """
+    Choose JSON or MessagePack from an Accept header
+
+    MessagePack is only served when the client asks for it explicitly and
+    does not prefer JSON; anything else (including */*) gets JSON.
+    """
+    if not accept:
+        return JSON_MEDIA_TYPE
+
+    weights = _parse_qvalues(accept)
+    msgpack_q = max(weights.get(alias, 0.0) for alias in _MSGPACK_ALIASES)
+    if msgpack_q > 0 and msgpack_q >= weights.get(JSON_MEDIA_TYPE, 0.0):
+        return MSGPACK_MEDIA_TYPE
+    return JSON_MEDIA_TYPE
+
+
+def compress_body(body: bytes, encoding: str) -> bytes:
+    """Compress a complete body with maximum ratio (used for cached bodies)"""
+    if encoding == "br":
+        return brotli.compress(body, quality=_CACHED_BROTLI_QUALITY)
+    if encoding == "gzip":
+        return gzip.compress(body, compresslevel=_CACHED_GZIP_LEVEL, mtime=0)
+    return body
+
+
+def _is_compressible(media_type: str) -> bool:
+    return media_type.startswith(COMPRESSIBLE_TYPES)
+
+
+# ============ Streaming Compression Middleware ============
+
+class _StreamCompressor:
+    """Incremental compressor with a common interface for brotli and gzip"""
+
+    def __init__(self, encoding: str):
+        self.encoding = encoding
+        if encoding == "br":
+            self._br = brotli.Compressor(quality=_STREAM_BROTLI_QUALITY)
+        else:
+            # wbits=31 writes a gzip header and trailer
+            self._zlib = zlib.compressobj(_STREAM_GZIP_LEVEL, zlib.DEFLATED, 31)
+
+    def compress(self, data: bytes) -> bytes:
+        """Compress a chunk and flush it so the client can start decoding"""
+        if self.encoding == "br":
+            return self._br.process(data) + self._br.flush()
+        return self._zlib.compress(data) + self._zlib.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self, data: bytes = b"") -> bytes:
+        if self.encoding == "br":
+            return self._br.process(data) + self._br.finish()
+        return self._zlib.compress(data) + self._zlib.flush()
+
+
+class CompressionMiddleware:
+    """
+    ASGI middleware compressing responses with brotli or gzip
+
+    Responses that already carry a Content-Encoding (e.g. served from the
+    precompressed cache), are too small, or are not text-like pass through.
+    """
+
+    def __init__(self, app: ASGIApp, minimum_size: int = COMPRESSION_MIN_SIZE):
+        self.app = app
+        self.minimum_size = minimum_size
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        encoding = negotiate_encoding(Headers(scope=scope).get("accept-encoding"))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        responder = _CompressionResponder(self.app, encoding, self.minimum_size)
+        await responder(scope, receive, send)
+
+
+class _CompressionResponder:
+    def __init__(self, app: ASGIApp, encoding: str, minimum_size: int):
+        self.app = app
+        self.encoding = encoding
+        self.minimum_size = minimum_size
+        self.send: Send = None
+        self.initial_message: Optional[Message] = None
+        self.started = False
+        self.passthrough = False
+        self.compressor: Optional[_StreamCompressor] = None
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        self.send = send
+        await self.app(scope, receive, self.send_with_compression)
+
+    async def send_with_compression(self, message: Message):
+        message_type = message["type"]
+
+        if message_type == "http.response.start":
+            # Defer until the first body chunk tells us the size
+            self.initial_message = message
+            headers = Headers(raw=message["headers"])
+            self.passthrough = (
+                "content-encoding" in headers
+                or not _is_compressible(headers.get("content-type", ""))
+            )
+            return
+
+        if message_type != "http.response.body":
+            await self.send(message)
+            return
+
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+
+        if not self.started:
+            self.started = True
+            if self.passthrough or (not more_body and len(body) < self.minimum_size):
+                await self.send(self.initial_message)
+                await self.send(message)
+                return
+
+            self.compressor = _StreamCompressor(self.encoding)
+            headers = MutableHeaders(raw=self.initial_message["headers"])
+            headers["Content-Encoding"] = self.encoding
+            headers.add_vary_header("Accept-Encoding")
+
+            if not more_body:
+                compressed = self.compressor.finish(body)
+                headers["Content-Length"] = str(len(compressed))
+                await self.send(self.initial_message)
+                await self.send({"type": "http.response.body", "body": compressed})
+                return
+
+            del headers["Content-Length"]
+            await self.send(self.initial_message)
+            await self.send({
+                "type": "http.response.body",
+                "body": self.compressor.compress(body),
+                "more_body": True,
+            })
+            return
+
+        if self.compressor is None:
+            await self.send(message)
+            return
+
+        if more_body:
+            chunk = self.compressor.compress(body)
+        else:
+            chunk = self.compressor.finish(body)
+        await self.send({"type": "http.response.body", "body": chunk, "more_body": more_body})
+
+
+# ============ Serialization ============
+
+_adapters: Dict[Any, TypeAdapter] = {}
+
+
+def to_payload(schema: Any, obj: Any) -> Any:
+    """
+    Validate ORM objects against a response schema into plain Python data
+
+    Args:
+        schema: Pydantic model or typing form, e.g. List[ParishResponse]
+        obj: Object(s) to validate (ORM attributes are read)
+
+    Returns:
+        Dicts/lists with native date/time values, ready for dump_json()
+        or dump_msgpack()
+    """
+    adapter = _adapters.get(schema)
+    if adapter is None:
+        adapter = _adapters[schema] = TypeAdapter(schema)
+    return adapter.dump_python(adapter.validate_python(obj, from_attributes=True))
+
+
+def dump_json(obj: Any) -> bytes:
+    """
+    Encode plain dicts/lists (e.g. from queries.py) to compact UTF-8 JSON
+
+    Dates, times and datetimes are written in ISO format, byte-compatible
+    with FastAPI's response_model output for the same data.
+    """
+    return orjson.dumps(obj)
+
+
+def _msgpack_default(value: Any) -> Any:
+    # datetime must be tested before date (it is a subclass)
+    if isinstance(value, datetime):
+        # Stored datetimes are naive UTC (datetime.utcnow)
+        if value.tzinfo is None:
+            value = value.replace(tzinfo=timezone.utc)
+        return msgpack.Timestamp.from_datetime(value)
+    if isinstance(value, date):
+        return value.isoformat()
+    if isinstance(value, dtime):
+        # Mass times have minute precision: 18:30 -> 1110
+        return value.hour * 60 + value.minute
+    raise TypeError(f"Cannot encode {type(value).__name__} to MessagePack")
+
+
+def dump_msgpack(obj: Any) -> bytes:
+    """
+    Encode plain dicts/lists to MessagePack
+
+    Keys match the JSON output. Times become minutes since midnight (int),
+    datetimes become msgpack timestamps (UTC) and dates stay ISO strings.
+    """
+    return msgpack.packb(obj, default=_msgpack_default, use_bin_type=True)
+
+
+_ENCODERS = {
+    JSON_MEDIA_TYPE: dump_json,
+    MSGPACK_MEDIA_TYPE: dump_msgpack,
+}
+
+
+def negotiated_response(request: Request, payload: Any) -> Response:
+    """Encode an uncached payload in the media type the client asked for"""
+    media_type = negotiate_media_type(request.headers.get("accept"))
+    return Response(
+        content=_ENCODERS[media_type](payload),
+        media_type=media_type,
+        headers={"Vary": "Accept"},
+    )
+
+
+# ============ Precompressed Response Cache ============
+
+class CachedBody:
+    """A serialized response body with lazily built compressed variants"""
+
+    def __init__(self, version: int, body: bytes, media_type: str):
+        self.version = version
+        self.created = time.monotonic()
+        self.body = body
+        self.media_type = media_type
+        self.etag = '"%s"' % hashlib.blake2b(body, digest_size=12).hexdigest()
+        self._variants: Dict[str, bytes] = {}
+        self._lock = threading.Lock()
+
+    def has_variant(self, encoding: Optional[str]) -> bool:
+        return encoding is None or encoding in self._variants
+
+    def encoded(self, encoding: Optional[str]) -> bytes:
+        """Return the body in the given encoding, compressing at most once"""
+        if encoding is None:
+            return self.body
+        variant = self._variants.get(encoding)
+        if variant is None:
+            with self._lock:
+                variant = self._variants.get(encoding)
+                if variant is None:
+                    variant = compress_body(self.body, encoding)
+                    self._variants[encoding] = variant
+        return variant
+
+
+class ResponseCache:
+    """Bounded LRU of CachedBody entries, invalidated by data version and TTL"""
+
+    def __init__(self, max_entries: int, ttl_seconds: float):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[str, CachedBody]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str, version: int) -> Optional[CachedBody]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            # A newer entry is kept: it was built from the primary or a fresher
+            # replica, and a lagging replica must not roll the cache back
+            if entry.version < version or time.monotonic() - entry.created > self.ttl_seconds:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return entry
+
+    def put(self, key: str, entry: CachedBody):
+        with self._lock:
+            current = self._entries.get(key)
+            if current is not None and current.version > entry.version:
+                return
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+public_cache = ResponseCache(PUBLIC_CACHE_MAX_ENTRIES, PUBLIC_CACHE_TTL_SECONDS)
+
+
+def _cache_key(request: Request, media_type: str) -> str:
+    query = "&".join(sorted(request.url.query.split("&"))) if request.url.query else ""
+    return f"{media_type} {request.url.path}?{query}"
+
+
+async def cached_response(
+    request: Request,
+    db: AsyncSession,
+    build: Callable[[Any], Any],
+    version_of: Callable[[Any], int] = current_version,
+) -> Response:
+    """
+    Serve a public GET response from the cache, building it on a miss
+
+    Args:
+        request: Incoming request (URL is the cache key, headers drive negotiation)
+        db: Async database session, used to read the current data version
+        build: Called with a sync Session (via AsyncSession.run_sync) and
+            returns the payload as plain dicts/lists; may raise
+            HTTPException (not cached)
+        version_of: Called with a sync Session; returns the version the
+            response depends on. Default: the global data version. A
+            narrower one (e.g. one parish's) keeps the entry cached across
+            writes that can't affect it.
+
+    Returns:
+        Response in the negotiated media type and encoding, or 304 if the
+        client's If-None-Match matches
+    """
+    media_type = negotiate_media_type(request.headers.get("accept"))
+    key = _cache_key(request, media_type)
+    version = await db.run_sync(version_of)
+
+    entry = public_cache.get(key, version)
+    if entry is None:
+        payload = await db.run_sync(build)
+        entry = CachedBody(version, _ENCODERS[media_type](payload), media_type)
+        public_cache.put(key, entry)
+
+    headers = {"ETag": entry.etag, "Vary": "Accept, Accept-Encoding"}
+    if request.headers.get("if-none-match") == entry.etag:
+        return Response(status_code=304, headers=headers)
+
+    encoding = None
+    if len(entry.body) >= COMPRESSION_MIN_SIZE and _is_compressible(media_type):
+        encoding = negotiate_encoding(request.headers.get("accept-encoding"))
+    if encoding:
+        headers["Content-Encoding"] = encoding
+
+    if entry.has_variant(encoding):
+        content = entry.encoded(encoding)
+    else:
+        # First request for this encoding: brotli at max quality takes a while
+        content = await run_in_threadpool(entry.encoded, encoding)
+
+    return Response(content=content, media_type=media_type, headers=headers)
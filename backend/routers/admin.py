@@ -3,7 +3,9 @@ Admin Router
 Handles protected endpoints for parish administrators to manage their data
 """
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy import delete, func, insert, or_, select, update
 from sqlalchemy.orm import Session
 from pydantic import BaseModel
 from typing import Optional, List
@@ -14,14 +16,32 @@ import os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from backend_api import (
-    get_db, Parish, MassTime, ParochialNews, Diocese,
+    get_db, Parish, MassTime, ParochialNews, ArchivedNews, Diocese,
     MassTimeCreate, MassTimeResponse, ParishResponse,
-    NewsCreate, NewsUpdate, NewsResponse,
-    ParishCreateRequest, ParishAdminResponse, CredentialsUpdateRequest,
-    PendingParishResponse, PasswordChangeRequest
+    NewsCreate, NewsUpdate, NewsResponse, NewsSummaryPage, ArchivedNewsResponse,
+    ParishCreateRequest, ParishAdminResponse, ParishAdminPage, CredentialsUpdateRequest,
+    PendingParishResponse, PasswordChangeRequest,
+    ScheduleReplaceRequest, ScheduleResponse,
+    BroadcastRequest, BroadcastResponse, BroadcastDetailResponse,
+    BulkParishActionRequest, BulkParishActionResponse,
+    EmailBroadcast, EmailOutbox
 )
-from auth import get_current_parish_id, get_current_user, get_password_hash, verify_password
-from email_service import notify_parish_approved, notify_parish_rejected
+from auth import get_current_user, invalidate_principal, get_auth_cache_stats
+from password_hashing import hash_password, check_password, get_hashing_stats
+from email_service import (
+    notify_parish_approved, notify_parish_rejected, notify_parishes_decided, broadcast_to_parish_admins
+)
+from sync import record_change, record_changes, schedule_version, ENTITY_PARISH, ENTITY_MASS_TIME, ENTITY_NEWS
+from export import EXPORT_FORMATS, iter_ndjson, iter_csv
+from events import event_index
+from news_summary import summarize
+from stats import get_stats, stats_cache
+from throttle import get_throttle_stats
+from email_outbox import get_outbox_stats, get_broadcast_counts
+from database import get_pool_stats, get_async_pool_stats, get_replica_pool_stats
+from datetime import datetime
+from pagination import decode_cursor, encode_cursor, keyset_select, split_page
+import queries
 
 router = APIRouter()
 
@@ -49,6 +69,24 @@ def check_parish_access(current_user: dict, parish_id: int):
         )
 
 
+def _news_page(db: Session, parish_id: int, limit: int, cursor: Optional[str]) -> dict:
+    """A page of a parish's news summaries, inactive items included"""
+    try:
+        return queries.fetch_news_page(db, parish_id, limit, cursor, active_only=False)
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Curseur de pagination invalide"
+        )
+
+
+def _contains_pattern(text: str) -> str:
+    """LIKE pattern matching `text` anywhere, with its own % and _ taken literally"""
+    for char in ("\\", "%", "_"):
+        text = text.replace(char, "\\" + char)
+    return f"%{text}%"
+
+
 # ============ Schemas ============
 
 class ParishUpdateRequest(BaseModel):
@@ -84,7 +122,7 @@ def get_my_parish(
     Raises:
         HTTPException 404: If parish not found
     """
-    parish = db.query(Parish).filter(Parish.id == current_user["parish_id"]).first()
+    parish = queries.get_parish(db, current_user["parish_id"])
 
     if not parish:
         raise HTTPException(
@@ -121,7 +159,7 @@ def update_parish(
     # Verify the authenticated parish matches the parish being updated
     check_parish_access(current_user, parish_id)
 
-    parish = db.query(Parish).filter(Parish.id == parish_id).first()
+    parish = queries.get_parish(db, parish_id)
 
     if not parish:
         raise HTTPException(
@@ -134,6 +172,7 @@ def update_parish(
     for field, value in update_data.items():
         setattr(parish, field, value)
 
+    record_change(db, ENTITY_PARISH, parish.id, parish.id)
     db.commit()
     db.refresh(parish)
 
@@ -175,6 +214,8 @@ def add_mass_time(
     )
 
     db.add(db_mass_time)
+    db.flush()
+    record_change(db, ENTITY_MASS_TIME, db_mass_time.id, parish_id)
     db.commit()
     db.refresh(db_mass_time)
 
@@ -227,6 +268,7 @@ def update_mass_time(
     db_mass_time.mass_type = mass_time.mass_type
     db_mass_time.notes = mass_time.notes
 
+    record_change(db, ENTITY_MASS_TIME, db_mass_time.id, parish_id)
     db.commit()
     db.refresh(db_mass_time)
 
@@ -270,36 +312,322 @@ def delete_mass_time(
             detail="Horaire de messe non trouvé"
         )
 
+    record_change(db, ENTITY_MASS_TIME, db_mass_time.id, parish_id)
     db.delete(db_mass_time)
     db.commit()
 
     return {"message": "Horaire de messe supprimé avec succès"}
 
 
+_SCHEDULE_FIELDS = ("day_of_week", "time", "language", "mass_type", "notes")
+
+
+def _schedule(db: Session, parish_id: int) -> dict:
+    # Version first: a change landing in between makes it stale (a 409), never too new
+    version = schedule_version(db, parish_id)
+    mass_times = db.query(MassTime).filter(
+        MassTime.parish_id == parish_id
+    ).order_by(MassTime.id).all()
+    return {"version": version, "mass_times": mass_times}
+
+
+@router.get("/parishes/{parish_id}/schedule", response_model=ScheduleResponse)
+def get_schedule(
+    parish_id: int,
+    current_user: dict = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Get the whole weekly schedule and its version
+
+    Args:
+        parish_id: Parish ID
+        current_user: Current user info (parish_id, is_master_admin)
+        db: Database session
+
+    Returns:
+        Every mass time, inactive ones included, and the version to send
+        back as base_version when replacing the schedule
+
+    Raises:
+        HTTPException 403: If user doesn't have access to this parish
+    """
+    check_parish_access(current_user, parish_id)
+    return _schedule(db, parish_id)
+
+
+@router.put("/parishes/{parish_id}/schedule", response_model=ScheduleResponse)
+def replace_schedule(
+    parish_id: int,
+    schedule: ScheduleReplaceRequest,
+    current_user: dict = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Replace the whole weekly schedule in one transaction
+
+    The submitted list is diffed against the current mass times: entries
+    with an id update that row, entries without an id are matched to an
+    unclaimed row on the same day and time or inserted, and rows left
+    over are deleted. Each group is written with a single bulk statement.
+
+    Args:
+        parish_id: Parish ID
+        schedule: Complete list of mass times, and optionally the version
+            the client last loaded
+        current_user: Current user info (parish_id, is_master_admin)
+        db: Database session
+
+    Returns:
+        The new schedule and its version (pass it as base_version next time)
+
+    Raises:
+        HTTPException 403: If user doesn't have access to this parish
+        HTTPException 404: If the parish or a referenced mass time is not found
+        HTTPException 409: If the schedule changed since base_version
+    """
+    check_parish_access(current_user, parish_id)
+
+    # Row lock serializes concurrent schedule edits of this parish (Postgres)
+    parish = db.execute(
+        select(Parish.id).where(Parish.id == parish_id).with_for_update()
+    ).first()
+    if not parish:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Paroisse non trouvée"
+        )
+
+    if schedule.base_version is not None and schedule_version(db, parish_id) > schedule.base_version:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="L'horaire a été modifié entre-temps. Veuillez recharger la page."
+        )
+
+    current = {
+        row.id: row
+        for row in db.execute(
+            select(MassTime.id, *(getattr(MassTime, f) for f in _SCHEDULE_FIELDS))
+            .where(MassTime.parish_id == parish_id)
+        )
+    }
+
+    unclaimed = dict(current)
+    matched = []
+    unmatched = []
+    for entry in schedule.mass_times:
+        values = entry.dict(include=set(_SCHEDULE_FIELDS))
+        values["day_of_week"] = entry.day_of_week.value
+        if entry.id is None:
+            unmatched.append(values)
+        elif entry.id in unclaimed:
+            matched.append((unclaimed.pop(entry.id), values))
+        elif entry.id in current:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Horaire de messe {entry.id} en double"
+            )
+        else:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Horaire de messe {entry.id} non trouvé"
+            )
+
+    # Entries sent without an id that already exist are kept, not re-created
+    by_slot = {}
+    for row in unclaimed.values():
+        by_slot.setdefault((row.day_of_week, row.time), []).append(row)
+    inserts = []
+    for values in unmatched:
+        same_slot = by_slot.get((values["day_of_week"], values["time"]))
+        if same_slot:
+            row = same_slot.pop(0)
+            del unclaimed[row.id]
+            matched.append((row, values))
+        else:
+            inserts.append({"parish_id": parish_id, **values})
+
+    updates = [
+        {"id": row.id, **values}
+        for row, values in matched
+        if any(getattr(row, f) != values[f] for f in _SCHEDULE_FIELDS)
+    ]
+    deletes = list(unclaimed)
+
+    if deletes:
+        db.execute(delete(MassTime).where(MassTime.id.in_(deletes)))
+    if updates:
+        db.execute(update(MassTime), updates)
+    inserted = []
+    if inserts:
+        inserted = db.execute(insert(MassTime).returning(MassTime.id), inserts).scalars().all()
+
+    record_changes(db, ENTITY_MASS_TIME, deletes + [u["id"] for u in updates] + inserted, parish_id)
+    db.commit()
+
+    return _schedule(db, parish_id)
+
+
+# ============ Dashboard Statistics ============
+
+@router.get("/stats")
+def get_dashboard_stats(
+    scope: Optional[str] = Query(None, pattern="^(parish|master)$"),
+    parish_id: Optional[int] = None,
+    current_user: dict = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Counts for the admin dashboards, aggregated in SQL and cached until the
+    next write in their scope (see stats.py)
+
+    Args:
+        scope: parish (default for parish admins) or master (default for
+            the master admin, who may also ask for any parish's scope)
+        parish_id: Parish of the parish scope (default: the caller's own)
+        current_user: Current user info
+        db: Database session
+
+    Returns:
+        Masses by day and language, news by status and category; for the
+        master scope also parishes approved, pending and without coordinates
+
+    Raises:
+        HTTPException 403: If a parish admin asks for the master scope or another parish
+    """
+    scope = scope or ("master" if current_user["is_master_admin"] else "parish")
+    if scope == "master":
+        if not current_user["is_master_admin"]:
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="Accès réservé à l'administrateur principal"
+            )
+        return get_stats(db)
+
+    if parish_id is None:
+        parish_id = current_user["parish_id"]
+    check_parish_access(current_user, parish_id)
+    return get_stats(db, parish_id)
+
+
 # ============ Parish News Endpoints ============
 
-@router.get("/parish/news", response_model=List[NewsResponse])
+@router.get("/parish/news", response_model=NewsSummaryPage)
 def get_my_parish_news(
+    limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = None,
     current_user: dict = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
     """
-    Get all news for the authenticated parish
+    Get the news of the authenticated parish, one page at a time
+
+    Items carry a plain-text summary; fetch the full content with
+    GET /parishes/{parish_id}/news/{news_id}.
 
     Args:
+        limit: Page size
+        cursor: next_cursor of the previous page
         current_user: Current user info (parish_id, is_master_admin)
         db: Database session
 
     Returns:
-        List of parish news items
+        A page of news summaries, newest first (archived items excluded),
+        and the next cursor
+
+    Raises:
+        HTTPException 400: If the cursor is invalid
+    """
+    return _news_page(db, current_user["parish_id"], limit, cursor)
+
+
+@router.get("/parishes/{parish_id}/news", response_model=NewsSummaryPage)
+def get_parish_news_admin(
+    parish_id: int,
+    limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = None,
+    current_user: dict = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
     """
-    news = db.query(ParochialNews).filter(
-        ParochialNews.parish_id == current_user["parish_id"]
-    ).order_by(ParochialNews.publish_date.desc()).all()
+    Get the news of a parish, inactive items included, one page at a time
+
+    Args:
+        parish_id: Parish ID
+        limit: Page size
+        cursor: next_cursor of the previous page
+        current_user: Current user info (parish_id, is_master_admin)
+        db: Database session
+
+    Returns:
+        A page of news summaries, newest first, and the next cursor
+
+    Raises:
+        HTTPException 400: If the cursor is invalid
+        HTTPException 403: If trying to read news of a different parish
+    """
+    check_parish_access(current_user, parish_id)
+    return _news_page(db, parish_id, limit, cursor)
+
+
+@router.get("/parishes/{parish_id}/news/{news_id}", response_model=NewsResponse)
+def get_news_item(
+    parish_id: int,
+    news_id: int,
+    current_user: dict = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Get a news item with its full content (e.g. to edit it)
+
+    Args:
+        parish_id: Parish ID
+        news_id: News ID
+        current_user: Current user info (parish_id, is_master_admin)
+        db: Database session
+
+    Returns:
+        The news item, active or not
+
+    Raises:
+        HTTPException 403: If trying to read news of a different parish
+        HTTPException 404: If news not found
+    """
+    check_parish_access(current_user, parish_id)
+
+    news = queries.fetch_news_item(db, parish_id, news_id, active_only=False)
+
+    if not news:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Actualité non trouvée"
+        )
 
     return news
 
 
+@router.get("/parish/news/archive", response_model=List[ArchivedNewsResponse])
+def get_my_parish_news_archive(
+    skip: int = 0,
+    limit: int = 100,
+    current_user: dict = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Get the archived news of the authenticated parish (see news_archive.py)
+
+    Args:
+        skip: Number of records to skip (pagination)
+        limit: Maximum number of records to return
+        current_user: Current user info (parish_id, is_master_admin)
+        db: Database session
+
+    Returns:
+        List of archived news items, newest first, withdrawn ones included
+    """
+    return queries.fetch_archived_news(db, current_user["parish_id"], skip, limit, active_only=False)
+
+
 @router.post("/parishes/{parish_id}/news", response_model=NewsResponse)
 def add_news(
     parish_id: int,
@@ -329,13 +657,17 @@ def add_news(
         parish_id=parish_id,
         title=news.title,
         content=news.content,
+        summary=summarize(news.content),
         category=news.category,
         event_start_date=news.event_start_date,
         event_end_date=news.event_end_date,
     )
 
     db.add(db_news)
+    db.flush()
+    record_change(db, ENTITY_NEWS, db_news.id, parish_id)
     db.commit()
+    event_index.invalidate()
     db.refresh(db_news)
 
     return db_news
@@ -385,6 +717,7 @@ def update_news(
         db_news.title = news.title
     if news.content is not None:
         db_news.content = news.content
+        db_news.summary = summarize(news.content)
     if news.category is not None:
         db_news.category = news.category
     if news.event_start_date is not None:
@@ -392,7 +725,9 @@ def update_news(
     if news.event_end_date is not None:
         db_news.event_end_date = news.event_end_date
 
+    record_change(db, ENTITY_NEWS, db_news.id, parish_id)
     db.commit()
+    event_index.invalidate()
     db.refresh(db_news)
 
     return db_news
@@ -435,30 +770,60 @@ def delete_news(
             detail="Actualité non trouvée"
         )
 
+    record_change(db, ENTITY_NEWS, db_news.id, parish_id)
     db.delete(db_news)
     db.commit()
+    event_index.invalidate()
 
     return {"message": "Actualité supprimée avec succès"}
 
 
 # ============ Master Admin Endpoints ============
 
-@router.get("/master/parishes", response_model=List[ParishAdminResponse])
+# Sort orders of the master parish list: (key columns, descending)
+MASTER_PARISH_SORTS = {
+    "name": ((Parish.name, Parish.id), False),
+    "-name": ((Parish.name, Parish.id), True),
+    "created_at": ((Parish.created_at, Parish.id), False),
+    "-created_at": ((Parish.created_at, Parish.id), True),
+}
+
+
+@router.get("/master/parishes", response_model=ParishAdminPage)
 def get_all_parishes(
+    q: Optional[str] = Query(None, max_length=100),
+    approved: Optional[bool] = None,
+    city: Optional[str] = None,
+    diocese_id: Optional[int] = None,
+    sort: str = Query("name", pattern="^-?(name|created_at)$"),
+    limit: int = Query(50, ge=1, le=200),
+    cursor: Optional[str] = None,
     current_user: dict = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
     """
-    Get list of all parishes (Master Admin only)
+    Get a page of parishes (Master Admin only)
+
+    Filtering, sorting and pagination all happen in SQL; pages are keyset
+    paginated (see pagination.py), so every page costs the same however
+    far into the list it is.
 
     Args:
+        q: Case-insensitive search in name, city and admin email
+        approved: Only approved (true) or pending (false) parishes
+        city: Exact city
+        diocese_id: Only parishes of this diocese
+        sort: name, created_at, or either prefixed with - for descending
+        limit: Page size
+        cursor: next_cursor of the previous page
         current_user: Current user info
         db: Database session
 
     Returns:
-        List of all parishes
+        The page, the total number of matching parishes and the next cursor
 
     Raises:
+        HTTPException 400: If the cursor is invalid for this sort order
         HTTPException 403: If user is not master admin
     """
     if not current_user["is_master_admin"]:
@@ -467,11 +832,80 @@ def get_all_parishes(
             detail="Accès réservé à l'administrateur principal"
         )
 
-    parishes = db.query(Parish).filter(
-        Parish.is_master_admin == False  # Exclude master admin "parish"
-    ).all()
+    filters = [Parish.is_master_admin == False]  # Exclude master admin "parish"
+    if q and q.strip():
+        pattern = _contains_pattern(q.strip().lower())
+        filters.append(or_(
+            func.lower(Parish.name).like(pattern, escape="\\"),
+            func.lower(Parish.city).like(pattern, escape="\\"),
+            func.lower(Parish.admin_email).like(pattern, escape="\\"),
+        ))
+    if approved is not None:
+        filters.append(Parish.is_approved == approved)
+    if city:
+        filters.append(Parish.city == city)
+    if diocese_id is not None:
+        filters.append(Parish.diocese_id == diocese_id)
+
+    columns, descending = MASTER_PARISH_SORTS[sort]
+    after = None
+    if cursor:
+        try:
+            after = decode_cursor(cursor, sort, columns)
+        except ValueError:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Curseur de pagination invalide"
+            )
+
+    total = db.execute(select(func.count()).select_from(Parish).where(*filters)).scalar()
+    rows = db.execute(
+        keyset_select(select(Parish).where(*filters), columns, descending, after, limit)
+    ).scalars().all()
+    parishes, has_more = split_page(rows, limit)
+
+    next_cursor = None
+    if has_more:
+        last = parishes[-1]
+        next_cursor = encode_cursor(sort, [getattr(last, c.key) for c in columns])
+    return {"items": parishes, "total": total, "next_cursor": next_cursor}
+
 
-    return parishes
+@router.get("/master/export")
+def export_parishes(
+    format: str = Query("ndjson", pattern="^(ndjson|csv)$"),
+    current_user: dict = Depends(get_current_user),
+):
+    """
+    Stream every parish with its mass times and news (Master Admin only)
+
+    Reads through a server-side cursor and streams the response, so memory
+    use does not grow with the number of parishes.
+
+    Args:
+        format: "ndjson" (one parish per line) or "csv" (one parish per row)
+        current_user: Current user info
+
+    Returns:
+        Streaming file download
+
+    Raises:
+        HTTPException 403: If user is not master admin
+    """
+    if not current_user["is_master_admin"]:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Accès réservé à l'administrateur principal"
+        )
+
+    content = iter_ndjson() if format == "ndjson" else iter_csv()
+    filename = f"paroisses-{datetime.utcnow():%Y%m%d}.{format}"
+
+    return StreamingResponse(
+        content,
+        media_type=EXPORT_FORMATS[format],
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
 
 
 @router.post("/master/parishes", response_model=ParishAdminResponse)
@@ -524,7 +958,7 @@ def create_parish(
         )
 
     # Hash password
-    password_hash = get_password_hash(parish_data.admin_password)
+    password_hash = hash_password(parish_data.admin_password)
 
     # Create parish
     new_parish = Parish(
@@ -545,6 +979,8 @@ def create_parish(
     )
 
     db.add(new_parish)
+    db.flush()
+    record_change(db, ENTITY_PARISH, new_parish.id, new_parish.id)
     db.commit()
     db.refresh(new_parish)
 
@@ -580,10 +1016,8 @@ def update_parish_admin(
             detail="Accès réservé à l'administrateur principal"
         )
 
-    parish = db.query(Parish).filter(
-        Parish.id == parish_id,
-        Parish.is_master_admin == False  # Don't allow editing master admin
-    ).first()
+    # Don't allow editing master admin
+    parish = queries.get_managed_parish(db, parish_id)
 
     if not parish:
         raise HTTPException(
@@ -596,6 +1030,7 @@ def update_parish_admin(
     for field, value in update_data.items():
         setattr(parish, field, value)
 
+    record_change(db, ENTITY_PARISH, parish.id, parish.id)
     db.commit()
     db.refresh(parish)
 
@@ -632,7 +1067,7 @@ def delete_parish(
             detail="Accès réservé à l'administrateur principal"
         )
 
-    parish = db.query(Parish).filter(Parish.id == parish_id).first()
+    parish = queries.get_parish(db, parish_id)
 
     if not parish:
         raise HTTPException(
@@ -648,8 +1083,10 @@ def delete_parish(
         )
 
     # Delete parish (cascade will handle mass_times and news)
+    record_change(db, ENTITY_PARISH, parish.id, parish.id)
     db.delete(parish)
     db.commit()
+    invalidate_principal(parish_id)
 
     return {"message": f"Paroisse '{parish.name}' supprimée avec succès"}
 
@@ -684,10 +1121,7 @@ def update_credentials(
             detail="Accès réservé à l'administrateur principal"
         )
 
-    parish = db.query(Parish).filter(
-        Parish.id == parish_id,
-        Parish.is_master_admin == False
-    ).first()
+    parish = queries.get_managed_parish(db, parish_id)
 
     if not parish:
         raise HTTPException(
@@ -713,9 +1147,10 @@ def update_credentials(
 
     # Update password if provided
     if credentials.admin_password:
-        parish.admin_password_hash = get_password_hash(credentials.admin_password)
+        parish.admin_password_hash = hash_password(credentials.admin_password)
 
     db.commit()
+    invalidate_principal(parish_id)
 
     return {"message": "Identifiants mis à jour avec succès"}
 
@@ -754,10 +1189,7 @@ def approve_parish(
             detail="Accès réservé à l'administrateur principal"
         )
 
-    parish = db.query(Parish).filter(
-        Parish.id == parish_id,
-        Parish.is_master_admin == False,
-    ).first()
+    parish = queries.get_managed_parish(db, parish_id)
     if not parish:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -765,12 +1197,16 @@ def approve_parish(
         )
 
     parish.is_approved = True
-    db.commit()
-
+    record_change(db, ENTITY_PARISH, parish.id, parish.id)
     notify_parish_approved(
+        db,
+        parish_id=parish.id,
         admin_email=parish.admin_email,
         parish_name=parish.name,
+        registered_at=parish.created_at,
     )
+    db.commit()
+    invalidate_principal(parish_id)
 
     return {"message": f"Paroisse '{parish.name}' approuvée avec succès"}
 
@@ -802,17 +1238,245 @@ def reject_parish(
     parish_admin_email = parish.admin_email
     parish_name = parish.name
 
-    db.delete(parish)
-    db.commit()
-
+    record_change(db, ENTITY_PARISH, parish.id, parish.id)
     notify_parish_rejected(
+        db,
+        parish_id=parish_id,
         admin_email=parish_admin_email,
         parish_name=parish_name,
+        registered_at=parish.created_at,
     )
+    db.delete(parish)
+    db.commit()
+    invalidate_principal(parish_id)
 
     return {"message": f"Inscription de '{parish_name}' rejetée"}
 
 
+# Outcome of each bulk action on an eligible parish
+_BULK_DONE = {"approve": "approved", "reject": "rejected", "delete": "deleted"}
+
+
+@router.post("/master/parishes/bulk", response_model=BulkParishActionResponse)
+def bulk_parish_action(
+    request: BulkParishActionRequest,
+    current_user: dict = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Approve, reject or delete many parishes in one transaction (Master Admin only)
+
+    The whole batch is one UPDATE (approve) or one DELETE per table
+    (reject, delete), one change_log insert and one outbox insert for the
+    notification emails, committed together.
+
+    Args:
+        request: The action and the parish ids
+        current_user: Current user info
+        db: Database session
+
+    Returns:
+        The number of parishes changed and a result per requested id:
+        not_found, skipped (master admin account, already approved, or
+        rejecting an approved parish) or the action's outcome
+
+    Raises:
+        HTTPException 403: If user is not master admin
+    """
+    if not current_user["is_master_admin"]:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Accès réservé à l'administrateur principal"
+        )
+
+    ids = list(dict.fromkeys(request.ids))
+    found = {
+        row.id: row
+        for row in db.execute(
+            select(Parish.id, Parish.name, Parish.admin_email, Parish.created_at,
+                   Parish.is_approved, Parish.is_master_admin)
+            .where(Parish.id.in_(ids))
+        )
+    }
+
+    results = {}
+    targets = []
+    for parish_id in ids:
+        parish = found.get(parish_id)
+        if parish is None:
+            results[parish_id] = {"id": parish_id, "status": "not_found", "detail": "Paroisse non trouvée"}
+        elif parish.is_master_admin:
+            results[parish_id] = {"id": parish_id, "status": "skipped",
+                                  "detail": "Compte administrateur principal"}
+        elif request.action == "approve" and parish.is_approved:
+            results[parish_id] = {"id": parish_id, "status": "skipped", "detail": "Déjà approuvée"}
+        elif request.action == "reject" and parish.is_approved:
+            results[parish_id] = {"id": parish_id, "status": "skipped",
+                                  "detail": "Déjà approuvée (utilisez la suppression)"}
+        else:
+            targets.append(parish)
+            results[parish_id] = {"id": parish_id, "status": _BULK_DONE[request.action], "detail": None}
+
+    target_ids = [p.id for p in targets]
+    if target_ids:
+        if request.action == "approve":
+            db.execute(
+                update(Parish).where(Parish.id.in_(target_ids))
+                .values(is_approved=True, updated_at=datetime.utcnow())
+            )
+        else:
+            # What the ORM cascade does for a single delete, as set-based statements
+            for model in (MassTime, ParochialNews, ArchivedNews):
+                db.execute(delete(model).where(model.parish_id.in_(target_ids)))
+            db.execute(delete(Parish).where(Parish.id.in_(target_ids)))
+        record_changes(db, ENTITY_PARISH, target_ids)
+        if request.action != "delete":
+            notify_parishes_decided(
+                db,
+                approved=request.action == "approve",
+                parishes=[(p.id, p.admin_email, p.name, p.created_at) for p in targets],
+            )
+        db.commit()
+        for parish_id in target_ids:
+            invalidate_principal(parish_id)
+        if request.action == "delete":
+            event_index.invalidate()
+
+    return {
+        "action": request.action,
+        "applied": len(target_ids),
+        "results": [results[parish_id] for parish_id in ids],
+    }
+
+
+# ============ Broadcasts (Master Admin) ============
+
+def _broadcast_response(broadcast: EmailBroadcast, counts: dict) -> dict:
+    return {
+        "id": broadcast.id,
+        "subject": broadcast.subject,
+        "recipient_count": broadcast.recipient_count,
+        "pending": counts["pending"],
+        "sent": counts["sent"],
+        "failed": counts["failed"],
+        "created_at": broadcast.created_at,
+    }
+
+
+@router.post("/master/broadcasts", response_model=BroadcastResponse, status_code=status.HTTP_202_ACCEPTED)
+def create_broadcast(
+    broadcast_data: BroadcastRequest,
+    current_user: dict = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Email an announcement to every approved parish admin
+
+    The emails are queued and delivered by the outbox worker, at most
+    EMAIL_PROVIDER_RATE_PER_SECOND; follow progress with
+    GET /master/broadcasts/{id}.
+    """
+    if not current_user["is_master_admin"]:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Accès réservé à l'administrateur principal"
+        )
+    if not broadcast_data.subject.strip() or not broadcast_data.message.strip():
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="L'objet et le message sont obligatoires"
+        )
+
+    broadcast = broadcast_to_parish_admins(db, broadcast_data.subject.strip(), broadcast_data.message)
+    db.commit()
+    counts = get_broadcast_counts(db, [broadcast.id])[broadcast.id]
+    return _broadcast_response(broadcast, counts)
+
+
+@router.get("/master/broadcasts", response_model=List[BroadcastResponse])
+def list_broadcasts(
+    skip: int = Query(0, ge=0),
+    limit: int = Query(20, ge=1, le=100),
+    current_user: dict = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """Broadcasts, most recent first, with their delivery progress"""
+    if not current_user["is_master_admin"]:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Accès réservé à l'administrateur principal"
+        )
+
+    broadcasts = db.query(EmailBroadcast).order_by(EmailBroadcast.id.desc()).offset(skip).limit(limit).all()
+    counts = get_broadcast_counts(db, [b.id for b in broadcasts])
+    return [_broadcast_response(b, counts[b.id]) for b in broadcasts]
+
+
+@router.get("/master/broadcasts/{broadcast_id}", response_model=BroadcastDetailResponse)
+def get_broadcast(
+    broadcast_id: int,
+    status_filter: Optional[str] = Query(None, alias="status", pattern="^(pending|sent|failed)$"),
+    skip: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=1000),
+    current_user: dict = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """Delivery status of a broadcast, per recipient (optionally only one status)"""
+    if not current_user["is_master_admin"]:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Accès réservé à l'administrateur principal"
+        )
+
+    broadcast = db.get(EmailBroadcast, broadcast_id)
+    if not broadcast:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Annonce introuvable"
+        )
+
+    recipients = db.query(EmailOutbox).filter(EmailOutbox.broadcast_id == broadcast_id)
+    if status_filter:
+        recipients = recipients.filter(EmailOutbox.status == status_filter)
+    recipients = recipients.order_by(EmailOutbox.id).offset(skip).limit(limit).all()
+
+    response = _broadcast_response(broadcast, get_broadcast_counts(db, [broadcast_id])[broadcast_id])
+    response["recipients"] = recipients
+    return response
+
+
+# ============ Runtime Metrics (Master Admin) ============
+
+@router.get("/master/metrics")
+def get_metrics(current_user: dict = Depends(get_current_user)):
+    """
+    Runtime metrics for capacity planning (Master Admin only)
+
+    Returns:
+        Connection pool utilization and checkout wait times for the sync
+        (admin/auth) and async (public) engines, and each read replica;
+        queue depth of the password hashing pool; token and principal
+        cache hit counts; login attempts allowed and rejected by throttling;
+        email outbox backlog; dashboard stats cache hits
+    """
+    if not current_user["is_master_admin"]:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Accès réservé à l'administrateur principal"
+        )
+
+    return {
+        "database_pool": get_pool_stats(),
+        "async_database_pool": get_async_pool_stats(),
+        "replica_pools": get_replica_pool_stats(),
+        "password_hashing": get_hashing_stats(),
+        "auth_cache": get_auth_cache_stats(),
+        "login_throttle": get_throttle_stats(),
+        "email_outbox": get_outbox_stats(),
+        "dashboard_stats_cache": stats_cache.stats(),
+    }
+
+
 # ============ Password Change (All Admins) ============
 
 @router.put("/change-password")
@@ -822,19 +1486,19 @@ def change_password(
     db: Session = Depends(get_db)
 ):
     """Change own password (requires current password verification)"""
-    parish = db.query(Parish).filter(Parish.id == current_user["parish_id"]).first()
+    parish = queries.get_parish(db, current_user["parish_id"])
     if not parish:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Compte non trouvé"
         )
 
-    if not verify_password(password_data.current_password, parish.admin_password_hash):
+    if not check_password(password_data.current_password, parish.admin_password_hash):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Mot de passe actuel incorrect"
         )
 
-    parish.admin_password_hash = get_password_hash(password_data.new_password)
+    parish.admin_password_hash = hash_password(password_data.new_password)
     db.commit()
     return {"message": "Mot de passe modifié avec succès"}
@@ -3,7 +3,9 @@ Authentication Router
 Handles parish admin login and token generation
 """
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, status
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from pydantic import BaseModel, EmailStr
 from datetime import timedelta
@@ -13,9 +15,13 @@ import os
 # Add parent directory to path for imports
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from backend_api import get_db, Parish, RegistrationRequest, RegistrationResponse
-from auth import create_access_token, verify_password, verify_token, get_password_hash, ACCESS_TOKEN_EXPIRE_MINUTES
+from backend_api import get_db, get_async_db, Parish, RegistrationRequest, RegistrationResponse
+from auth import create_access_token, verify_token, password_needs_rehash, ACCESS_TOKEN_EXPIRE_MINUTES
+from password_hashing import hash_password_async, check_password_async
+from throttle import client_ip, login_ip_limiter, login_email_limiter
 from email_service import notify_new_registration, notify_password_reset, FRONTEND_URL
+from sync import record_change, ENTITY_PARISH
+import queries
 
 router = APIRouter()
 
@@ -50,15 +56,20 @@ class ResetPasswordRequest(BaseModel):
 
 # ============ Endpoints ============
 
+# login, register and reset-password are async: they await bcrypt in the
+# hashing pool (password_hashing.py) instead of holding a threadpool worker
+
 @router.post("/login", response_model=TokenResponse)
-def login(credentials: LoginRequest, db: Session = Depends(get_db)):
+async def login(credentials: LoginRequest, request: Request, db: AsyncSession = Depends(get_async_db)):
     """
     Parish admin login endpoint
 
-    Authenticates parish administrator and returns JWT token
+    Authenticates parish administrator and returns JWT token. Attempts are
+    throttled per client IP and per email before any password check.
 
     Args:
         credentials: Email and password
+        request: Incoming request (client IP for throttling)
         db: Database session
 
     Returns:
@@ -66,11 +77,24 @@ def login(credentials: LoginRequest, db: Session = Depends(get_db)):
 
     Raises:
         HTTPException 401: If credentials are invalid
+        HTTPException 429: If too many attempts were made from this IP or for this email
     """
+    for limiter, key in (
+        (login_ip_limiter, client_ip(request)),
+        (login_email_limiter, credentials.email.lower()),
+    ):
+        retry_after = limiter.hit(key)
+        if retry_after is not None:
+            raise HTTPException(
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                detail="Trop de tentatives de connexion. Veuillez réessayer plus tard.",
+                headers={"Retry-After": str(max(1, int(retry_after + 0.999)))},
+            )
+
     # Find parish by admin email
-    parish = db.query(Parish).filter(
-        Parish.admin_email == credentials.email
-    ).first()
+    parish = (await db.execute(
+        select(Parish).where(Parish.admin_email == credentials.email)
+    )).scalars().first()
 
     if not parish:
         raise HTTPException(
@@ -87,13 +111,18 @@ def login(credentials: LoginRequest, db: Session = Depends(get_db)):
             headers={"WWW-Authenticate": "Bearer"},
         )
 
-    if not verify_password(credentials.password, parish.admin_password_hash):
+    if not await check_password_async(credentials.password, parish.admin_password_hash):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Email ou mot de passe incorrect",
             headers={"WWW-Authenticate": "Bearer"},
         )
 
+    # Upgrade hashes made with an older work factor while we have the password
+    if password_needs_rehash(parish.admin_password_hash):
+        parish.admin_password_hash = await hash_password_async(credentials.password)
+        await db.commit()
+
     # Check if account is approved (master admin bypasses this)
     if not parish.is_master_admin and not parish.is_approved:
         raise HTTPException(
@@ -123,16 +152,16 @@ def login(credentials: LoginRequest, db: Session = Depends(get_db)):
 
 
 @router.post("/register", response_model=RegistrationResponse, status_code=201)
-def register(registration: RegistrationRequest, db: Session = Depends(get_db)):
+async def register(registration: RegistrationRequest, db: AsyncSession = Depends(get_async_db)):
     """
     Parish admin self-registration.
     Creates a parish in 'pending' (not approved) state.
     Master admin must approve before the account can log in.
     """
     # Check if admin email already exists
-    existing = db.query(Parish).filter(
-        Parish.admin_email == registration.admin_email
-    ).first()
+    existing = (await db.execute(
+        select(Parish.id).where(Parish.admin_email == registration.admin_email)
+    )).first()
     if existing:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -152,19 +181,26 @@ def register(registration: RegistrationRequest, db: Session = Depends(get_db)):
         email=registration.email,
         website=registration.website,
         admin_email=registration.admin_email,
-        admin_password_hash=get_password_hash(registration.admin_password),
+        admin_password_hash=await hash_password_async(registration.admin_password),
         is_master_admin=False,
         is_approved=False,
     )
-    db.add(new_parish)
-    db.commit()
-    db.refresh(new_parish)
 
-    notify_new_registration(
-        parish_name=new_parish.name,
-        parish_city=new_parish.city,
-        admin_email=new_parish.admin_email,
-    )
+    def save(session: Session):
+        session.add(new_parish)
+        session.flush()
+        record_change(session, ENTITY_PARISH, new_parish.id, new_parish.id)
+        notify_new_registration(
+            session,
+            parish_id=new_parish.id,
+            parish_name=new_parish.name,
+            parish_city=new_parish.city,
+            admin_email=new_parish.admin_email,
+            registered_at=new_parish.created_at,
+        )
+
+    await db.run_sync(save)
+    await db.commit()
 
     return RegistrationResponse(
         message="Inscription envoyée. En attente d'approbation par l'administrateur.",
@@ -190,13 +226,14 @@ def forgot_password(request: ForgotPasswordRequest, db: Session = Depends(get_db
             expires_delta=timedelta(hours=1),
         )
         reset_link = f"{FRONTEND_URL}/admin/reset-password?token={reset_token}"
-        notify_password_reset(parish.admin_email, reset_link)
+        notify_password_reset(db, parish.admin_email, reset_link)
+        db.commit()
 
     return {"message": "Si cet email existe, un lien de réinitialisation a été envoyé."}
 
 
 @router.post("/reset-password")
-def reset_password(request: ResetPasswordRequest, db: Session = Depends(get_db)):
+async def reset_password(request: ResetPasswordRequest, db: AsyncSession = Depends(get_async_db)):
     """
     Reset password using a valid reset token.
     """
@@ -215,14 +252,14 @@ def reset_password(request: ResetPasswordRequest, db: Session = Depends(get_db))
         )
 
     parish_id = payload.get("parish_id")
-    parish = db.query(Parish).filter(Parish.id == parish_id).first()
+    parish = await db.run_sync(queries.get_parish, parish_id)
     if not parish:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Compte non trouvé.",
         )
 
-    parish.admin_password_hash = get_password_hash(request.new_password)
-    db.commit()
+    parish.admin_password_hash = await hash_password_async(request.new_password)
+    await db.commit()
 
     return {"message": "Mot de passe réinitialisé avec succès. Vous pouvez maintenant vous connecter."}
@@ -1,10 +1,17 @@
 """
 Public Router
 Handles public endpoints for viewing parishes and mass times
+
+Endpoints are async and read through AsyncSession, so concurrency is not
+capped by the threadpool. Query code in queries.py / sync.py is shared with
+the sync path and runs via AsyncSession.run_sync. Sessions come from
+get_async_read_db, which spreads reads across DATABASE_REPLICA_URLS.
 """
 
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from sqlalchemy.ext.asyncio import AsyncSession
+from datetime import date, timedelta
+from math import radians, cos, sin, asin, sqrt
 from typing import List, Optional
 import unicodedata
 import sys
@@ -13,7 +20,14 @@ import os
 # Add parent directory to path for imports
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from backend_api import get_db, Parish, ParishResponse, ParochialNews, NewsResponse
+from backend_api import (
+    get_async_read_db, ParishResponse, ParishFullResponse, NewsResponse, NewsSummaryPage, ArchivedNewsResponse,
+    EventResponse, SyncResponse
+)
+from sync import build_sync, parish_version
+from events import event_index
+from responses import cached_response, negotiated_response, to_payload, MSGPACK_RESPONSES
+import queries
 
 router = APIRouter()
 
@@ -26,25 +40,38 @@ def _strip_accents(s: str) -> str:
     )
 
 
+def _distance_km(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    """Great-circle distance using the Haversine formula"""
+    lon1, lat1, lon2, lat2 = map(radians, [lon1, lat1, lon2, lat2])
+
+    dlon = lon2 - lon1
+    dlat = lat2 - lat1
+
+    a = sin(dlat/2)**2 + cos(lat1) * cos(lat2) * sin(dlon/2)**2
+    c = 2 * asin(sqrt(a))
+    return 6371 * c  # Earth's radius in kilometers
+
+
 # ============ Endpoints ============
 
-@router.get("/")
-def read_root():
+@router.get("/", responses=MSGPACK_RESPONSES)
+async def read_root(request: Request):
     """API root endpoint with basic information"""
-    return {
+    return negotiated_response(request, {
         "message": "Senegal Mass Times API",
         "version": "1.0.0",
         "docs": "/docs"
-    }
+    })
 
 
-@router.get("/parishes", response_model=List[ParishResponse])
-def get_parishes(
+@router.get("/parishes", response_model=List[ParishResponse], responses=MSGPACK_RESPONSES)
+async def get_parishes(
+    request: Request,
     city: Optional[str] = None,
     diocese_id: Optional[int] = None,
     skip: int = 0,
     limit: int = 100,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_read_db)
 ):
     """
     Get list of parishes with optional filtering
@@ -59,30 +86,25 @@ def get_parishes(
     Returns:
         List of parishes with their mass times
     """
-    query = db.query(Parish).filter(
-        Parish.is_approved == True,
-        Parish.is_master_admin == False,
-    )
+    def build(session):
+        parishes = queries.fetch_public_parishes(session, diocese_id, skip, limit)
 
-    if diocese_id:
-        query = query.filter(Parish.diocese_id == diocese_id)
+        if city:
+            # Accent-insensitive, case-insensitive search in both name and city
+            search_term = _strip_accents(city).lower()
+            parishes = [
+                p for p in parishes
+                if search_term in _strip_accents(p["name"]).lower()
+                or search_term in _strip_accents(p["city"]).lower()
+            ]
 
-    parishes = query.offset(skip).limit(limit).all()
+        return parishes
 
-    if city:
-        # Accent-insensitive, case-insensitive search in both name and city
-        search_term = _strip_accents(city).lower()
-        parishes = [
-            p for p in parishes
-            if search_term in _strip_accents(p.name).lower()
-            or search_term in _strip_accents(p.city).lower()
-        ]
+    return await cached_response(request, db, build)
 
-    return parishes
 
-
-@router.get("/parishes/{parish_id}", response_model=ParishResponse)
-def get_parish(parish_id: int, db: Session = Depends(get_db)):
+@router.get("/parishes/{parish_id}", response_model=ParishResponse, responses=MSGPACK_RESPONSES)
+async def get_parish(parish_id: int, request: Request, db: AsyncSession = Depends(get_async_read_db)):
     """
     Get detailed information for a single parish
 
@@ -96,24 +118,61 @@ def get_parish(parish_id: int, db: Session = Depends(get_db)):
     Raises:
         HTTPException 404: If parish not found
     """
-    parish = db.query(Parish).filter(
-        Parish.id == parish_id,
-        Parish.is_approved == True,
-        Parish.is_master_admin == False,
-    ).first()
+    def build(session):
+        parish = queries.fetch_public_parish(session, parish_id)
+
+        if not parish:
+            raise HTTPException(status_code=404, detail="Paroisse non trouvée")
+
+        return parish
 
-    if not parish:
-        raise HTTPException(status_code=404, detail="Paroisse non trouvée")
+    return await cached_response(request, db, build)
 
-    return parish
 
+@router.get("/parishes/{parish_id}/full", response_model=ParishFullResponse, responses=MSGPACK_RESPONSES)
+async def get_parish_full(
+    parish_id: int,
+    request: Request,
+    news_limit: int = Query(20, ge=0, le=100),
+    db: AsyncSession = Depends(get_async_read_db)
+):
+    """
+    Everything the parish page shows, in one response
+
+    Args:
+        parish_id: Parish ID
+        news_limit: Most recent active news items to include
+        db: Database session
+
+    Returns:
+        The parish, its schedule grouped by day (Sunday first, masses sorted
+        by time) and the summaries of its latest active news, with the
+        cursor of the rest. Built with three queries and cached until this
+        parish's next change.
+
+    Raises:
+        HTTPException 404: If parish not found
+    """
+    def build(session):
+        page = queries.fetch_parish_full(session, parish_id, news_limit)
 
-@router.get("/parishes/nearby/{latitude}/{longitude}", response_model=List[ParishResponse])
-def get_nearby_parishes(
+        if not page:
+            raise HTTPException(status_code=404, detail="Paroisse non trouvée")
+
+        return page
+
+    return await cached_response(
+        request, db, build, version_of=lambda session: parish_version(session, parish_id)
+    )
+
+
+@router.get("/parishes/nearby/{latitude}/{longitude}", response_model=List[ParishResponse], responses=MSGPACK_RESPONSES)
+async def get_nearby_parishes(
     latitude: float,
     longitude: float,
+    request: Request,
     radius_km: float = 10.0,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_read_db)
 ):
     """
     Find parishes near a geographic location using Haversine formula
@@ -130,53 +189,192 @@ def get_nearby_parishes(
     Note:
         Only returns parishes that have latitude/longitude coordinates
     """
-    from math import radians, cos, sin, asin, sqrt
+    def build(session):
+        # Get all approved parishes with coordinates
+        all_parishes = queries.fetch_located_parishes(session)
+
+        nearby = []
+
+        for parish in all_parishes:
+            km = _distance_km(latitude, longitude, parish["latitude"], parish["longitude"])
+
+            if km <= radius_km:
+                nearby.append(parish)
+
+        # Only the parishes in range need their schedules
+        return queries.attach_mass_times(session, nearby)
+
+    return await cached_response(request, db, build)
+
+
+@router.get("/parishes/{parish_id}/news", response_model=NewsSummaryPage, responses=MSGPACK_RESPONSES)
+async def get_parish_news(
+    parish_id: int,
+    request: Request,
+    limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = None,
+    db: AsyncSession = Depends(get_async_read_db)
+):
+    """
+    Get published news for a specific parish, one page at a time
+
+    Items carry a plain-text summary; fetch the full content with
+    GET /parishes/{parish_id}/news/{news_id}.
 
-    # Get all approved parishes with coordinates
-    all_parishes = db.query(Parish).filter(
-        Parish.latitude.isnot(None),
-        Parish.longitude.isnot(None),
-        Parish.is_approved == True,
-        Parish.is_master_admin == False,
-    ).all()
+    Args:
+        parish_id: Parish ID
+        limit: Page size
+        cursor: next_cursor of the previous page
+        db: Database session
+
+    Returns:
+        A page of published news summaries, newest first, and the next cursor
 
-    nearby = []
+    Raises:
+        HTTPException 400: If the cursor is invalid
+    """
+    def build(session):
+        try:
+            return queries.fetch_news_page(session, parish_id, limit, cursor)
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Curseur de pagination invalide")
+
+    return await cached_response(
+        request, db, build, version_of=lambda session: parish_version(session, parish_id)
+    )
 
-    for parish in all_parishes:
-        # Haversine formula to calculate distance
-        lon1, lat1, lon2, lat2 = map(
-            radians,
-            [longitude, latitude, parish.longitude, parish.latitude]
-        )
 
-        dlon = lon2 - lon1
-        dlat = lat2 - lat1
+@router.get("/parishes/{parish_id}/news/archive", response_model=List[ArchivedNewsResponse], responses=MSGPACK_RESPONSES)
+async def get_parish_news_archive(
+    parish_id: int,
+    request: Request,
+    skip: int = 0,
+    limit: int = 100,
+    db: AsyncSession = Depends(get_async_read_db)
+):
+    """
+    Get archived past news for a specific parish (withdrawn items stay hidden)
 
-        a = sin(dlat/2)**2 + cos(lat1) * cos(lat2) * sin(dlon/2)**2
-        c = 2 * asin(sqrt(a))
-        km = 6371 * c  # Earth's radius in kilometers
+    Args:
+        parish_id: Parish ID
+        skip: Number of records to skip (pagination)
+        limit: Maximum number of records to return
+        db: Database session
 
-        if km <= radius_km:
-            nearby.append(parish)
+    Returns:
+        List of archived news items, sorted by date (newest first)
+    """
+    def build(session):
+        return queries.fetch_archived_news(session, parish_id, skip, limit)
 
-    return nearby
+    return await cached_response(request, db, build)
 
 
-@router.get("/parishes/{parish_id}/news", response_model=List[NewsResponse])
-def get_parish_news(parish_id: int, db: Session = Depends(get_db)):
+@router.get("/parishes/{parish_id}/news/{news_id}", response_model=NewsResponse, responses=MSGPACK_RESPONSES)
+async def get_parish_news_item(
+    parish_id: int,
+    news_id: int,
+    request: Request,
+    db: AsyncSession = Depends(get_async_read_db)
+):
     """
-    Get published news for a specific parish
+    Get a published news item with its full content
 
     Args:
         parish_id: Parish ID
+        news_id: News ID
         db: Database session
 
     Returns:
-        List of published parish news items, sorted by date (newest first)
+        The news item
+
+    Raises:
+        HTTPException 404: If news not found
     """
-    news = db.query(ParochialNews).filter(
-        ParochialNews.parish_id == parish_id,
-        ParochialNews.is_active == True
-    ).order_by(ParochialNews.publish_date.desc()).all()
+    def build(session):
+        news = queries.fetch_news_item(session, parish_id, news_id)
+
+        if not news:
+            raise HTTPException(status_code=404, detail="Actualité non trouvée")
+
+        return news
+
+    return await cached_response(
+        request, db, build, version_of=lambda session: parish_version(session, parish_id)
+    )
 
-    return news
+
+@router.get("/events", response_model=List[EventResponse], responses=MSGPACK_RESPONSES)
+async def get_events(
+    request: Request,
+    from_date: Optional[date] = Query(None, alias="from"),
+    to_date: Optional[date] = Query(None, alias="to"),
+    near: Optional[str] = None,
+    radius_km: float = 10.0,
+    db: AsyncSession = Depends(get_async_read_db)
+):
+    """
+    Events of all approved parishes overlapping a date range
+
+    Args:
+        from_date: First day of the range, `from` in the query (default: today)
+        to_date: Last day of the range, `to` in the query (default: from + 6 days)
+        near: "latitude,longitude" to keep only parishes within radius_km
+        radius_km: Search radius in kilometers when near is given (default: 10km)
+        db: Database session
+
+    Returns:
+        Events (news with event dates) with their parish, ordered by start
+        date; with near, also the distance to each parish
+
+    Raises:
+        HTTPException 400: If the range or near is invalid
+    """
+    start = from_date or date.today()
+    end = to_date or start + timedelta(days=6)
+    if end < start:
+        raise HTTPException(status_code=400, detail="La date de fin doit être postérieure à la date de début")
+
+    origin = None
+    if near:
+        try:
+            latitude, longitude = (float(part) for part in near.split(","))
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Paramètre near invalide (attendu: latitude,longitude)")
+        origin = (latitude, longitude)
+
+    def build(session):
+        events = event_index.overlapping(session, start, end)
+        if origin is None:
+            return events
+
+        nearby = []
+        for event in events:
+            if event["latitude"] is None or event["longitude"] is None:
+                continue
+            km = _distance_km(origin[0], origin[1], event["latitude"], event["longitude"])
+            if km <= radius_km:
+                event["distance_km"] = round(km, 2)
+                nearby.append(event)
+        return nearby
+
+    return await cached_response(request, db, build)
+
+
+@router.get("/sync", response_model=SyncResponse, responses=MSGPACK_RESPONSES)
+async def sync_changes(request: Request, since: int = 0, db: AsyncSession = Depends(get_async_read_db)):
+    """
+    Incremental sync for offline-capable clients
+
+    Args:
+        since: Version returned by the client's previous sync (0 for a full snapshot)
+        db: Database session
+
+    Returns:
+        Parishes, mass times and news created or updated since `since`,
+        tombstones for anything deleted or unpublished, and the new version
+        to send on the next sync
+    """
+    return await cached_response(
+        request, db, lambda session: to_payload(SyncResponse, build_sync(session, since))
+    )
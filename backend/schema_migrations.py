@@ -0,0 +1,457 @@
+"""
+Versioned schema migrations
+
+Each migration runs in its own transaction together with the insert of its
+row in schema_version, so a failure leaves the database at the previous
+version. On SQLite this relies on the pysqlite transaction recipe (DDL is
+otherwise auto-committed by the driver); on Postgres DDL is transactional.
+
+The app does not migrate on startup: it only checks that the database is at
+LATEST_VERSION (see check_schema_version). Run pending migrations with:
+
+    python3 scripts/migrations/migrate.py
+
+To add a migration, append a Migration to MIGRATIONS with the next version
+number, with any new table defined in the Frozen Schema section (not taken
+from models.py). Never edit or reorder a migration that has shipped.
+tests/test_units.py checks that a fresh database migrated to the latest
+version matches the models.
+"""
+
+import time
+from datetime import datetime
+from typing import Callable, List, NamedTuple, Optional
+
+from sqlalchemy import (
+    Boolean, Column, Date, DateTime, Float, ForeignKey, Index, Integer, MetaData, String, Table, Time,
+    create_engine, event, inspect, select, text,
+)
+from sqlalchemy.engine import Connection
+from sqlalchemy.pool import NullPool
+
+from database import DATABASE_URL, IS_SQLITE, _apply_sqlite_pragmas, engine
+
+# Kept out of Base.metadata: owned by the runner, not by the models
+_metadata = MetaData()
+schema_version_table = Table(
+    "schema_version",
+    _metadata,
+    Column("version", Integer, primary_key=True),
+    Column("name", String, nullable=False),
+    Column("applied_at", DateTime, nullable=False),
+    Column("duration_ms", Float, nullable=False),
+)
+
+# Arbitrary application-wide key for the Postgres advisory lock below
+_MIGRATION_LOCK_KEY = 34034
+
+
+class Migration(NamedTuple):
+    version: int
+    name: str
+    apply: Callable[[Connection], None]
+
+
+# ============ Frozen Schema ============
+#
+# Migrations create tables from these definitions, never from the models,
+# so a migration does the same thing on every database however the models
+# evolve afterwards. Each table is frozen as of the migration that creates
+# it; anything added later is a later migration. Only DDL is kept here
+# (Python-side defaults live in the models).
+
+_frozen = MetaData()
+
+# 0001: the original schema, plus change_log (sync)
+_dioceses = Table(
+    "dioceses", _frozen,
+    Column("id", Integer, primary_key=True, index=True),
+    Column("name", String, unique=True, nullable=False),
+    Column("bishop", String),
+    Column("contact_email", String),
+    Column("contact_phone", String),
+)
+_parishes = Table(
+    "parishes", _frozen,
+    Column("id", Integer, primary_key=True, index=True),
+    Column("name", String, nullable=False),
+    Column("diocese_id", Integer, ForeignKey("dioceses.id")),
+    Column("city", String, nullable=False),
+    Column("region", String),
+    Column("address", String),
+    Column("latitude", Float),
+    Column("longitude", Float),
+    Column("phone", String),
+    Column("email", String),
+    Column("website", String),
+    Column("admin_email", String, unique=True),
+    Column("admin_password_hash", String),
+    Column("is_master_admin", Boolean),
+    Column("is_approved", Boolean),
+    Column("created_at", DateTime),
+    Column("updated_at", DateTime),
+)
+_mass_times = Table(
+    "mass_times", _frozen,
+    Column("id", Integer, primary_key=True, index=True),
+    Column("parish_id", Integer, ForeignKey("parishes.id")),
+    Column("day_of_week", String, nullable=False),
+    Column("time", Time, nullable=False),
+    Column("language", String),
+    Column("mass_type", String),
+    Column("is_active", Boolean),
+    Column("notes", String),
+)
+_parochial_news = Table(
+    "parochial_news", _frozen,
+    Column("id", Integer, primary_key=True, index=True),
+    Column("parish_id", Integer, ForeignKey("parishes.id")),
+    Column("title", String, nullable=False),
+    Column("content", String, nullable=False),
+    Column("category", String),
+    Column("is_active", Boolean),
+    Column("event_start_date", Date),
+    Column("event_end_date", Date),
+    Column("publish_date", DateTime),
+    Column("created_at", DateTime),
+    Column("updated_at", DateTime),
+)
+_change_log = Table(
+    "change_log", _frozen,
+    Column("id", Integer, primary_key=True, index=True),
+    Column("entity", String, nullable=False),
+    Column("entity_id", Integer, nullable=False),
+    Column("parish_id", Integer, index=True),
+    Column("changed_at", DateTime),
+)
+
+# 0003
+_backfill_checkpoints_table = Table(
+    "backfill_checkpoints", _frozen,
+    Column("name", String, primary_key=True),
+    Column("last_id", Integer, nullable=False),
+    Column("rows_updated", Integer, nullable=False),
+    Column("updated_at", DateTime),
+    Column("completed_at", DateTime),
+)
+
+# 0004
+_parochial_news_archive = Table(
+    "parochial_news_archive", _frozen,
+    Column("id", Integer, primary_key=True, autoincrement=False),
+    Column("parish_id", Integer, ForeignKey("parishes.id")),
+    Column("title", String, nullable=False),
+    Column("content", String, nullable=False),
+    Column("category", String),
+    Column("is_active", Boolean),
+    Column("event_start_date", Date),
+    Column("event_end_date", Date),
+    Column("publish_date", DateTime),
+    Column("created_at", DateTime),
+    Column("updated_at", DateTime),
+    Column("archived_at", DateTime),
+    Index("ix_parochial_news_archive_parish_publish", "parish_id", "publish_date"),
+)
+
+# 0006
+_throttle_buckets_table = Table(
+    "throttle_buckets", _frozen,
+    Column("key", String, primary_key=True),
+    Column("tokens", Float, nullable=False),
+    Column("updated_at", Float, nullable=False),
+    Column("allowed", Boolean, nullable=False),
+)
+
+# 0007
+_email_outbox_table = Table(
+    "email_outbox", _frozen,
+    Column("id", Integer, primary_key=True, index=True),
+    Column("idempotency_key", String, unique=True, nullable=False),
+    Column("to_address", String, nullable=False),
+    Column("subject", String, nullable=False),
+    Column("html", String, nullable=False),
+    Column("status", String, nullable=False),
+    Column("attempts", Integer, nullable=False),
+    Column("next_attempt_at", DateTime, nullable=False),
+    Column("last_error", String),
+    Column("provider_id", String),
+    Column("created_at", DateTime),
+    Column("sent_at", DateTime),
+    Index("ix_email_outbox_status_next_attempt", "status", "next_attempt_at"),
+)
+
+# 0008
+_email_broadcasts_table = Table(
+    "email_broadcasts", _frozen,
+    Column("id", Integer, primary_key=True, index=True),
+    Column("subject", String, nullable=False),
+    Column("html", String, nullable=False),
+    Column("recipient_count", Integer, nullable=False),
+    Column("created_at", DateTime),
+)
+
+
+# 0011: the archive rebuilt with its own key. A separate MetaData since the
+# table name is taken by 0004's definition; parishes is copied as FK target.
+_frozen_0011 = MetaData()
+_parishes.to_metadata(_frozen_0011)
+_parochial_news_archive_0011 = Table(
+    "parochial_news_archive", _frozen_0011,
+    Column("id", Integer, primary_key=True, index=True),
+    Column("original_id", Integer, nullable=False, index=True),
+    Column("parish_id", Integer, ForeignKey("parishes.id")),
+    Column("title", String, nullable=False),
+    Column("content", String, nullable=False),
+    Column("category", String),
+    Column("is_active", Boolean),
+    Column("event_start_date", Date),
+    Column("event_end_date", Date),
+    Column("publish_date", DateTime),
+    Column("created_at", DateTime),
+    Column("updated_at", DateTime),
+    Column("archived_at", DateTime),
+    Index("ix_parochial_news_archive_parish_publish", "parish_id", "publish_date"),
+)
+
+
+# ============ Migrations ============
+
+def _add_column_if_missing(conn: Connection, table: str, column: str, ddl: str) -> bool:
+    columns = {c["name"] for c in inspect(conn).get_columns(table)}
+    if column in columns:
+        return False
+    conn.execute(text(f"ALTER TABLE {table} ADD COLUMN {column} {ddl}"))
+    return True
+
+
+def _create_index(conn: Connection, name: str, table: str, *columns: str):
+    conn.execute(text(f"CREATE INDEX IF NOT EXISTS {name} ON {table} ({', '.join(columns)})"))
+
+
+def _baseline(conn: Connection):
+    """
+    The original tables, plus the columns the ad hoc scripts in
+    scripts/migrations/ used to add to databases created before them
+    """
+    for table in (_dioceses, _parishes, _mass_times, _parochial_news, _change_log):
+        table.create(conn, checkfirst=True)
+
+    _add_column_if_missing(conn, "parishes", "is_master_admin", "BOOLEAN DEFAULT FALSE")
+    if _add_column_if_missing(conn, "parishes", "is_approved", "BOOLEAN DEFAULT TRUE"):
+        # Parishes that existed before the approval workflow stay visible
+        conn.execute(text("UPDATE parishes SET is_approved = TRUE WHERE is_approved IS NULL"))
+    _add_column_if_missing(conn, "parochial_news", "event_start_date", "DATE")
+    _add_column_if_missing(conn, "parochial_news", "event_end_date", "DATE")
+
+
+def _filter_indexes(conn: Connection):
+    """Indexes for the foreign key and filter columns of the public queries"""
+    _create_index(conn, "ix_mass_times_parish_id", "mass_times", "parish_id")
+    _create_index(
+        conn, "ix_parochial_news_parish_active_publish", "parochial_news", "parish_id", "is_active", "publish_date"
+    )
+    _create_index(conn, "ix_parishes_approved_master", "parishes", "is_approved", "is_master_admin")
+
+
+def _backfill_checkpoints(conn: Connection):
+    """Progress table for backfill.py"""
+    _backfill_checkpoints_table.create(conn, checkfirst=True)
+
+
+def _news_archive(conn: Connection):
+    """Archive table for expired and inactive news (see news_archive.py)"""
+    _parochial_news_archive.create(conn, checkfirst=True)
+
+
+def _event_date_index(conn: Connection):
+    """Composite index on the event dates for the /api/events index load"""
+    _create_index(conn, "ix_parochial_news_event_dates", "parochial_news", "event_start_date", "event_end_date")
+
+
+def _throttle_buckets(conn: Connection):
+    """Token buckets for THROTTLE_BACKEND=database (see throttle.py)"""
+    _throttle_buckets_table.create(conn, checkfirst=True)
+
+
+def _email_outbox(conn: Connection):
+    """Outbox of emails sent by the background worker (see email_outbox.py)"""
+    _email_outbox_table.create(conn, checkfirst=True)
+
+
+def _email_broadcasts(conn: Connection):
+    """Master admin broadcasts, tracked per recipient in email_outbox"""
+    _email_broadcasts_table.create(conn, checkfirst=True)
+    _add_column_if_missing(
+        conn, "email_outbox", "broadcast_id", "INTEGER REFERENCES email_broadcasts(id)"
+    )
+    _create_index(conn, "ix_email_outbox_broadcast_id", "email_outbox", "broadcast_id")
+
+
+def _parish_list_indexes(conn: Connection):
+    """Sort and filter indexes for the paginated master admin parish list"""
+    _create_index(conn, "ix_parishes_name_id", "parishes", "name", "id")
+    _create_index(conn, "ix_parishes_created_id", "parishes", "created_at", "id")
+    _create_index(conn, "ix_parishes_city", "parishes", "city")
+    _create_index(conn, "ix_parishes_diocese", "parishes", "diocese_id")
+
+
+def _news_summaries(conn: Connection):
+    """Stored excerpts and a keyset index for the paginated news listings (see news_summary.py)"""
+    _add_column_if_missing(conn, "parochial_news", "summary", "VARCHAR")
+    _create_index(conn, "ix_parochial_news_parish_publish_id", "parochial_news", "parish_id", "publish_date", "id")
+
+
+def _archive_surrogate_key(conn: Connection):
+    """
+    Own primary key for parochial_news_archive; the live id moves to original_id
+
+    SQLite reuses the ids of deleted parochial_news rows, so the same id can
+    be archived twice. Neither database changes a primary key in place
+    portably, so the table is rebuilt.
+    """
+    conn.execute(text("DROP INDEX IF EXISTS ix_parochial_news_archive_parish_publish"))
+    conn.execute(text("ALTER TABLE parochial_news_archive RENAME TO parochial_news_archive_old"))
+    if conn.dialect.name == "postgresql":
+        # Index names are per schema on Postgres; free the primary key's
+        conn.execute(text("ALTER INDEX parochial_news_archive_pkey RENAME TO parochial_news_archive_old_pkey"))
+    _parochial_news_archive_0011.create(conn)
+
+    copied = (
+        "parish_id, title, content, category, is_active, event_start_date, event_end_date, "
+        "publish_date, created_at, updated_at, archived_at"
+    )
+    conn.execute(text(
+        f"INSERT INTO parochial_news_archive (original_id, {copied}) "
+        f"SELECT id, {copied} FROM parochial_news_archive_old ORDER BY id"
+    ))
+    conn.execute(text("DROP TABLE parochial_news_archive_old"))
+
+
+MIGRATIONS: List[Migration] = [
+    Migration(1, "baseline", _baseline),
+    Migration(2, "filter_indexes", _filter_indexes),
+    Migration(3, "backfill_checkpoints", _backfill_checkpoints),
+    Migration(4, "news_archive", _news_archive),
+    Migration(5, "event_date_index", _event_date_index),
+    Migration(6, "throttle_buckets", _throttle_buckets),
+    Migration(7, "email_outbox", _email_outbox),
+    Migration(8, "email_broadcasts", _email_broadcasts),
+    Migration(9, "parish_list_indexes", _parish_list_indexes),
+    Migration(10, "news_summaries", _news_summaries),
+    Migration(11, "archive_surrogate_key", _archive_surrogate_key),
+]
+
+LATEST_VERSION = MIGRATIONS[-1].version
+
+
+# ============ Runner ============
+
+def _migration_engine():
+    """
+    Engine dedicated to migrations
+
+    For SQLite, takes over transaction control from pysqlite so DDL is part
+    of the transaction, and starts with BEGIN IMMEDIATE so two runners
+    serialize instead of both applying the same migration.
+    """
+    if not IS_SQLITE:
+        return create_engine(DATABASE_URL, poolclass=NullPool)
+
+    migration_engine = create_engine(
+        DATABASE_URL, poolclass=NullPool, connect_args={"check_same_thread": False}
+    )
+
+    @event.listens_for(migration_engine, "connect")
+    def _connect(dbapi_connection, connection_record):
+        _apply_sqlite_pragmas(dbapi_connection, connection_record)
+        dbapi_connection.isolation_level = None
+
+    @event.listens_for(migration_engine, "begin")
+    def _begin(conn):
+        conn.exec_driver_sql("BEGIN IMMEDIATE")
+
+    return migration_engine
+
+
+def get_schema_version(conn: Connection) -> int:
+    """Return the applied schema version (0 for a database never migrated)"""
+    if not inspect(conn).has_table(schema_version_table.name):
+        return 0
+    versions = conn.execute(select(schema_version_table.c.version)).scalars().all()
+    return max(versions, default=0)
+
+
+def migrate(target: Optional[int] = None, log: Callable[[str], None] = print) -> List[dict]:
+    """
+    Apply pending migrations in order, each in its own transaction
+
+    Args:
+        target: Stop after this version (default: LATEST_VERSION)
+        log: Called with one line per applied migration
+
+    Returns:
+        List of {"version", "name", "duration_ms"} for the migrations applied
+    """
+    target = LATEST_VERSION if target is None else target
+    migration_engine = _migration_engine()
+    applied = []
+
+    try:
+        with migration_engine.begin() as conn:
+            _metadata.create_all(conn)
+
+        for migration in MIGRATIONS:
+            if migration.version > target:
+                break
+
+            with migration_engine.begin() as conn:
+                if conn.dialect.name == "postgresql":
+                    conn.execute(text("SELECT pg_advisory_xact_lock(:key)"), {"key": _MIGRATION_LOCK_KEY})
+                # Re-read under the lock: another runner may have applied it
+                if get_schema_version(conn) >= migration.version:
+                    continue
+
+                start = time.perf_counter()
+                migration.apply(conn)
+                duration_ms = round((time.perf_counter() - start) * 1000, 1)
+
+                conn.execute(schema_version_table.insert().values(
+                    version=migration.version,
+                    name=migration.name,
+                    applied_at=datetime.utcnow(),
+                    duration_ms=duration_ms,
+                ))
+
+            applied.append({"version": migration.version, "name": migration.name, "duration_ms": duration_ms})
+            log(f"✓ {migration.version:04d} {migration.name} ({duration_ms} ms)")
+    finally:
+        migration_engine.dispose()
+
+    return applied
+
+
+def check_schema_version(bind=engine) -> int:
+    """
+    Verify the database is fully migrated (called on app startup)
+
+    Returns:
+        The current schema version
+
+    Raises:
+        RuntimeError: If migrations are pending or the database is newer
+            than this code
+    """
+    with bind.connect() as conn:
+        version = get_schema_version(conn)
+
+    if version < LATEST_VERSION:
+        raise RuntimeError(
+            f"Schéma de base de données en version {version}, version {LATEST_VERSION} attendue. "
+            f"Lancez: python3 scripts/migrations/migrate.py"
+        )
+    if version > LATEST_VERSION:
+        raise RuntimeError(
+            f"Schéma de base de données en version {version}, plus récent que le code "
+            f"(version {LATEST_VERSION})"
+        )
+    return version
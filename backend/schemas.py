@@ -1,7 +1,7 @@
 """Pydantic schemas for request/response validation"""
 
-from pydantic import BaseModel, EmailStr
-from typing import List, Optional
+from pydantic import BaseModel, EmailStr, Field
+from typing import List, Literal, Optional
 from datetime import datetime, date, time
 from enum import Enum
 
@@ -65,6 +65,39 @@ class NewsResponse(BaseModel):
         from_attributes = True
 
 
+class NewsSummaryResponse(BaseModel):
+    """News item in a listing: a plain-text summary instead of the content"""
+    id: int
+    title: str
+    summary: str
+    category: str
+    is_active: bool
+    event_start_date: Optional[date] = None
+    event_end_date: Optional[date] = None
+    publish_date: datetime
+
+
+class NewsSummaryPage(BaseModel):
+    """One page of a parish's news, newest first"""
+    items: List[NewsSummaryResponse]
+    next_cursor: Optional[str] = None  # pass as ?cursor= for the next page; null on the last
+
+
+class ArchivedNewsResponse(NewsResponse):
+    """News item moved to the archive (see news_archive.py)"""
+    archived_at: datetime
+
+
+class EventResponse(NewsResponse):
+    """News item with event dates, with its parish (GET /api/events)"""
+    parish_id: int
+    parish_name: str
+    parish_city: str
+    latitude: Optional[float] = None
+    longitude: Optional[float] = None
+    distance_km: Optional[float] = None
+
+
 class ParishCreate(BaseModel):
     name: str
     diocese_id: int
@@ -80,7 +113,8 @@ class ParishCreate(BaseModel):
     admin_password: str
 
 
-class ParishResponse(BaseModel):
+class ParishInfo(BaseModel):
+    """Public parish fields, without the schedule"""
     id: int
     name: str
     diocese_id: int
@@ -92,11 +126,14 @@ class ParishResponse(BaseModel):
     phone: Optional[str]
     email: Optional[str]
     website: Optional[str]
-    mass_times: List[MassTimeResponse] = []
     class Config:
         from_attributes = True
 
 
+class ParishResponse(ParishInfo):
+    mass_times: List[MassTimeResponse] = []
+
+
 class ParishCreateRequest(BaseModel):
     """Schema for creating a new parish with admin credentials"""
     name: str
@@ -133,6 +170,13 @@ class ParishAdminResponse(BaseModel):
         from_attributes = True
 
 
+class ParishAdminPage(BaseModel):
+    """One page of the master admin parish list"""
+    items: List[ParishAdminResponse]
+    total: int  # parishes matching the filters, across all pages
+    next_cursor: Optional[str] = None  # pass as ?cursor= for the next page; null on the last
+
+
 class CredentialsUpdateRequest(BaseModel):
     """Schema for updating parish admin credentials"""
     admin_email: Optional[EmailStr] = None
@@ -177,7 +221,115 @@ class PendingParishResponse(BaseModel):
         from_attributes = True
 
 
+class BulkParishActionRequest(BaseModel):
+    """Approve, reject (pending only) or delete several parishes at once (Master Admin)"""
+    action: Literal["approve", "reject", "delete"]
+    ids: List[int] = Field(min_length=1, max_length=1000)
+
+
+class BulkParishResult(BaseModel):
+    id: int
+    status: str  # approved, rejected, deleted, skipped, not_found
+    detail: Optional[str] = None
+
+
+class BulkParishActionResponse(BaseModel):
+    action: str
+    applied: int
+    results: List[BulkParishResult]
+
+
 class PasswordChangeRequest(BaseModel):
     """Schema for changing own password"""
     current_password: str
     new_password: str
+
+
+class SyncParish(ParishInfo):
+    """Parish row in a sync delta (mass times and news are sent separately)"""
+
+
+class SyncMassTime(MassTimeResponse):
+    """Mass time row in a sync delta"""
+    parish_id: int
+
+
+class SyncNews(NewsResponse):
+    """News row in a sync delta"""
+    parish_id: int
+
+
+class SyncDeleted(BaseModel):
+    """Tombstones: ids the client must drop from its local copy"""
+    parishes: List[int] = []
+    mass_times: List[int] = []
+    news: List[int] = []
+
+
+class SyncResponse(BaseModel):
+    """Incremental sync payload for offline-capable clients"""
+    version: int
+    full: bool
+    parishes: List[SyncParish] = []
+    mass_times: List[SyncMassTime] = []
+    news: List[SyncNews] = []
+    deleted: SyncDeleted = SyncDeleted()
+
+
+class ScheduleEntry(MassTimeCreate):
+    """Mass time in a full schedule; id refers to an existing row, omit it to add one"""
+    id: Optional[int] = None
+
+
+class ScheduleReplaceRequest(BaseModel):
+    """The complete weekly schedule of a parish, replacing the current one"""
+    mass_times: List[ScheduleEntry]
+    base_version: Optional[int] = None  # reject if the schedule changed since this version
+
+
+class ScheduleResponse(BaseModel):
+    version: int
+    mass_times: List[MassTimeResponse]
+
+
+class BroadcastRequest(BaseModel):
+    """Announcement to every approved parish admin (plain text, blank lines between paragraphs)"""
+    subject: str
+    message: str
+
+
+class BroadcastResponse(BaseModel):
+    id: int
+    subject: str
+    recipient_count: int
+    pending: int
+    sent: int
+    failed: int
+    created_at: datetime
+
+
+class BroadcastRecipient(BaseModel):
+    to_address: str
+    status: str  # pending, sent, failed
+    attempts: int
+    last_error: Optional[str] = None
+    sent_at: Optional[datetime] = None
+    class Config:
+        from_attributes = True
+
+
+class BroadcastDetailResponse(BroadcastResponse):
+    recipients: List[BroadcastRecipient]
+
+
+class ScheduleDay(BaseModel):
+    day_of_week: str
+    masses: List[MassTimeResponse]  # sorted by time
+
+
+class ParishFullResponse(BaseModel):
+    """Parish page in one response: details, schedule by day (Sunday first), active news summaries"""
+    parish: ParishInfo
+    schedule: List[ScheduleDay]
+    news: List[NewsSummaryResponse]
+    news_next_cursor: Optional[str] = None
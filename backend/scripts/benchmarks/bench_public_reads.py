@@ -0,0 +1,132 @@
+"""
+Benchmark: ORM + pydantic read path vs. Core fast read path (queries.py)
+
+Seeds a throwaway SQLite database with N approved parishes (7 mass times
+each) and times building the GET /api/parishes body both ways:
+
+  orm   - db.query(Parish) with lazy-loaded mass_times, validated through
+          List[ParishResponse] and encoded the way FastAPI's response_model does
+  fast  - queries.fetch_public_parishes() + orjson
+
+Usage (from backend/):
+    python3 scripts/benchmarks/bench_public_reads.py [--sizes 1000 10000] [--repeat 5]
+"""
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time as timer
+from datetime import time
+from typing import List
+
+_tmpdir = tempfile.mkdtemp()
+os.environ["DATABASE_URL"] = f"sqlite:///{_tmpdir}/bench.db"
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from pydantic import TypeAdapter
+from sqlalchemy import delete, insert
+
+from database import engine, Base, SessionLocal
+from models import Diocese, Parish, MassTime
+from schemas import ParishResponse
+import queries
+from responses import dump_json
+
+DAYS = ["Sunday", "Sunday", "Sunday", "Monday", "Wednesday", "Friday", "Saturday"]
+
+
+def seed(n: int):
+    with engine.begin() as conn:
+        conn.execute(delete(MassTime))
+        conn.execute(delete(Parish))
+        conn.execute(delete(Diocese))
+        conn.execute(insert(Diocese), [{"id": 1, "name": "Archidiocese de Dakar"}])
+        conn.execute(insert(Parish), [{
+            "id": i,
+            "name": f"Paroisse Saint-Joseph {i}",
+            "diocese_id": 1,
+            "city": "Dakar",
+            "region": "Médina",
+            "address": f"Rue {i}, Médina",
+            "latitude": 14.69 + i / 100000,
+            "longitude": -17.44 - i / 100000,
+            "phone": "+221 33 821 45 67",
+            "email": f"paroisse{i}@dakar.sn",
+            "admin_email": f"admin{i}@dakar.sn",
+            "admin_password_hash": "$2b$12$" + "x" * 53,
+            "is_master_admin": False,
+            "is_approved": True,
+        } for i in range(1, n + 1)])
+        conn.execute(insert(MassTime), [{
+            "parish_id": i,
+            "day_of_week": day,
+            "time": time(7 + j * 2, 30 if j % 2 else 0),
+            "language": "Wolof" if j == 2 else "French",
+            "mass_type": "Messe dominicale" if day == "Sunday" else "Messe en semaine",
+            "is_active": True,
+        } for i in range(1, n + 1) for j, day in enumerate(DAYS)])
+
+
+_adapter = TypeAdapter(List[ParishResponse])
+
+
+def orm_path(n: int) -> bytes:
+    db = SessionLocal()
+    try:
+        parishes = db.query(Parish).filter(
+            Parish.is_approved == True,
+            Parish.is_master_admin == False,
+        ).offset(0).limit(n).all()
+        content = _adapter.dump_python(
+            _adapter.validate_python(parishes, from_attributes=True), mode="json"
+        )
+        return json.dumps(content, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    finally:
+        db.close()
+
+
+def fast_path(n: int) -> bytes:
+    db = SessionLocal()
+    try:
+        return dump_json(queries.fetch_public_parishes(db, None, 0, n))
+    finally:
+        db.close()
+
+
+def best_of(fn, n: int, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = timer.perf_counter()
+        fn(n)
+        best = min(best, timer.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    Base.metadata.create_all(bind=engine)
+
+    print(f"{'parishes':>10} {'orm (ms)':>10} {'fast (ms)':>10} {'speedup':>8} {'body (KB)':>10}")
+    for n in args.sizes:
+        seed(n)
+        orm_body, fast_body = orm_path(n), fast_path(n)
+        if orm_body != fast_body:
+            print(f"❌ Bodies differ at {n} parishes")
+            return 1
+
+        orm_s = best_of(orm_path, n, args.repeat)
+        fast_s = best_of(fast_path, n, args.repeat)
+        print(f"{n:>10} {orm_s * 1000:>10.1f} {fast_s * 1000:>10.1f} {orm_s / fast_s:>7.1f}x {len(fast_body) / 1024:>10.0f}")
+
+    print("✓ Bodies are byte-identical")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
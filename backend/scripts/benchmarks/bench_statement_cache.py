@@ -0,0 +1,120 @@
+"""
+Benchmark: per-call statement construction vs. cached statements (queries.py)
+
+Times the hot lookups against a tiny in-memory SQLite database, so the
+numbers are dominated by Python overhead (statement construction, cache
+key generation, compilation cache lookup) rather than by the database:
+
+  rebuilt - the statement is built inside the call, as the code did before
+  cached  - the module-level statement from queries.py, only binding values
+
+Usage (from backend/):
+    python3 scripts/benchmarks/bench_statement_cache.py [--calls 20000]
+"""
+
+import argparse
+import os
+import sys
+import time as timer
+from datetime import time
+
+os.environ["DATABASE_URL"] = "sqlite:///:memory:"
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from sqlalchemy import func, insert, select
+
+from database import engine, Base, SessionLocal
+from models import ChangeLog, Diocese, Parish, MassTime, ParochialNews
+import queries
+
+
+def seed():
+    Base.metadata.create_all(bind=engine)
+    with engine.begin() as conn:
+        conn.execute(insert(Diocese), [{"id": 1, "name": "Archidiocese de Dakar"}])
+        conn.execute(insert(Parish), [{
+            "id": i, "name": f"Paroisse {i}", "diocese_id": 1, "city": "Dakar",
+            "admin_email": f"admin{i}@dakar.sn", "is_master_admin": False, "is_approved": True,
+        } for i in range(1, 11)])
+        conn.execute(insert(MassTime), [{
+            "parish_id": i, "day_of_week": "Sunday", "time": time(9), "language": "French",
+        } for i in range(1, 11)])
+        conn.execute(insert(ChangeLog), [{"entity": "parish", "entity_id": i} for i in range(1, 11)])
+
+
+# ============ Previous implementations ============
+
+def version_rebuilt(db, _parish_id):
+    return db.query(func.max(ChangeLog.id)).scalar() or 0
+
+
+def parish_rebuilt(db, parish_id):
+    stmt = queries.public_parishes_select().where(Parish.id == parish_id)
+    rows = [dict(zip(queries.PARISH_KEYS, row)) for row in db.execute(stmt)]
+    stmt = select(MassTime.parish_id, *queries.MASS_TIME_COLUMNS).where(
+        MassTime.parish_id.in_([parish_id])
+    ).order_by(MassTime.id)
+    mass_times = [dict(zip(queries.MASS_TIME_KEYS, row[1:])) for row in db.execute(stmt)]
+    rows[0]["mass_times"] = mass_times
+    return rows[0]
+
+
+def news_rebuilt(db, parish_id):
+    stmt = select(*queries.NEWS_COLUMNS).where(
+        ParochialNews.parish_id == parish_id,
+        ParochialNews.is_active == True,
+    ).order_by(ParochialNews.publish_date.desc())
+    return [dict(zip(queries.NEWS_KEYS, row)) for row in db.execute(stmt)]
+
+
+def admin_lookup_rebuilt(db, parish_id):
+    return db.query(Parish).filter(Parish.id == parish_id).first()
+
+
+# ============ Cached ============
+
+def version_cached(db, _parish_id):
+    return db.execute(queries.CURRENT_VERSION).scalar() or 0
+
+
+CASES = [
+    ("current_version", version_rebuilt, version_cached),
+    ("public parish", parish_rebuilt, queries.fetch_public_parish),
+    ("public news", news_rebuilt, queries.fetch_public_news),
+    ("admin parish lookup", admin_lookup_rebuilt, queries.get_parish),
+]
+
+
+def bench(fn, db, calls: int) -> float:
+    """Microseconds per call"""
+    start = timer.perf_counter()
+    for i in range(calls):
+        fn(db, i % 10 + 1)
+        # Keep the ORM identity map from turning lookups into dict hits
+        db.expunge_all()
+    return (timer.perf_counter() - start) / calls * 1_000_000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--calls", type=int, default=20000)
+    args = parser.parse_args()
+
+    seed()
+    db = SessionLocal()
+    try:
+        print(f"{'query':<22} {'rebuilt (µs)':>13} {'cached (µs)':>12} {'saved':>8}")
+        for name, rebuilt, cached in CASES:
+            # Warm up the compiled cache for both
+            bench(rebuilt, db, 200)
+            bench(cached, db, 200)
+            before = bench(rebuilt, db, args.calls)
+            after = bench(cached, db, args.calls)
+            print(f"{name:<22} {before:>13.1f} {after:>12.1f} {(before - after) / before:>7.0%}")
+    finally:
+        db.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
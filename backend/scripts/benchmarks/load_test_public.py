@@ -0,0 +1,157 @@
+"""
+Load test: sync (threadpool) vs. async (AsyncSession) public read path
+
+Serves GET /parishes/{id} two ways from the same throwaway SQLite database,
+with the public response cache disabled so every request hits the database:
+
+  sync   - a `def` endpoint on the blocking SessionLocal (the previous design),
+           which Starlette runs in its threadpool
+  async  - the real `async def` endpoint from routers/public.py on AsyncSession
+
+Each configuration is driven in-process through httpx's ASGI transport with
+a fixed number of concurrent clients, for several threadpool sizes.
+
+SQLite answers in microseconds, which hides what async is for. --latency-ms
+adds a sleep to every statement inside the thread that executes it (the
+threadpool thread for sync, aiosqlite's connection thread for async), to
+emulate the round trip to a managed Postgres on another host.
+
+The connection pool is sized to the number of clients (CONCURRENCY). With a
+smaller pool the sync path can deadlock: threads block on pool checkout while
+the requests holding connections wait for a free thread to close their session.
+
+Usage (from backend/):
+    python3 scripts/benchmarks/load_test_public.py [--requests 2000] [--threads 2 8 40] [--latency-ms 0 10]
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import sys
+import tempfile
+import time as timer
+
+CONCURRENCY = 64
+
+_tmpdir = tempfile.mkdtemp()
+os.environ["DATABASE_URL"] = f"sqlite:///{_tmpdir}/load.db"
+os.environ["PUBLIC_CACHE_TTL_SECONDS"] = "0"
+os.environ["DB_POOL_SIZE"] = str(CONCURRENCY)
+os.environ["DB_MAX_OVERFLOW"] = "0"
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
+
+import anyio.to_thread
+import httpx
+from fastapi import Depends, FastAPI, HTTPException
+from sqlalchemy import event, insert
+from sqlalchemy.orm import Session
+
+from database import engine, async_engine, Base, get_db
+from models import Diocese, Parish, MassTime
+from responses import dump_json
+from sync import current_version
+import backend_api  # noqa: F401  (registers routers; must precede routers import)
+from routers import public
+import queries
+from datetime import time
+
+PARISHES = 500
+
+# Seconds slept per statement, see --latency-ms
+_latency = 0.0
+
+
+def _add_latency(dbapi_connection, connection_record):
+    # aiosqlite wraps the sqlite3 connection; the callback runs in the executing thread
+    driver = getattr(dbapi_connection, "driver_connection", dbapi_connection)
+    raw = getattr(driver, "_conn", driver)
+    raw.set_trace_callback(lambda statement: _latency and timer.sleep(_latency))
+
+
+event.listen(engine, "connect", _add_latency)
+event.listen(async_engine.sync_engine, "connect", _add_latency)
+
+
+def seed():
+    Base.metadata.create_all(bind=engine)
+    with engine.begin() as conn:
+        conn.execute(insert(Diocese), [{"id": 1, "name": "Archidiocese de Dakar"}])
+        conn.execute(insert(Parish), [{
+            "id": i, "name": f"Paroisse {i}", "diocese_id": 1, "city": "Dakar",
+            "admin_email": f"admin{i}@dakar.sn", "is_master_admin": False, "is_approved": True,
+        } for i in range(1, PARISHES + 1)])
+        conn.execute(insert(MassTime), [{
+            "parish_id": i, "day_of_week": day, "time": time(8 + j), "language": "French",
+        } for i in range(1, PARISHES + 1) for j, day in enumerate(["Sunday", "Saturday", "Wednesday"])])
+
+
+def sync_app() -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/api/parishes/{parish_id}")
+    def get_parish(parish_id: int, db: Session = Depends(get_db)):
+        # Same queries as the async endpoint: cache version, parish, mass times
+        current_version(db)
+        parish = queries.fetch_public_parish(db, parish_id)
+        if not parish:
+            raise HTTPException(status_code=404)
+        return dump_json(parish)
+
+    return app
+
+
+def async_app() -> FastAPI:
+    app = FastAPI()
+    app.include_router(public.router, prefix="/api")
+    return app
+
+
+async def run(app: FastAPI, threads: int, total: int, concurrency: int) -> float:
+    anyio.to_thread.current_default_thread_limiter().total_tokens = threads
+    transport = httpx.ASGITransport(app=app)
+    remaining = iter(range(total))
+
+    # identity: measure the database path, not brotli on every cache miss
+    headers = {"Accept-Encoding": "identity"}
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", headers=headers) as client:
+        async def worker():
+            for _ in remaining:
+                response = await client.get(f"/api/parishes/{random.randint(1, PARISHES)}")
+                assert response.status_code == 200, response.status_code
+
+        start = timer.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        return total / (timer.perf_counter() - start)
+
+
+async def main_async(args):
+    apps = {"sync": sync_app(), "async": async_app()}
+    # Warm up pools and caches
+    for app in apps.values():
+        await run(app, 40, 100, 8)
+
+    global _latency
+    print(f"{'latency':>8} {'threads':>8} {'sync (req/s)':>13} {'async (req/s)':>14} {'ratio':>7}")
+    for latency_ms in args.latency_ms:
+        _latency = latency_ms / 1000
+        for threads in args.threads:
+            sync_rps = await run(apps["sync"], threads, args.requests, CONCURRENCY)
+            async_rps = await run(apps["async"], threads, args.requests, CONCURRENCY)
+            print(f"{latency_ms:>6}ms {threads:>8} {sync_rps:>13.0f} {async_rps:>14.0f} {async_rps / sync_rps:>6.2f}x")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--threads", type=int, nargs="+", default=[2, 8, 40])
+    parser.add_argument("--latency-ms", type=float, nargs="+", default=[0, 10])
+    args = parser.parse_args()
+
+    seed()
+    asyncio.run(main_async(args))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,16 +1,29 @@
 """
 Migration script to add is_approved column to parishes table.
 Sets all existing parishes to approved.
+
+The update runs as a resumable backfill in small batches (see backfill.py)
+so it never holds the write lock on parishes for long.
+
+Usage (from backend/):
+    python3 scripts/migrations/add_is_approved.py [--batch-size 500] [--pause 0.05] [--restart]
 """
 
+import argparse
 import sys, os
 sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
 
 from sqlalchemy import text
-from backend_api import engine, SessionLocal
+from backend_api import engine, Parish
+from backfill import run_backfill
+from sync import ENTITY_PARISH
+
 
+def approve(row: tuple) -> dict:
+    return {"is_approved": True}
 
-def add_is_approved():
+
+def add_is_approved(batch_size: int, pause: float, restart: bool):
     # Add column
     try:
         with engine.begin() as conn:
@@ -26,16 +39,28 @@ def add_is_approved():
             raise
 
     # Set all existing parishes to approved
-    db = SessionLocal()
-    try:
-        db.execute(text("UPDATE parishes SET is_approved = 1 WHERE is_approved IS NULL"))
-        db.commit()
-        print("All existing parishes set to approved")
-    finally:
-        db.close()
+    run_backfill(
+        "add_is_approved",
+        Parish,
+        ("is_approved",),
+        approve,
+        where=Parish.is_approved.is_(None),
+        batch_size=batch_size,
+        pause=pause,
+        entity=ENTITY_PARISH,
+        restart=restart,
+        pending_only=True,
+    )
+    print("All existing parishes set to approved")
 
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Add is_approved to parishes")
+    parser.add_argument("--batch-size", type=int, default=500)
+    parser.add_argument("--pause", type=float, default=0.05, help="Seconds to sleep between batches")
+    parser.add_argument("--restart", action="store_true", help="Ignore the checkpoint of a previous run")
+    args = parser.parse_args()
+
     print("Adding is_approved column to parishes...")
-    add_is_approved()
+    add_is_approved(args.batch_size, args.pause, args.restart)
     print("Done!")
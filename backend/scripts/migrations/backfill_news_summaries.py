@@ -0,0 +1,57 @@
+"""
+Backfill parochial_news.summary for news written before the column existed.
+Run after migrate.py (migration 0010 adds the column).
+
+Until a row is backfilled, listings show a prefix of its content instead
+(see news_summary.py). The update runs as a resumable backfill in small
+batches (see backfill.py); a row edited meanwhile is skipped, its summary
+having been written by the edit. Running it again fills in rows that still
+have no summary.
+
+Usage (from backend/):
+    python3 scripts/migrations/backfill_news_summaries.py [--batch-size 1000] [--pause 0.05] [--restart]
+"""
+
+import argparse
+import sys, os
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from backend_api import ParochialNews
+from backfill import run_backfill
+from news_summary import summarize
+
+
+def add_summary(row: tuple) -> dict:
+    content, summary = row
+    return {"summary": summarize(content)}
+
+
+def backfill_news_summaries(batch_size: int, workers: int, pause: float, restart: bool):
+    # Summaries aren't part of the sync payload, so no change_log entries;
+    # cached listings pick them up on the parish's next change
+    stats = run_backfill(
+        "backfill_news_summaries",
+        ParochialNews,
+        ("content", "summary"),
+        add_summary,
+        where=ParochialNews.summary.is_(None),
+        batch_size=batch_size,
+        workers=workers,
+        pause=pause,
+        restart=restart,
+        pending_only=True,
+    )
+    print(f"{stats.updated} news summaries written")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Backfill parochial_news.summary")
+    parser.add_argument("--batch-size", type=int, default=500)
+    parser.add_argument("--workers", type=int, default=1, help="Processes computing summaries")
+    parser.add_argument("--pause", type=float, default=0.05, help="Seconds to sleep between batches")
+    parser.add_argument("--restart", action="store_true", help="Ignore the checkpoint of a previous run")
+    args = parser.parse_args()
+
+    print("Backfilling news summaries...")
+    backfill_news_summaries(args.batch_size, args.workers, args.pause, args.restart)
+    print("Done!")
@@ -0,0 +1,47 @@
+"""
+Schema Migration Runner
+Applies pending versioned migrations from schema_migrations.py
+
+Usage (from backend/):
+    python3 scripts/migrations/migrate.py              # migrate to latest
+    python3 scripts/migrations/migrate.py --status     # show current version
+    python3 scripts/migrations/migrate.py --target 1   # stop at a version
+"""
+
+import argparse
+import time
+import sys, os
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from database import engine
+from schema_migrations import MIGRATIONS, LATEST_VERSION, get_schema_version, migrate
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Apply pending schema migrations")
+    parser.add_argument("--status", action="store_true", help="Show the schema version and exit")
+    parser.add_argument("--target", type=int, help="Migrate up to this version only")
+    args = parser.parse_args()
+
+    with engine.connect() as conn:
+        version = get_schema_version(conn)
+
+    if args.status:
+        print(f"Schema version: {version} (latest: {LATEST_VERSION})")
+        for migration in MIGRATIONS:
+            mark = "✓" if migration.version <= version else " "
+            print(f"  [{mark}] {migration.version:04d} {migration.name}")
+        return 0
+
+    print(f"Schema version {version}, migrating to {args.target or LATEST_VERSION}...")
+    start = time.perf_counter()
+    applied = migrate(target=args.target)
+    if not applied:
+        print("✓ Already up to date")
+    else:
+        print(f"✓ Applied {len(applied)} migration(s) in {(time.perf_counter() - start) * 1000:.1f} ms")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
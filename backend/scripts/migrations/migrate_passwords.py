@@ -1,56 +1,80 @@
 """
 Password Migration Script
 Migrates parish passwords from SHA256 to bcrypt hashing
+
+Runs as a resumable backfill (see backfill.py): batches are committed as
+they go and an interrupted run picks up where it stopped. Accounts that
+already have a bcrypt hash are left alone unless --all is given. Running it
+again after it completed migrates the accounts still on SHA256; a completed
+--all run does nothing more unless --restart is given.
+
+Usage (from backend/):
+    python3 scripts/migrations/migrate_passwords.py [--workers 4] [--pause 0.1] [--all] [--restart]
 """
 
-import sys, os
+import argparse
+import os
+import sys
+from functools import partial
+
 sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
 
-from backend_api import SessionLocal, Parish
-from auth import get_password_hash
+from sqlalchemy import or_
 
-def migrate_passwords():
-    """
-    Migrate all parish passwords from SHA256 to bcrypt.
-    Uses the known default password 'password123' for all parishes.
-    """
-    db = SessionLocal()
+from backend_api import Parish
+from auth import get_password_hash
+from backfill import run_backfill
 
-    try:
-        # Get all parishes
-        parishes = db.query(Parish).all()
+# Default password for all test parishes
+DEFAULT_PASSWORD = "password123"
 
-        print(f"Found {len(parishes)} parishes to migrate...")
 
-        # Default password for all test parishes
-        default_password = "password123"
+def reset_password(password: str, row: tuple) -> dict:
+    # Fresh bcrypt hash for each parish (bcrypt includes a salt, so each hash is unique)
+    return {"admin_password_hash": get_password_hash(password)}
 
-        updated_count = 0
 
-        for parish in parishes:
-            if parish.admin_email:
-                # Generate fresh bcrypt hash for each parish
-                # (bcrypt includes a salt, so each hash is unique)
-                parish.admin_password_hash = get_password_hash(default_password)
-                updated_count += 1
-                print(f"✅ Updated: {parish.name} ({parish.admin_email})")
+def migrate_passwords(workers: int, batch_size: int, pause: float, reset_all: bool, restart: bool):
+    """
+    Migrate parish passwords from SHA256 to bcrypt.
+    Uses the known default password 'password123' for the migrated parishes.
+    """
+    where = Parish.admin_email.isnot(None)
+    if not reset_all:
+        where = where & or_(
+            Parish.admin_password_hash.is_(None),
+            ~Parish.admin_password_hash.startswith("$2"),
+        )
 
-        db.commit()
+    stats = run_backfill(
+        "migrate_passwords_all" if reset_all else "migrate_passwords",
+        Parish,
+        ("admin_password_hash",),
+        partial(reset_password, DEFAULT_PASSWORD),
+        where=where,
+        batch_size=batch_size,
+        workers=workers,
+        pause=pause,
+        restart=restart,
+        pending_only=not reset_all,
+    )
 
-        print(f"\n🎉 Migration complete! Updated {updated_count} parishes.")
-        print(f"All parishes now use bcrypt password hashing.")
-        print(f"Default password for all parishes: {default_password}")
+    print(f"\n🎉 Migration complete! Updated {stats.updated} parishes.")
+    print(f"Default password for migrated parishes: {DEFAULT_PASSWORD}")
 
-    except Exception as e:
-        print(f"❌ Error during migration: {e}")
-        db.rollback()
-    finally:
-        db.close()
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Migrate parish passwords from SHA256 to bcrypt")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="Hashing processes")
+    parser.add_argument("--batch-size", type=int, default=100)
+    parser.add_argument("--pause", type=float, default=0.0, help="Seconds to sleep between batches")
+    parser.add_argument("--all", action="store_true", help="Also reset accounts already on bcrypt")
+    parser.add_argument("--restart", action="store_true", help="Ignore the checkpoint of a previous run")
+    args = parser.parse_args()
+
     print("=" * 60)
     print("Parish Password Migration Script")
     print("Migrating from SHA256 to bcrypt...")
     print("=" * 60)
     print()
-    migrate_passwords()
+    migrate_passwords(args.workers, args.batch_size, args.pause, args.all, args.restart)
@@ -1,7 +1,12 @@
-import requests
-import json
+"""
+Seed: real Catholic parishes in Dakar with their mass times
+Writes directly to the database through the bulk importer (importer.py)
+"""
 
-API_URL = "http://localhost:8000"
+import sys, os
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from importer import run_import
 
 # Real Catholic parishes in Dakar, Senegal
 dakar_parishes = [
@@ -319,73 +324,21 @@ dakar_parishes = [
 
 def add_parishes():
     print(f"🚀 Adding {len(dakar_parishes)} parishes from Dakar...\n")
-    
-    success_count = 0
-    failed_count = 0
-    
-    for parish_data in dakar_parishes:
-        # Extract mass times
-        mass_times = parish_data.pop("mass_times", [])
-        admin_email = parish_data["admin_email"]
-        admin_password = parish_data["admin_password"]
-        
-        # Create parish
-        try:
-            response = requests.post(f"{API_URL}/parishes", json=parish_data)
-            
-            if response.status_code == 201:
-                parish = response.json()
-                parish_id = parish["id"]
-                print(f"✅ Created: {parish['name']}")
-                print(f"   📍 Location: {parish['region']}, {parish['city']}")
-                print(f"   🆔 ID: {parish_id}")
-                
-                # Add mass times
-                mass_success = 0
-                for mass_time in mass_times:
-                    mass_response = requests.post(
-                        f"{API_URL}/parishes/{parish_id}/mass-times",
-                        json=mass_time,
-                        auth=(admin_email, admin_password)
-                    )
-                    if mass_response.status_code == 200:
-                        mass_success += 1
-                
-                print(f"   🕐 Added {mass_success}/{len(mass_times)} mass times")
-                print()
-                success_count += 1
-            else:
-                print(f"❌ Failed: {parish_data['name']}")
-                print(f"   Error: {response.text}")
-                print()
-                failed_count += 1
-        except Exception as e:
-            print(f"❌ Error creating {parish_data['name']}: {str(e)}")
-            print()
-            failed_count += 1
-    
+
+    stats = run_import(enumerate(dakar_parishes, 1))
+
     print("=" * 60)
-    print(f"✅ Successfully added: {success_count} parishes")
-    if failed_count > 0:
-        print(f"❌ Failed: {failed_count} parishes")
+    print(f"✅ Successfully added: {stats.parishes} parishes ({stats.mass_times} mass times)")
+    if stats.errors:
+        print(f"❌ Failed: {len(stats.errors)} parishes")
+        for line, email, message in stats.errors:
+            print(f"   {dakar_parishes[line - 1]['name']}: {message}")
     print("=" * 60)
 
+
 if __name__ == "__main__":
     print("\n" + "=" * 60)
     print("  DAKAR CATHOLIC PARISHES - BULK IMPORT")
     print("=" * 60 + "\n")
-    
-    # Check if server is running
-    try:
-        response = requests.get(f"{API_URL}/")
-        if response.status_code == 200:
-            print("✅ Server is running\n")
-            add_parishes()
-        else:
-            print("❌ Server returned an error")
-    except requests.exceptions.ConnectionError:
-        print("❌ ERROR: Cannot connect to server!")
-        print("   Make sure the backend is running:")
-        print("   cd backend && python backend_api.py")
-    except Exception as e:
-        print(f"❌ Unexpected error: {str(e)}")
\ No newline at end of file
+
+    add_parishes()
@@ -29,6 +29,10 @@ echo "📦 Checking dependencies..."
 pip install -q -r requirements.txt
 
 echo ""
+echo "🗄️  Applying database migrations..."
+python3 scripts/migrations/migrate.py || exit 1
+echo ""
+
 echo "🔧 Starting FastAPI server..."
 echo "📍 Backend: http://localhost:8000"
 echo "📖 API Docs: http://localhost:8000/docs"
@@ -0,0 +1,40 @@
+#!/usr/bin/env python3
+"""
+Move expired and inactive parochial news to the archive (see news_archive.py)
+
+Meant to run periodically, e.g. nightly from cron:
+    0 3 * * * cd /path/to/backend && python3 scripts/tools/archive_news.py --compact
+
+Usage (from backend/):
+    python3 scripts/tools/archive_news.py [--grace-days 30] [--dry-run] [--compact]
+"""
+
+import argparse
+import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from news_archive import NEWS_ARCHIVE_GRACE_DAYS, archive_news, compact
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Archive expired and inactive parochial news")
+    parser.add_argument("--grace-days", type=int, default=NEWS_ARCHIVE_GRACE_DAYS,
+                        help="Days after an event ends before it is archived")
+    parser.add_argument("--batch-size", type=int, default=500)
+    parser.add_argument("--dry-run", action="store_true", help="Only count what would be archived")
+    parser.add_argument("--compact", action="store_true", help="VACUUM afterwards to reclaim space")
+    args = parser.parse_args()
+
+    count = archive_news(args.grace_days, args.batch_size, dry_run=args.dry_run)
+    print(f"✓ {count} news {'archivable' if args.dry_run else 'archived'}")
+
+    if args.compact and count and not args.dry_run:
+        compact()
+        print("✓ Database compacted")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
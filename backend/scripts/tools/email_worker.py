@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+"""
+Deliver the emails queued in email_outbox (see email_outbox.py)
+
+The app runs a delivery thread itself; use this script instead when that
+thread is disabled (EMAIL_WORKER_ENABLED=false), e.g. to run a single
+worker process next to several API workers, or to flush the queue by hand.
+
+Usage (from backend/):
+    python3 scripts/tools/email_worker.py [--once] [--transport file]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from email_outbox import (
+    EMAIL_SEND_CONCURRENCY,
+    EMAIL_TRANSPORT,
+    EMAIL_WORKER_BATCH_SIZE,
+    EMAIL_WORKER_INTERVAL_SECONDS,
+    create_transport,
+    deliver_all,
+    get_outbox_stats,
+)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Deliver queued emails")
+    parser.add_argument("--once", action="store_true", help="Deliver what is due, then exit")
+    parser.add_argument("--transport", default=EMAIL_TRANSPORT, help="resend, file or null")
+    parser.add_argument("--batch-size", type=int, default=EMAIL_WORKER_BATCH_SIZE)
+    parser.add_argument("--concurrency", type=int, default=EMAIL_SEND_CONCURRENCY,
+                        help="Emails sent in parallel (still within EMAIL_PROVIDER_RATE_PER_SECOND)")
+    parser.add_argument("--interval", type=float, default=EMAIL_WORKER_INTERVAL_SECONDS,
+                        help="Seconds between polls")
+    args = parser.parse_args()
+
+    transport = create_transport(args.transport)
+    while True:
+        sent, failed = deliver_all(transport, args.batch_size, args.concurrency)
+        if sent or failed:
+            print(f"✓ {sent} sent, {failed} failed (will retry or give up)")
+        if args.once:
+            stats = get_outbox_stats()
+            print(f"  {stats['pending']} pending, {stats['failed']} failed permanently")
+            return 0
+        time.sleep(args.interval)
+
+
+if __name__ == "__main__":
+    try:
+        sys.exit(main())
+    except KeyboardInterrupt:
+        sys.exit(0)
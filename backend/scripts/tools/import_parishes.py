@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+Bulk import of parishes, mass times and news from CSV, NDJSON or JSON (see importer.py)
+
+Exports from GET /api/admin/master/export are accepted as is, inactive mass
+times and news included. They carry no passwords: pass --default-password,
+or --allow-no-password to create the accounts without one (they must then
+use "forgot password"). Otherwise rows without a password are rejected.
+
+Usage (from backend/):
+    python3 scripts/tools/import_parishes.py parishes.csv
+    python3 scripts/tools/import_parishes.py export.ndjson --default-password changeme --errors errors.csv
+    python3 scripts/tools/import_parishes.py export.csv --allow-no-password
+    python3 scripts/tools/import_parishes.py parishes.json --dry-run
+"""
+
+import argparse
+import csv
+import os
+import sys
+import time as timer
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from importer import detect_format, read_rows, run_import
+
+
+def write_error_report(path: str, errors):
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(["line", "admin_email", "error"])
+        writer.writerows(sorted(errors))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Bulk import parishes, mass times and news")
+    parser.add_argument("path", help="CSV, NDJSON or JSON file")
+    parser.add_argument("--format", choices=["csv", "ndjson", "json"], help="Default: from the file extension")
+    parser.add_argument("--batch-size", type=int, default=500)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="Password hashing processes")
+    parser.add_argument("--default-password", help="Password for rows without admin_password")
+    parser.add_argument("--allow-no-password", action="store_true",
+                        help="Import rows without a password (and no default) instead of rejecting them")
+    parser.add_argument("--errors", help="Write the per-row error report to this CSV file")
+    parser.add_argument("--dry-run", action="store_true", help="Validate and check only, write nothing")
+    args = parser.parse_args()
+
+    start = timer.perf_counter()
+    rows = read_rows(args.path, args.format or detect_format(args.path))
+    stats = run_import(rows, args.batch_size, args.workers, args.default_password, args.dry_run,
+                       args.allow_no_password)
+    elapsed = timer.perf_counter() - start
+
+    verb = "validated" if args.dry_run else "imported"
+    print(f"✓ {stats.parishes} parishes, {stats.mass_times} mass times and {stats.news} news {verb} "
+          f"({stats.read} rows read) in {elapsed:.1f}s")
+
+    if stats.errors:
+        print(f"❌ {len(stats.errors)} rows skipped")
+        for line, email, message in sorted(stats.errors)[:10]:
+            print(f"   line {line} {email}: {message}")
+        if args.errors:
+            write_error_report(args.errors, stats.errors)
+            print(f"   Full report: {args.errors}")
+        elif len(stats.errors) > 10:
+            print("   ... use --errors FILE for the full report")
+    return 1 if stats.errors else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,170 @@
+"""
+Dashboard statistics computed with grouped aggregate SQL
+
+Each scope is a handful of GROUP BY / COUNT queries; no row is loaded into
+Python. Results are cached per scope and tagged with the change_log version
+they were computed at, like the response cache:
+
+  - master scope: the global version (any write anywhere)
+  - parish scope: the latest change_log id of that parish, so writes in
+    other parishes don't evict it
+
+Every admin write records a change, so a cached entry is served until the
+next write in its scope. Counts that depend on the date (upcoming events)
+are also keyed by day.
+"""
+
+import threading
+from collections import OrderedDict
+from datetime import date
+from typing import Callable, Dict, Optional, Tuple
+
+from sqlalchemy import and_, case, func, or_, select
+from sqlalchemy.orm import Session
+
+from models import ArchivedNews, MassTime, Parish, ParochialNews
+from sync import current_version, parish_version
+
+STATS_CACHE_MAX_ENTRIES = 1024
+
+
+def _grouped(db: Session, column, *where) -> Dict[str, int]:
+    """{value: count} of `column`, restricted by `where`"""
+    return {
+        value: count
+        for value, count in db.execute(select(column, func.count()).where(*where).group_by(column))
+    }
+
+
+def _count(condition):
+    return func.coalesce(func.sum(case((condition, 1), else_=0)), 0)
+
+
+def _mass_stats(db: Session, *where) -> dict:
+    total, active, sunday = db.execute(select(
+        func.count(),
+        _count(MassTime.is_active == True),
+        _count(MassTime.day_of_week == "Sunday"),
+    ).select_from(MassTime).where(*where)).one()
+    return {
+        "total": total,
+        "active": active,
+        "sunday": sunday,
+        "weekday": total - sunday,
+        "by_day": _grouped(db, MassTime.day_of_week, *where),
+        "by_language": _grouped(db, func.coalesce(MassTime.language, "French"), *where),
+    }
+
+
+def _news_stats(db: Session, today: date, news_where: tuple, archive_where: tuple) -> dict:
+    total, active, upcoming = db.execute(select(
+        func.count(),
+        _count(ParochialNews.is_active == True),
+        _count(and_(
+            ParochialNews.is_active == True,
+            ParochialNews.event_start_date.isnot(None),
+            func.coalesce(ParochialNews.event_end_date, ParochialNews.event_start_date) >= today,
+        )),
+    ).select_from(ParochialNews).where(*news_where)).one()
+    archived = db.execute(select(func.count()).select_from(ArchivedNews).where(*archive_where)).scalar()
+    return {
+        "total": total,
+        "active": active,
+        "inactive": total - active,
+        "upcoming_events": upcoming,
+        "archived": archived,
+        "by_category": _grouped(db, ParochialNews.category, *news_where),
+    }
+
+
+def compute_parish_stats(db: Session, parish_id: int, today: date) -> dict:
+    return {
+        "scope": "parish",
+        "parish_id": parish_id,
+        "masses": _mass_stats(db, MassTime.parish_id == parish_id),
+        "news": _news_stats(
+            db, today, (ParochialNews.parish_id == parish_id,), (ArchivedNews.parish_id == parish_id,)
+        ),
+    }
+
+
+def compute_master_stats(db: Session, today: date) -> dict:
+    total, approved, without_coordinates = db.execute(select(
+        func.count(),
+        _count(Parish.is_approved == True),
+        _count(or_(Parish.latitude.is_(None), Parish.longitude.is_(None))),
+    ).where(Parish.is_master_admin == False)).one()
+    return {
+        "scope": "master",
+        "parishes": {
+            "total": total,
+            "approved": approved,
+            "pending_registrations": total - approved,
+            "without_coordinates": without_coordinates,
+            "by_diocese": _grouped(db, Parish.diocese_id, Parish.is_master_admin == False),
+        },
+        "masses": _mass_stats(db),
+        "news": _news_stats(db, today, (), ()),
+    }
+
+
+class StatsCache:
+    """Bounded LRU of computed stats, each tagged with its scope's version"""
+
+    def __init__(self, max_entries: int = STATS_CACHE_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Tuple, Tuple[int, dict]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get_or_compute(self, key: Tuple, version: int, compute: Callable[[], dict]) -> dict:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] >= version:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            self.misses += 1
+        # Computed outside the lock; concurrent misses on the same key just race
+        stats = compute()
+        with self._lock:
+            current = self._entries.get(key)
+            # Never roll back to an older version
+            if current is None or current[0] <= version:
+                self._entries[key] = (version, stats)
+                self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return stats
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"entries": len(self._entries), "hits": self.hits, "misses": self.misses}
+
+
+stats_cache = StatsCache()
+
+
+def get_stats(db: Session, parish_id: Optional[int] = None, today: Optional[date] = None) -> dict:
+    """
+    Dashboard statistics of one parish, or of the whole platform
+
+    Args:
+        db: Database session
+        parish_id: Parish scope; None for the master scope
+        today: Reference date for upcoming events (default: today)
+
+    Returns:
+        The stats, with the version they were computed at
+    """
+    today = today or date.today()
+    if parish_id is None:
+        version = current_version(db)
+        key = ("master", today)
+        compute = lambda: compute_master_stats(db, today)  # noqa: E731
+    else:
+        version = parish_version(db, parish_id)
+        key = ("parish", parish_id, today)
+        compute = lambda: compute_parish_stats(db, parish_id, today)  # noqa: E731
+    return {**stats_cache.get_or_compute(key, version, compute), "version": version}
@@ -0,0 +1,188 @@
+"""
+Incremental sync support for offline-capable clients
+
+Every write to public data (parishes, mass times, news) appends a row to the
+change_log table. The row id is a monotonically increasing version: a client
+remembers the last version it saw and asks for everything changed since then.
+
+The log only records *that* an entity changed. The delta is built from the
+current state of the tables, so an entity that no longer exists or is no longer
+public (deleted, unapproved, inactive news) is returned as a tombstone.
+Deleting a parish implies deleting its mass times and news on the client.
+"""
+
+from typing import Iterable, List, Optional
+from sqlalchemy import bindparam, func, insert, select, text
+from sqlalchemy.orm import Session
+
+from models import ChangeLog, Parish, MassTime, ParochialNews
+from queries import CURRENT_VERSION, PARISH_VERSION
+
+ENTITY_PARISH = "parish"
+ENTITY_MASS_TIME = "mass_time"
+ENTITY_NEWS = "news"
+
+# Keeps IN (...) lists well under SQLite's bound parameter limit
+_CHUNK_SIZE = 500
+
+# Arbitrary application-wide key for the Postgres advisory lock below
+_CHANGE_LOG_LOCK_KEY = 26026
+
+
+def record_change(db: Session, entity: str, entity_id: int, parish_id: Optional[int] = None):
+    """
+    Append a change to the log inside the caller's transaction
+
+    Must be called before db.commit() so the change and the data are
+    committed together. New rows need a db.flush() first to get their id.
+
+    Args:
+        db: Database session
+        entity: One of ENTITY_PARISH, ENTITY_MASS_TIME, ENTITY_NEWS
+        entity_id: Primary key of the changed row
+        parish_id: Parish owning the row (the parish itself for ENTITY_PARISH)
+    """
+    if db.get_bind().dialect.name == "postgresql":
+        # Serialize writers until commit so versions become visible in order
+        # and a client can never skip over a late-committing lower version.
+        db.execute(text("SELECT pg_advisory_xact_lock(:key)"), {"key": _CHANGE_LOG_LOCK_KEY})
+
+    db.add(ChangeLog(entity=entity, entity_id=entity_id, parish_id=parish_id))
+
+
+def record_changes(db: Session, entity: str, entity_ids: List[int], parish_id: Optional[int] = None):
+    """
+    Bulk form of record_change(): one INSERT for many rows of the same parish
+
+    For ENTITY_PARISH, parish_id may be omitted: each parish owns itself.
+    """
+    if not entity_ids:
+        return
+    if db.get_bind().dialect.name == "postgresql":
+        db.execute(text("SELECT pg_advisory_xact_lock(:key)"), {"key": _CHANGE_LOG_LOCK_KEY})
+
+    db.execute(insert(ChangeLog), [
+        {
+            "entity": entity,
+            "entity_id": entity_id,
+            "parish_id": entity_id if parish_id is None and entity == ENTITY_PARISH else parish_id,
+        }
+        for entity_id in entity_ids
+    ])
+
+
+def current_version(db: Session) -> int:
+    """Return the latest change version (0 if nothing was ever recorded)"""
+    return db.execute(CURRENT_VERSION).scalar() or 0
+
+
+def parish_version(db: Session, parish_id: int) -> int:
+    """Latest change version of one parish's data (0 if it never changed)"""
+    return db.execute(PARISH_VERSION, {"parish_id": parish_id}).scalar() or 0
+
+
+_SCHEDULE_VERSION = select(func.max(ChangeLog.id)).where(
+    ChangeLog.parish_id == bindparam("parish_id"),
+    ChangeLog.entity == ENTITY_MASS_TIME,
+)
+
+
+def schedule_version(db: Session, parish_id: int) -> int:
+    """Latest change version of a parish's mass times (0 if never changed)"""
+    return db.execute(_SCHEDULE_VERSION, {"parish_id": parish_id}).scalar() or 0
+
+
+def _chunks(ids: List[int]) -> Iterable[List[int]]:
+    for i in range(0, len(ids), _CHUNK_SIZE):
+        yield ids[i:i + _CHUNK_SIZE]
+
+
+def _visible_parishes(db: Session):
+    return db.query(Parish).filter(
+        Parish.is_approved == True,
+        Parish.is_master_admin == False,
+    )
+
+
+def _visible_mass_times(db: Session):
+    return db.query(MassTime).join(Parish).filter(
+        Parish.is_approved == True,
+        Parish.is_master_admin == False,
+    )
+
+
+def _visible_news(db: Session):
+    return db.query(ParochialNews).join(Parish).filter(
+        ParochialNews.is_active == True,
+        Parish.is_approved == True,
+        Parish.is_master_admin == False,
+    )
+
+
+def build_sync(db: Session, since: int) -> dict:
+    """
+    Build the sync payload for a client at version `since`
+
+    Args:
+        db: Database session
+        since: Last version the client synced (0 for a full snapshot)
+
+    Returns:
+        Dict matching schemas.SyncResponse
+    """
+    version = current_version(db)
+
+    if since <= 0:
+        return {
+            "version": version,
+            "full": True,
+            "parishes": _visible_parishes(db).all(),
+            "mass_times": _visible_mass_times(db).order_by(MassTime.id).all(),
+            "news": _visible_news(db).order_by(ParochialNews.id).all(),
+        }
+
+    changed = {ENTITY_PARISH: set(), ENTITY_MASS_TIME: set(), ENTITY_NEWS: set()}
+    rows = db.query(ChangeLog.entity, ChangeLog.entity_id).filter(
+        ChangeLog.id > since,
+        ChangeLog.id <= version,
+    ).distinct()
+    for entity, entity_id in rows:
+        changed.setdefault(entity, set()).add(entity_id)
+
+    parish_ids = sorted(changed[ENTITY_PARISH])
+    parishes = []
+    for chunk in _chunks(parish_ids):
+        parishes.extend(_visible_parishes(db).filter(Parish.id.in_(chunk)).all())
+    visible_parish_ids = {p.id for p in parishes}
+
+    # A parish that (re)appears, e.g. on approval, brings its whole schedule and news
+    mass_times = {}
+    news = {}
+    for chunk in _chunks(sorted(visible_parish_ids)):
+        for m in _visible_mass_times(db).filter(MassTime.parish_id.in_(chunk)):
+            mass_times[m.id] = m
+        for n in _visible_news(db).filter(ParochialNews.parish_id.in_(chunk)):
+            news[n.id] = n
+
+    mass_time_ids = sorted(changed[ENTITY_MASS_TIME])
+    for chunk in _chunks(mass_time_ids):
+        for m in _visible_mass_times(db).filter(MassTime.id.in_(chunk)):
+            mass_times[m.id] = m
+
+    news_ids = sorted(changed[ENTITY_NEWS])
+    for chunk in _chunks(news_ids):
+        for n in _visible_news(db).filter(ParochialNews.id.in_(chunk)):
+            news[n.id] = n
+
+    return {
+        "version": version,
+        "full": False,
+        "parishes": parishes,
+        "mass_times": [mass_times[i] for i in sorted(mass_times)],
+        "news": [news[i] for i in sorted(news)],
+        "deleted": {
+            "parishes": [i for i in parish_ids if i not in visible_parish_ids],
+            "mass_times": [i for i in mass_time_ids if i not in mass_times],
+            "news": [i for i in news_ids if i not in news],
+        },
+    }
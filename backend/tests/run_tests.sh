@@ -1,6 +1,10 @@
 #!/bin/bash
 # Regression Test Runner for Senegal Mass Times
 
+echo "🧪 Running Unit Tests..."
+python3 -m pytest -q test_units.py || exit 1
+echo ""
+
 echo "🧪 Running Regression Tests..."
 echo ""
 
@@ -3,8 +3,15 @@ Regression Test Suite for Senegal Mass Times API
 Tests all core functionalities before manual testing
 """
 
+import base64
+import csv
+import io
+from datetime import date, timedelta
 import requests
 import json
+import msgpack
+import uuid
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, Optional
 
 # Configuration
@@ -16,6 +23,7 @@ TEST_PARISHES = [
     {"email": "admin@cathedrale-dakar.sn", "password": "password123", "name": "Cathédrale du Souvenir Africain"},
     {"email": "admin@stjoseph-medina.sn", "password": "password123", "name": "Paroisse Saint-Joseph de Médina"},
 ]
+MASTER_ADMIN = {"email": "master@admin.sn", "password": "admin123"}  # scripts/migrations/add_master_admin.py
 
 # Color codes for output
 GREEN = '\033[92m'
@@ -169,6 +177,112 @@ def test_public_search_parishes_by_name():
     except Exception as e:
         results.add_fail("Search Parishes by Name", str(e))
 
+def test_public_parish_full():
+    """Test the one-request parish page (details, schedule by day, news)"""
+    try:
+        response = requests.get(f"{API_URL}/parishes/1/full")
+        data = response.json()
+
+        if response.status_code != 200:
+            results.add_fail("GET Parish Full Page", f"Status code: {response.status_code}")
+            return
+
+        for field in ("parish", "schedule", "news", "news_next_cursor"):
+            if field not in data:
+                results.add_fail("GET Parish Full Page", f"Missing field: {field}")
+                return
+
+        week = ["Sunday", "Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday"]
+        days = [day["day_of_week"] for day in data["schedule"]]
+        if data["parish"]["id"] != 1 or not days or days != sorted(days, key=week.index):
+            results.add_fail("GET Parish Full Page", f"Schedule days out of order: {days}")
+            return
+
+        for day in data["schedule"]:
+            times = [m["time"] for m in day["masses"]]
+            if times != sorted(times) or any(m["day_of_week"] != day["day_of_week"] for m in day["masses"]):
+                results.add_fail("GET Parish Full Page", f"Masses of {day['day_of_week']} not grouped or sorted")
+                return
+
+        results.add_pass("GET Parish Full Page")
+    except Exception as e:
+        results.add_fail("GET Parish Full Page", str(e))
+
+def test_public_sync():
+    """Test full and incremental sync"""
+    try:
+        response = requests.get(f"{API_URL}/sync")
+        data = response.json()
+
+        if response.status_code != 200:
+            results.add_fail("Sync Full Snapshot", f"Status code: {response.status_code}")
+            return
+
+        if not data["full"] or not data["parishes"]:
+            results.add_fail("Sync Full Snapshot", "Expected a full snapshot with parishes")
+            return
+
+        response = requests.get(f"{API_URL}/sync?since={data['version']}")
+        delta = response.json()
+
+        if delta["full"] or delta["version"] < data["version"]:
+            results.add_fail("Sync Incremental", f"Unexpected delta: {delta}")
+            return
+
+        results.add_pass("Sync Full Snapshot + Incremental")
+    except Exception as e:
+        results.add_fail("Sync Full Snapshot + Incremental", str(e))
+
+def test_public_compression():
+    """Test gzip response compression and ETag revalidation"""
+    try:
+        response = requests.get(f"{API_URL}/parishes", headers={"Accept-Encoding": "gzip"})
+
+        if response.status_code != 200:
+            results.add_fail("Compressed Parish List", f"Status code: {response.status_code}")
+            return
+
+        if response.headers.get("Content-Encoding") != "gzip":
+            results.add_fail("Compressed Parish List", f"Content-Encoding: {response.headers.get('Content-Encoding')}")
+            return
+
+        etag = response.headers.get("ETag")
+        response = requests.get(f"{API_URL}/parishes", headers={"If-None-Match": etag})
+        if response.status_code != 304:
+            results.add_fail("Compressed Parish List", f"Expected 304 for matching ETag, got {response.status_code}")
+            return
+
+        results.add_pass("Compressed Parish List + ETag")
+    except Exception as e:
+        results.add_fail("Compressed Parish List + ETag", str(e))
+
+def test_public_msgpack():
+    """Test MessagePack content negotiation"""
+    try:
+        json_data = requests.get(f"{API_URL}/parishes").json()
+        response = requests.get(f"{API_URL}/parishes", headers={"Accept": "application/msgpack"})
+
+        if response.status_code != 200:
+            results.add_fail("MessagePack Parish List", f"Status code: {response.status_code}")
+            return
+
+        if not response.headers.get("Content-Type", "").startswith("application/msgpack"):
+            results.add_fail("MessagePack Parish List", f"Content-Type: {response.headers.get('Content-Type')}")
+            return
+
+        data = msgpack.unpackb(response.content, timestamp=3)
+        if [p["id"] for p in data] != [p["id"] for p in json_data]:
+            results.add_fail("MessagePack Parish List", "Parishes differ from the JSON response")
+            return
+
+        if data and data[0]["mass_times"] and not isinstance(data[0]["mass_times"][0]["time"], int):
+            results.add_fail("MessagePack Parish List", "Mass time not encoded as minutes since midnight")
+            return
+
+        results.add_pass("MessagePack Parish List")
+    except Exception as e:
+        results.add_fail("MessagePack Parish List", str(e))
+
 def test_login_valid_credentials():
     """Test login with valid credentials"""
     try:
@@ -213,6 +327,45 @@ def test_login_invalid_credentials():
     except Exception as e:
         results.add_fail("Login with Invalid Credentials", str(e))
 
+def test_login_master_admin() -> Optional[str]:
+    """Test master admin login"""
+    try:
+        response = requests.post(f"{API_URL}/auth/login", json=MASTER_ADMIN)
+        data = response.json()
+
+        if response.status_code != 200:
+            results.add_fail("Login Master Admin", f"Status code: {response.status_code}")
+            return None
+
+        if not data.get("is_master_admin"):
+            results.add_fail("Login Master Admin", "is_master_admin not set")
+            return None
+
+        results.add_pass("Login Master Admin")
+        return data["access_token"]
+    except Exception as e:
+        results.add_fail("Login Master Admin", str(e))
+        return None
+
+def test_login_throttle():
+    """Test that repeated logins for one email are refused with 429"""
+    try:
+        # Its own email, so the per-email bucket of the test accounts is untouched
+        credentials = {"email": "throttle-test@example.sn", "password": "wrongpassword"}
+        responses = [requests.post(f"{API_URL}/auth/login", json=credentials) for _ in range(6)]
+
+        if responses[0].status_code != 401:
+            results.add_fail("Login Throttle", f"Expected 401 first, got {responses[0].status_code}")
+            return
+
+        if responses[-1].status_code != 429 or not responses[-1].headers.get("Retry-After"):
+            results.add_fail("Login Throttle", f"Expected 429 with Retry-After, got {responses[-1].status_code}")
+            return
+
+        results.add_pass("Login Throttle (429)")
+    except Exception as e:
+        results.add_fail("Login Throttle (429)", str(e))
+
 def test_admin_get_parish(token: str):
     """Test getting authenticated parish info"""
     if not token:
@@ -336,6 +489,59 @@ def test_admin_delete_mass_time(token: str, mass_id: int):
     except Exception as e:
         results.add_fail("Admin Delete Mass Time", str(e))
 
+def test_admin_replace_schedule(token: str):
+    """Test replacing the whole schedule, and the 409 on a stale base_version"""
+    if not token:
+        results.add_fail("Admin Replace Schedule", "No token available")
+        return
+
+    try:
+        headers = {"Authorization": f"Bearer {token}"}
+        parish = requests.get(f"{API_URL}/admin/parish", headers=headers).json()
+        loaded = requests.get(f"{API_URL}/admin/parishes/{parish['id']}/schedule", headers=headers).json()
+        fields = ("id", "day_of_week", "time", "language", "mass_type", "notes")
+        original = [{f: m[f] for f in fields} for m in loaded["mass_times"]]
+        added = {"day_of_week": "Saturday", "time": "21:45:00", "language": "Wolof", "mass_type": "Test Regression"}
+
+        response = requests.put(
+            f"{API_URL}/admin/parishes/{parish['id']}/schedule",
+            headers=headers,
+            json={"mass_times": original + [added], "base_version": loaded["version"]}
+        )
+        data = response.json()
+
+        if response.status_code != 200:
+            results.add_fail("Admin Replace Schedule", f"Status code: {response.status_code}")
+            return
+
+        kept = {m["id"] for m in data["mass_times"]} & {m["id"] for m in original}
+        if len(data["mass_times"]) != len(original) + 1 or len(kept) != len(original):
+            results.add_fail("Admin Replace Schedule", "Existing masses not kept or new mass not added")
+            return
+
+        response = requests.put(
+            f"{API_URL}/admin/parishes/{parish['id']}/schedule",
+            headers=headers,
+            json={"mass_times": original, "base_version": data["version"] - 1}
+        )
+        if response.status_code != 409:
+            results.add_fail("Admin Replace Schedule", f"Expected 409 for a stale base_version, got {response.status_code}")
+            return
+
+        # Restore the original schedule
+        response = requests.put(
+            f"{API_URL}/admin/parishes/{parish['id']}/schedule",
+            headers=headers,
+            json={"mass_times": original, "base_version": data["version"]}
+        )
+        if response.status_code != 200 or len(response.json()["mass_times"]) != len(original):
+            results.add_fail("Admin Replace Schedule", f"Restore failed: {response.status_code}")
+            return
+
+        results.add_pass("Admin Replace Schedule + Stale Version (409)")
+    except Exception as e:
+        results.add_fail("Admin Replace Schedule + Stale Version (409)", str(e))
+
 def test_admin_update_parish_info(token: str):
     """Test updating parish information"""
     if not token:
@@ -378,6 +584,280 @@ def test_admin_update_parish_info(token: str):
     except Exception as e:
         results.add_fail("Admin Update Parish Info", str(e))
 
+def test_admin_stats(token: str, master_token: str):
+    """Test the parish and master dashboard counts"""
+    if not token or not master_token:
+        results.add_fail("Dashboard Stats", "No token available")
+        return
+
+    try:
+        response = requests.get(f"{API_URL}/admin/stats", headers={"Authorization": f"Bearer {token}"})
+        data = response.json()
+
+        if response.status_code != 200:
+            results.add_fail("Dashboard Stats", f"Status code: {response.status_code}")
+            return
+
+        masses = data["masses"]
+        if data["scope"] != "parish" or masses["total"] < 1 or sum(masses["by_day"].values()) != masses["total"]:
+            results.add_fail("Dashboard Stats", f"Unexpected parish stats: {data}")
+            return
+
+        response = requests.get(f"{API_URL}/admin/stats?scope=master", headers={"Authorization": f"Bearer {token}"})
+        if response.status_code != 403:
+            results.add_fail("Dashboard Stats", f"Expected 403 for a parish admin, got {response.status_code}")
+            return
+
+        response = requests.get(f"{API_URL}/admin/stats", headers={"Authorization": f"Bearer {master_token}"})
+        data = response.json()
+        if data["scope"] != "master" or data["parishes"]["total"] < 10:
+            results.add_fail("Dashboard Stats", f"Unexpected master stats: {data}")
+            return
+
+        results.add_pass("Dashboard Stats (parish + master)")
+    except Exception as e:
+        results.add_fail("Dashboard Stats (parish + master)", str(e))
+
+def test_master_parish_list(master_token: str):
+    """Test keyset pagination of the master parish list"""
+    if not master_token:
+        results.add_fail("Master Parish List", "No master token available")
+        return
+
+    try:
+        headers = {"Authorization": f"Bearer {master_token}"}
+        response = requests.get(f"{API_URL}/admin/master/parishes?sort=name&limit=5", headers=headers)
+        first = response.json()
+
+        if response.status_code != 200:
+            results.add_fail("Master Parish List", f"Status code: {response.status_code}")
+            return
+
+        if len(first["items"]) != 5 or first["total"] < 10 or not first["next_cursor"]:
+            results.add_fail("Master Parish List", f"Unexpected first page: total {first['total']}")
+            return
+
+        response = requests.get(
+            f"{API_URL}/admin/master/parishes?sort=name&limit=5&cursor={first['next_cursor']}",
+            headers=headers
+        )
+        second = response.json()
+        ids = [p["id"] for p in first["items"] + second["items"]]
+        if len(second["items"]) != 5 or len(set(ids)) != 10:
+            results.add_fail("Master Parish List", f"Second page overlaps the first: {ids}")
+            return
+
+        decodable = base64.urlsafe_b64encode(b'["name",[["x"],1]]').decode().rstrip("=")
+        for cursor, sort in (("not-a-cursor", "name"), (decodable, "name"), (first["next_cursor"], "-created_at")):
+            response = requests.get(
+                f"{API_URL}/admin/master/parishes?sort={sort}&cursor={cursor}",
+                headers=headers
+            )
+            if response.status_code != 400:
+                results.add_fail("Master Parish List", f"Expected 400 for a bad cursor, got {response.status_code}")
+                return
+
+        results.add_pass("Master Parish List Pages + Bad Cursor (400)")
+    except Exception as e:
+        results.add_fail("Master Parish List Pages + Bad Cursor (400)", str(e))
+
+def test_master_bulk_actions(master_token: str):
+    """Test bulk approve, reject and delete with a result per id"""
+    if not master_token:
+        results.add_fail("Master Bulk Actions", "No master token available")
+        return
+
+    try:
+        headers = {"Authorization": f"Bearer {master_token}"}
+        ids = []
+        for _ in range(2):
+            response = requests.post(f"{API_URL}/auth/register", json={
+                "name": "Paroisse Test Regression",
+                "city": "Dakar",
+                "admin_email": f"bulk-{uuid.uuid4().hex[:8]}@example.sn",
+                "admin_password": "password123",
+            })
+            ids.append(response.json()["parish_id"])
+        approved_id, rejected_id = ids
+        missing_id = max(ids) + 100000
+
+        checks = [
+            ("approve", [approved_id, missing_id], {approved_id: "approved", missing_id: "not_found"}, 1),
+            ("reject", [rejected_id], {rejected_id: "rejected"}, 1),
+            ("delete", [approved_id], {approved_id: "deleted"}, 1),
+        ]
+        for action, action_ids, expected, applied in checks:
+            response = requests.post(
+                f"{API_URL}/admin/master/parishes/bulk",
+                headers=headers,
+                json={"action": action, "ids": action_ids}
+            )
+            data = response.json()
+
+            if response.status_code != 200:
+                results.add_fail("Master Bulk Actions", f"{action}: status code {response.status_code}")
+                return
+
+            statuses = {r["id"]: r["status"] for r in data["results"]}
+            if statuses != expected or data["applied"] != applied:
+                results.add_fail("Master Bulk Actions", f"{action}: unexpected results {data}")
+                return
+
+        results.add_pass("Master Bulk Approve / Reject / Delete")
+    except Exception as e:
+        results.add_fail("Master Bulk Approve / Reject / Delete", str(e))
+
+def test_master_export(master_token: str):
+    """Test the streaming NDJSON and CSV exports"""
+    if not master_token:
+        results.add_fail("Master Export", "No master token available")
+        return
+
+    try:
+        headers = {"Authorization": f"Bearer {master_token}"}
+        response = requests.get(f"{API_URL}/admin/master/export?format=ndjson", headers=headers)
+
+        if response.status_code != 200:
+            results.add_fail("Master Export", f"Status code: {response.status_code}")
+            return
+
+        rows = [json.loads(line) for line in response.text.splitlines()]
+        if len(rows) < 10 or any("mass_times" not in r or "news" not in r for r in rows):
+            results.add_fail("Master Export", f"Expected parishes with mass_times and news, got {len(rows)} rows")
+            return
+
+        response = requests.get(f"{API_URL}/admin/master/export?format=csv", headers=headers)
+        csv_rows = list(csv.reader(io.StringIO(response.text)))
+        if response.status_code != 200 or len(csv_rows) != len(rows) + 1:
+            results.add_fail("Master Export", f"CSV: status {response.status_code}, {len(csv_rows)} rows")
+            return
+
+        if "mass_times" not in csv_rows[0] or "news" not in csv_rows[0]:
+            results.add_fail("Master Export", f"CSV header: {csv_rows[0]}")
+            return
+
+        results.add_pass("Master Export (NDJSON + CSV)")
+    except Exception as e:
+        results.add_fail("Master Export (NDJSON + CSV)", str(e))
+
+def test_public_news_pages(token: str):
+    """Test cursor-paginated news summaries and the per-item body"""
+    if not token:
+        results.add_fail("Public News Pages", "No token available")
+        return
+
+    try:
+        headers = {"Authorization": f"Bearer {token}"}
+        parish = requests.get(f"{API_URL}/admin/parish", headers=headers).json()
+        content = "<p>Test Regression " + "mot " * 200 + "</p>"
+        created = [
+            requests.post(
+                f"{API_URL}/admin/parishes/{parish['id']}/news",
+                headers=headers,
+                json={"title": f"Test Regression News {i}", "content": content}
+            ).json()["id"]
+            for i in range(3)
+        ]
+
+        try:
+            seen = []
+            url = f"{API_URL}/parishes/{parish['id']}/news?limit=2"
+            while url:
+                response = requests.get(url)
+                if response.status_code != 200:
+                    results.add_fail("Public News Pages", f"Status code: {response.status_code}")
+                    return
+                page = response.json()
+                if len(page["items"]) > 2 or any("content" in item for item in page["items"]):
+                    results.add_fail("Public News Pages", "Page too long or carrying full content")
+                    return
+                seen += page["items"]
+                cursor = page["next_cursor"]
+                url = f"{API_URL}/parishes/{parish['id']}/news?limit=2&cursor={cursor}" if cursor else None
+
+            ids = [item["id"] for item in seen]
+            if len(ids) != len(set(ids)) or not set(created) <= set(ids):
+                results.add_fail("Public News Pages", f"Pages overlap or miss created news: {ids}")
+                return
+
+            summary = next(item["summary"] for item in seen if item["id"] == created[0])
+            if "<p>" in summary or len(summary) >= len(content):
+                results.add_fail("Public News Pages", f"Summary not a plain-text excerpt: {summary[:60]}")
+                return
+
+            response = requests.get(f"{API_URL}/parishes/{parish['id']}/news/{created[0]}")
+            if response.status_code != 200 or response.json()["content"] != content:
+                results.add_fail("Public News Pages", f"News item body: status {response.status_code}")
+                return
+
+            # Garbage, and a well-formed cursor whose values don't fit the sort key
+            decodable = base64.urlsafe_b64encode(b'["-publish_date",[1,1]]').decode().rstrip("=")
+            for cursor in ("not-a-cursor", decodable):
+                response = requests.get(f"{API_URL}/parishes/{parish['id']}/news?cursor={cursor}")
+                if response.status_code != 400:
+                    results.add_fail("Public News Pages", f"Expected 400 for a bad cursor, got {response.status_code}")
+                    return
+        finally:
+            for news_id in created:
+                requests.delete(f"{API_URL}/admin/parishes/{parish['id']}/news/{news_id}", headers=headers)
+
+        results.add_pass("Public News Pages + Item Body")
+    except Exception as e:
+        results.add_fail("Public News Pages + Item Body", str(e))
+
+def test_public_events(token: str):
+    """Test the events overlapping a date range"""
+    if not token:
+        results.add_fail("Public Events", "No token available")
+        return
+
+    try:
+        headers = {"Authorization": f"Bearer {token}"}
+        parish = requests.get(f"{API_URL}/admin/parish", headers=headers).json()
+        start = date.today() + timedelta(days=2)
+        response = requests.post(
+            f"{API_URL}/admin/parishes/{parish['id']}/news",
+            headers=headers,
+            json={"title": "Test Regression Event", "content": "Test", "category": "Event",
+                  "event_start_date": start.isoformat(), "event_end_date": (start + timedelta(days=3)).isoformat()}
+        )
+        news_id = response.json()["id"]
+
+        try:
+            # The write invalidated the event index: concurrent misses must all be served
+            urls = [f"{API_URL}/events?from={(start - timedelta(days=i)).isoformat()}" for i in range(20)]
+            with ThreadPoolExecutor(max_workers=20) as pool:
+                codes = list(pool.map(lambda url: requests.get(url, timeout=10).status_code, urls))
+            if codes != [200] * len(urls):
+                results.add_fail("Public Events", f"Concurrent requests after a write: {codes}")
+                return
+
+            response = requests.get(f"{API_URL}/events?from={(start + timedelta(days=1)).isoformat()}")
+            if response.status_code != 200:
+                results.add_fail("Public Events", f"Status code: {response.status_code}")
+                return
+
+            events = [e for e in response.json() if e["id"] == news_id]
+            if not events or events[0]["parish_name"] != parish["name"]:
+                results.add_fail("Public Events", "Event overlapping the range not returned with its parish")
+                return
+
+            response = requests.get(f"{API_URL}/events?to={(start - timedelta(days=1)).isoformat()}")
+            if any(e["id"] == news_id for e in response.json()):
+                results.add_fail("Public Events", "Event returned for a range it does not overlap")
+                return
+
+            response = requests.get(f"{API_URL}/events?near=dakar")
+            if response.status_code != 400:
+                results.add_fail("Public Events", f"Expected 400 for an invalid near, got {response.status_code}")
+                return
+        finally:
+            requests.delete(f"{API_URL}/admin/parishes/{parish['id']}/news/{news_id}", headers=headers)
+
+        results.add_pass("Public Events by Date Range")
+    except Exception as e:
+        results.add_fail("Public Events by Date Range", str(e))
+
 def test_unauthorized_access():
     """Test that protected endpoints reject requests without auth"""
     try:
@@ -404,10 +884,15 @@ def run_all_tests():
     test_public_get_parish_by_id()
     test_public_search_parishes_by_city()
     test_public_search_parishes_by_name()
+    test_public_parish_full()
+    test_public_sync()
+    test_public_compression()
+    test_public_msgpack()
 
     print(f"\n{YELLOW}Testing Authentication...{RESET}")
     token = test_login_valid_credentials()
     test_login_invalid_credentials()
+    master_token = test_login_master_admin()
     test_unauthorized_access()
 
     print(f"\n{YELLOW}Testing Admin Endpoints...{RESET}")
@@ -418,6 +903,17 @@ def run_all_tests():
     mass_id = test_admin_add_mass_time(token)
     test_admin_update_mass_time(token, mass_id)
     test_admin_delete_mass_time(token, mass_id)
+    test_admin_replace_schedule(token)
+
+    print(f"\n{YELLOW}Testing News and Events...{RESET}")
+    test_public_news_pages(token)
+    test_public_events(token)
+
+    print(f"\n{YELLOW}Testing Master Admin Endpoints...{RESET}")
+    test_admin_stats(token, master_token)
+    test_master_parish_list(master_token)
+    test_master_bulk_actions(master_token)
+    test_master_export(master_token)
 
     print(f"\n{YELLOW}Testing Multiple Parish Logins...{RESET}")
     for i, parish in enumerate(TEST_PARISHES[1:], 2):
@@ -430,6 +926,9 @@ def run_all_tests():
         else:
             results.add_fail(f"Login Parish {i}: {parish['name']}", f"Status: {response.status_code}")
 
+    print(f"\n{YELLOW}Testing Login Throttle...{RESET}")
+    test_login_throttle()
+
     results.print_summary()
 
     return results.failed == 0
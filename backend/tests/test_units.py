@@ -0,0 +1,298 @@
+"""
+Unit Tests for Senegal Mass Times backend modules
+No server needed: runs against a throwaway SQLite database
+
+Usage (from backend/):
+    python3 -m pytest tests/test_units.py
+"""
+
+import os
+import sys
+import tempfile
+
+# Must be set before database.py is imported
+os.environ["DATABASE_URL"] = f"sqlite:///{tempfile.mkdtemp()}/units.db"
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import inspect
+
+import schema_migrations
+from database import engine
+from models import Base  # the model tables are registered once models is imported
+
+schema_migrations.migrate(log=lambda line: None)
+
+
+# ============ Schema Migrations ============
+
+def test_migrations_build_the_model_schema():
+    """A fresh database migrated to the latest version matches the models exactly"""
+    inspector = inspect(engine)
+    assert set(inspector.get_table_names()) == set(Base.metadata.tables) | {"schema_version"}
+
+    for name, table in Base.metadata.tables.items():
+        columns = {c["name"]: c for c in inspector.get_columns(name)}
+        assert set(columns) == set(table.c.keys()), name
+        for column in table.c:
+            if not column.primary_key:
+                assert columns[column.name]["nullable"] == column.nullable, (name, column.name)
+
+        expected = {i.name: [c.name for c in i.columns] for i in table.indexes}
+        actual = {i["name"]: i["column_names"] for i in inspector.get_indexes(name)}
+        assert actual == expected, name
+
+        expected_unique = {(c.name,) for c in table.c if c.unique}
+        actual_unique = {tuple(u["column_names"]) for u in inspector.get_unique_constraints(name)}
+        assert actual_unique == expected_unique, name
+
+
+def test_migrations_are_idempotent():
+    """Re-running the runner on an up-to-date database applies nothing"""
+    assert schema_migrations.migrate(log=lambda line: None) == []
+    with engine.connect() as conn:
+        assert schema_migrations.get_schema_version(conn) == schema_migrations.LATEST_VERSION
+
+
+# ============ News Archive ============
+
+def test_archive_accepts_a_reused_news_id():
+    """SQLite reuses the id of an archived news item; archiving it again must not collide"""
+    from datetime import date
+    from sqlalchemy import select
+    from database import SessionLocal
+    from models import ArchivedNews, Parish, ParochialNews
+    from news_archive import archive_news
+
+    db = SessionLocal()
+    try:
+        parish = Parish(name="Archive", city="Dakar", admin_email="archive@test.sn", is_approved=True)
+        db.add(parish)
+        db.flush()
+        news = ParochialNews(parish_id=parish.id, title="first", content="x", is_active=False)
+        db.add(news)
+        db.commit()
+        reused_id = news.id
+        assert archive_news(today=date.today(), log=lambda line: None) == 1
+
+        news = ParochialNews(parish_id=parish.id, title="second", content="x", is_active=False)
+        db.add(news)
+        db.commit()
+        assert news.id == reused_id  # the id really is handed out again
+        assert archive_news(today=date.today(), log=lambda line: None) == 1
+
+        titles = db.execute(
+            select(ArchivedNews.title).where(ArchivedNews.original_id == reused_id).order_by(ArchivedNews.id)
+        ).scalars().all()
+        assert titles == ["first", "second"]
+    finally:
+        db.close()
+
+
+def test_archive_treats_a_start_date_only_event_as_ending_that_day():
+    """One-day events (no end date) are archived once the grace period after their start runs out"""
+    from datetime import date, timedelta
+    from sqlalchemy import select
+    from database import SessionLocal
+    from models import ArchivedNews, Parish, ParochialNews
+    from news_archive import archive_news
+
+    today = date.today()
+    db = SessionLocal()
+    try:
+        parish = Parish(name="One day", city="Dakar", admin_email="oneday@test.sn", is_approved=True)
+        db.add(parish)
+        db.flush()
+        db.add_all([
+            ParochialNews(parish_id=parish.id, title="past", content="x", event_start_date=today - timedelta(days=31)),
+            ParochialNews(parish_id=parish.id, title="recent", content="x", event_start_date=today - timedelta(days=30)),
+        ])
+        db.commit()
+        assert archive_news(grace_days=30, today=today, log=lambda line: None) == 1
+
+        archived = db.execute(select(ArchivedNews.title).where(ArchivedNews.parish_id == parish.id)).scalars().all()
+        live = db.execute(select(ParochialNews.title).where(ParochialNews.parish_id == parish.id)).scalars().all()
+        assert (archived, live) == (["past"], ["recent"])
+    finally:
+        db.close()
+
+
+# ============ News Summaries ============
+
+def test_summarize_strips_markup_and_cuts_at_a_word():
+    """Summaries are plain text, at most `length` long, ended with an ellipsis when cut"""
+    from news_summary import ELLIPSIS, summarize
+
+    assert summarize("<p>Messe&nbsp;de  <b>minuit</b></p>\n") == "Messe de minuit"
+    assert summarize(None) == ""
+
+    summary = summarize("Veillée pascale " * 20, length=50)
+    assert len(summary) <= 50 and summary.endswith(ELLIPSIS)
+    assert summary == "Veillée pascale Veillée pascale Veillée pascale" + ELLIPSIS
+
+    # A single long word is cut mid-word rather than emptied
+    assert summarize("x" * 100, length=10) == "x" * 9 + ELLIPSIS
+
+
+# ============ Pagination ============
+
+def test_decode_cursor_round_trips_and_rejects_foreign_cursors():
+    """A cursor decodes back to its typed key, only for the sort order it was issued for"""
+    from datetime import datetime
+    import pytest
+    from models import Parish
+    from pagination import decode_cursor, encode_cursor
+
+    columns = (Parish.created_at, Parish.id)
+    key = (datetime(2026, 3, 1, 8, 30, 15, 250), 42)
+    cursor = encode_cursor("created_at", key)
+    assert decode_cursor(cursor, "created_at", columns) == key
+
+    malformed = (
+        "", "not-a-cursor", encode_cursor("-created_at", key), encode_cursor("created_at", key[:1]),
+        # Decodable, but the values don't fit the columns
+        encode_cursor("created_at", [1, 1]),
+        encode_cursor("created_at", ["2026-03-01", "42"]),
+        encode_cursor("created_at", ["2026-03-01", True]),
+        encode_cursor("created_at", ["yesterday", 42]),
+    )
+    for bad in malformed:
+        with pytest.raises(ValueError):
+            decode_cursor(bad, "created_at", columns)
+
+    name_columns = (Parish.name, Parish.id)
+    assert decode_cursor(encode_cursor("name", ["Keur Massar", 7]), "name", name_columns) == ("Keur Massar", 7)
+    with pytest.raises(ValueError):
+        decode_cursor(encode_cursor("name", [["Keur Massar"], 7]), "name", name_columns)
+
+
+# ============ Events ============
+
+def test_interval_index_matches_a_linear_scan():
+    """overlapping() returns exactly the intervals intersecting the range, by start date"""
+    import random
+    from datetime import date, timedelta
+    from events import IntervalIndex
+
+    rng = random.Random(40)
+    day = date(2026, 1, 1)
+    intervals = []
+    for item in range(200):
+        start = day + timedelta(days=rng.randrange(120))
+        intervals.append((start, start + timedelta(days=rng.randrange(10)), item))
+    index = IntervalIndex(intervals)
+    assert len(index) == 200
+    assert IntervalIndex([]).overlapping(day, day) == []
+
+    for _ in range(100):
+        start = day + timedelta(days=rng.randrange(-10, 130))
+        end = start + timedelta(days=rng.randrange(15))
+        expected = [item for s, e, item in sorted(intervals, key=lambda i: i[0]) if s <= end and e >= start]
+        assert index.overlapping(start, end) == expected
+
+
+# ============ Importer ============
+
+def test_import_keeps_flags_and_news_and_checks_emails_case_insensitively():
+    """Exported rows come back as exported; clashing or password-less rows are reported"""
+    from sqlalchemy import select
+    from database import SessionLocal
+    from models import Diocese, MassTime, Parish, ParochialNews
+    from importer import run_import
+
+    db = SessionLocal()
+    db.add(Diocese(id=1, name="Dakar"))
+    db.commit()
+    db.close()
+
+    rows = [
+        {"name": "Import", "city": "Dakar", "admin_email": "import@test.sn", "admin_password": "pw",
+         "mass_times": [{"day_of_week": "Sunday", "time": "08:00:00", "is_active": False}],
+         "news": [{"title": "old", "content": "<p>x</p>", "is_active": False, "publish_date": "2024-01-02T03:04:05"}]},
+        {"name": "Clash", "city": "Dakar", "admin_email": "ARCHIVE@test.sn", "admin_password": "pw"},
+        {"name": "No password", "city": "Dakar", "admin_email": "nopw@test.sn"},
+    ]
+    stats = run_import(enumerate(rows, 1), workers=1)
+    assert (stats.parishes, stats.mass_times, stats.news) == (1, 1, 1)
+    assert sorted(line for line, _, _ in stats.errors) == [2, 3]
+
+    db = SessionLocal()
+    try:
+        parish = db.execute(select(Parish).where(Parish.admin_email == "import@test.sn")).scalar_one()
+        assert parish.admin_password_hash
+        mass_time = db.execute(select(MassTime).where(MassTime.parish_id == parish.id)).scalar_one()
+        assert mass_time.is_active is False
+        news = db.execute(select(ParochialNews).where(ParochialNews.parish_id == parish.id)).scalar_one()
+        assert (news.is_active, news.summary, news.publish_date.year) == (False, "x", 2024)
+    finally:
+        db.close()
+
+
+# ============ Backfills ============
+
+def _strip_legacy(row: tuple) -> dict:
+    return {"city": row[0].removeprefix("legacy:")}
+
+
+def test_completed_pending_only_backfill_picks_up_new_rows():
+    """A finished backfill over "still to do" rows handles rows that match later"""
+    from sqlalchemy import select
+    from backfill import run_backfill
+    from database import SessionLocal
+    from models import Parish
+
+    def add(email):
+        db = SessionLocal()
+        db.add(Parish(name="Backfill", city="legacy:Thies", admin_email=email))
+        db.commit()
+        db.close()
+
+    def run(**kwargs):
+        return run_backfill("strip_legacy", Parish, ("city",), _strip_legacy,
+                            where=Parish.city.startswith("legacy:"), log=lambda line: None, **kwargs)
+
+    add("backfill1@test.sn")
+    assert run(pending_only=True).updated == 1
+    add("backfill2@test.sn")
+    assert run().updated == 0  # completed, no rescan without pending_only
+    assert run(pending_only=True).updated == 1
+
+    db = SessionLocal()
+    try:
+        cities = db.execute(select(Parish.city).where(Parish.name == "Backfill")).scalars().all()
+        assert cities == ["Thies", "Thies"]
+    finally:
+        db.close()
+
+
+# ============ Email Outbox ============
+
+def test_replayed_notification_is_queued_once():
+    """The same event queues one email; a new registration reusing the id queues its own"""
+    from datetime import timedelta
+    from sqlalchemy import select
+    from database import SessionLocal
+    from models import EmailOutbox, Parish
+    from email_service import notify_parish_approved
+
+    db = SessionLocal()
+    try:
+        parish = Parish(name="Outbox", city="Dakar", admin_email="outbox@test.sn")
+        db.add(parish)
+        db.flush()
+        assert parish.created_at is not None  # set on flush, as register() relies on
+
+        for _ in range(2):  # a retried approval
+            notify_parish_approved(db, parish_id=parish.id, admin_email=parish.admin_email,
+                                   parish_name=parish.name, registered_at=parish.created_at)
+            db.commit()
+        # The id reused by a later registration
+        notify_parish_approved(db, parish_id=parish.id, admin_email=parish.admin_email,
+                               parish_name=parish.name, registered_at=parish.created_at + timedelta(days=1))
+        db.commit()
+
+        keys = db.execute(
+            select(EmailOutbox.idempotency_key).where(EmailOutbox.to_address == "outbox@test.sn")
+        ).scalars().all()
+        assert len(keys) == 2 and len(set(keys)) == 2
+    finally:
+        db.close()
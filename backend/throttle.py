@@ -0,0 +1,202 @@
+"""
+Token-bucket throttling for expensive endpoints (login)
+
+Each key (an email, a client IP) gets a bucket of `burst` tokens refilled
+at `per_minute` tokens per minute; a request takes one token or is refused
+before doing any work. Buckets live in a BucketStore:
+
+  memory   - per process (default); bounded LRU of buckets
+  database - shared by all workers and instances, one row per bucket in
+             throttle_buckets, updated with a single atomic upsert
+
+Select the store with THROTTLE_BACKEND=memory|database.
+"""
+
+import os
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Optional, Tuple
+
+from sqlalchemy import case, delete, literal
+from sqlalchemy.dialects import postgresql, sqlite
+
+from database import SessionLocal, engine
+from models import ThrottleBucket
+
+THROTTLE_BACKEND = os.getenv("THROTTLE_BACKEND", "memory")
+THROTTLE_MEMORY_MAX_KEYS = int(os.getenv("THROTTLE_MEMORY_MAX_KEYS", "10000"))
+# Only behind a reverse proxy that sets it; otherwise clients can pick their IP
+TRUST_X_FORWARDED_FOR = os.getenv("TRUST_X_FORWARDED_FOR", "false").lower() == "true"
+
+
+# ============ Bucket Stores ============
+
+class BucketStore(ABC):
+    """Where buckets live; take() must be atomic for a given key"""
+
+    @abstractmethod
+    def take(self, key: str, burst: float, rate: float, now: float) -> Tuple[bool, float]:
+        """
+        Refill the bucket for the time elapsed and take one token if there is one
+
+        Args:
+            key: Bucket key, already namespaced by the limiter
+            burst: Bucket capacity
+            rate: Tokens added per second
+            now: Current time (seconds)
+
+        Returns:
+            (allowed, tokens left after the request)
+        """
+
+
+class MemoryBucketStore(BucketStore):
+    def __init__(self, max_keys: int):
+        self.max_keys = max_keys
+        self._buckets: "OrderedDict[str, Tuple[float, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def take(self, key, burst, rate, now):
+        with self._lock:
+            tokens, updated = self._buckets.get(key, (burst, now))
+            tokens = min(burst, tokens + (now - updated) * rate)
+            allowed = tokens >= 1
+            if allowed:
+                tokens -= 1
+            self._buckets[key] = (tokens, now)
+            self._buckets.move_to_end(key)
+            # A bucket evicted early only means a fresh (full) one next time
+            while len(self._buckets) > self.max_keys:
+                self._buckets.popitem(last=False)
+            return allowed, tokens
+
+
+class DatabaseBucketStore(BucketStore):
+    """Buckets in throttle_buckets (Postgres or SQLite), shared across processes"""
+
+    # Rows idle for this long are full again and can be dropped
+    PURGE_AFTER_SECONDS = 3600
+    PURGE_EVERY = 1000
+
+    def __init__(self):
+        self._calls = 0
+        self._lock = threading.Lock()
+
+    def take(self, key, burst, rate, now):
+        table = ThrottleBucket.__table__
+        dialect_insert = postgresql.insert if engine.dialect.name == "postgresql" else sqlite.insert
+
+        # Same arithmetic as MemoryBucketStore, on the stored row
+        refilled = table.c.tokens + (literal(now) - table.c.updated_at) * rate
+        refilled = case((refilled > burst, literal(float(burst))), else_=refilled)
+        stmt = dialect_insert(table).values(key=key, tokens=burst - 1, updated_at=now, allowed=True)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[table.c.key],
+            set_={
+                "tokens": case((refilled >= 1, refilled - 1), else_=refilled),
+                "allowed": refilled >= 1,
+                "updated_at": now,
+            },
+        ).returning(table.c.allowed, table.c.tokens)
+
+        db = SessionLocal()
+        try:
+            allowed, tokens = db.execute(stmt).one()
+            if self._due_for_purge():
+                db.execute(delete(ThrottleBucket).where(
+                    ThrottleBucket.updated_at < now - self.PURGE_AFTER_SECONDS
+                ))
+            db.commit()
+            return bool(allowed), tokens
+        finally:
+            db.close()
+
+    def _due_for_purge(self) -> bool:
+        with self._lock:
+            self._calls += 1
+            return self._calls % self.PURGE_EVERY == 0
+
+
+def create_store(backend: str = THROTTLE_BACKEND) -> BucketStore:
+    if backend == "database":
+        return DatabaseBucketStore()
+    if backend == "memory":
+        return MemoryBucketStore(THROTTLE_MEMORY_MAX_KEYS)
+    raise ValueError(f"THROTTLE_BACKEND inconnu: {backend}")
+
+
+store = create_store()
+
+
+# ============ Limiters ============
+
+class RateLimiter:
+    """A named token-bucket policy over the shared store, with counters"""
+
+    def __init__(self, name: str, burst: int, per_minute: float, bucket_store: Optional[BucketStore] = None):
+        self.name = name
+        self.burst = burst
+        self.rate = per_minute / 60.0
+        self.store = bucket_store
+        self.allowed = 0
+        self.rejected = 0
+        self._lock = threading.Lock()
+
+    def hit(self, key: str) -> Optional[float]:
+        """
+        Count one attempt for key
+
+        Returns:
+            None if allowed, else the seconds until a token is available
+        """
+        allowed, tokens = (self.store or store).take(f"{self.name}:{key}", self.burst, self.rate, time.time())
+        with self._lock:
+            if allowed:
+                self.allowed += 1
+            else:
+                self.rejected += 1
+        if allowed:
+            return None
+        return (1 - tokens) / self.rate if self.rate else float("inf")
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "burst": self.burst,
+                "per_minute": self.rate * 60,
+                "allowed": self.allowed,
+                "rejected": self.rejected,
+            }
+
+
+login_ip_limiter = RateLimiter(
+    "login_ip",
+    burst=int(os.getenv("LOGIN_THROTTLE_IP_BURST", "20")),
+    per_minute=float(os.getenv("LOGIN_THROTTLE_IP_PER_MINUTE", "30")),
+)
+login_email_limiter = RateLimiter(
+    "login_email",
+    burst=int(os.getenv("LOGIN_THROTTLE_EMAIL_BURST", "5")),
+    per_minute=float(os.getenv("LOGIN_THROTTLE_EMAIL_PER_MINUTE", "2")),
+)
+
+
+def client_ip(request) -> str:
+    """Client address of a request, from X-Forwarded-For when trusted"""
+    if TRUST_X_FORWARDED_FOR:
+        forwarded = request.headers.get("x-forwarded-for")
+        if forwarded:
+            # The last entry is the one our proxy appended; earlier ones are client-supplied
+            return forwarded.split(",")[-1].strip()
+    return request.client.host if request.client else "unknown"
+
+
+def get_throttle_stats() -> dict:
+    """Allowed / rejected counts per limiter (this process)"""
+    return {
+        "backend": THROTTLE_BACKEND,
+        "login_ip": login_ip_limiter.stats(),
+        "login_email": login_email_limiter.stats(),
+    }
@@ -13,6 +13,7 @@ import { Clock, Info, Calendar, MapPin } from 'lucide-react';
 const DashboardPage = () => {
   const { parishInfo } = useAuth();
   const [parish, setParish] = useState(null);
+  const [stats, setStats] = useState(null);
   const [loading, setLoading] = useState(true);
   const [error, setError] = useState(null);
 
@@ -23,8 +24,12 @@ const DashboardPage = () => {
   const fetchParishData = async () => {
     try {
       setLoading(true);
-      const data = await parishService.getMyParish();
+      const [data, statsData] = await Promise.all([
+        parishService.getMyParish(),
+        parishService.getStats({ scope: 'parish' }),
+      ]);
       setParish(data);
+      setStats(statsData);
     } catch (err) {
       console.error('Error fetching parish:', err);
       setError('Impossible de charger les données de la paroisse');
@@ -55,15 +60,10 @@ const DashboardPage = () => {
     );
   }
 
-  const massCount = parish?.mass_times?.length || 0;
-  const activeMassCount =
-    parish?.mass_times?.filter((m) => m.is_active).length || 0;
-
-  // Count masses by day
-  const sundayMasses =
-    parish?.mass_times?.filter((m) => m.day_of_week === 'Sunday').length || 0;
-  const weekdayMasses =
-    parish?.mass_times?.filter((m) => m.day_of_week !== 'Sunday').length || 0;
+  const massCount = stats?.masses.total || 0;
+  const activeMassCount = stats?.masses.active || 0;
+  const sundayMasses = stats?.masses.sunday || 0;
+  const weekdayMasses = stats?.masses.weekday || 0;
 
   return (
     <div className="min-h-screen bg-gray-50">
@@ -12,12 +12,14 @@ import { getDayName, getLanguageName, translateMassType, DAY_ORDER, formatTime }
  * Mass Times Management Page
  * Full CRUD interface for managing parish mass schedules (French UI)
  * Supports ?parish=ID query param for master admin to manage any parish
+ * Every change saves the whole schedule in one request (see saveSchedule)
  */
 const MassTimesPage = () => {
   const { parishInfo, isMasterAdmin } = useAuth();
   const [searchParams] = useSearchParams();
   const targetParishId = searchParams.get('parish') ? parseInt(searchParams.get('parish'), 10) : parishInfo?.id;
   const [parish, setParish] = useState(null);
+  const [schedule, setSchedule] = useState(null);
   const [loading, setLoading] = useState(true);
   const [error, setError] = useState(null);
   const [success, setSuccess] = useState(null);
@@ -46,10 +48,14 @@ const MassTimesPage = () => {
     try {
       setLoading(true);
       setError(null);
-      const data = targetParishId !== parishInfo?.id
-        ? await parishService.getParishById(targetParishId)
-        : await parishService.getMyParish();
+      const [data, scheduleData] = await Promise.all([
+        targetParishId !== parishInfo?.id
+          ? parishService.getParishById(targetParishId)
+          : parishService.getMyParish(),
+        parishService.getSchedule(targetParishId),
+      ]);
       setParish(data);
+      setSchedule(scheduleData);
     } catch (err) {
       console.error('Error fetching parish:', err);
       setError('Impossible de charger les horaires');
@@ -102,71 +108,64 @@ const MassTimesPage = () => {
     }));
   };
 
-  const handleAddMass = async (e) => {
-    e.preventDefault();
+  // Sends the complete schedule with the version it was loaded at; if someone
+  // else changed it since, the server answers 409 and the page reloads
+  const saveSchedule = async (massTimes, successMessage, errorMessage) => {
     setSubmitting(true);
     setError(null);
 
     try {
-      await parishService.addMassTime(targetParishId, formData);
-      setSuccess('Messe ajoutée avec succès');
-      await fetchParishData();
+      const entries = massTimes.map(({ id, day_of_week, time, language, mass_type, notes }) => ({
+        id, day_of_week, time, language, mass_type, notes,
+      }));
+      const saved = await parishService.replaceSchedule(targetParishId, entries, schedule.version);
+      setSchedule(saved);
+      setSuccess(successMessage);
       handleCloseModals();
       setTimeout(() => setSuccess(null), 3000);
     } catch (err) {
-      console.error('Error adding mass:', err);
-      setError(err.response?.data?.detail || 'Erreur lors de l\'ajout');
+      console.error('Error saving schedule:', err);
+      if (err.response?.status === 409) {
+        handleCloseModals();
+        await fetchParishData();
+      }
+      setError(err.response?.data?.detail || errorMessage);
     } finally {
       setSubmitting(false);
     }
   };
 
-  const handleUpdateMass = async (e) => {
+  const handleAddMass = (e) => {
     e.preventDefault();
-    setSubmitting(true);
-    setError(null);
-
-    try {
-      await parishService.updateMassTime(
-        targetParishId,
-        selectedMass.id,
-        formData
-      );
-      setSuccess('Messe modifiée avec succès');
-      await fetchParishData();
-      handleCloseModals();
-      setTimeout(() => setSuccess(null), 3000);
-    } catch (err) {
-      console.error('Error updating mass:', err);
-      setError(err.response?.data?.detail || 'Erreur lors de la modification');
-    } finally {
-      setSubmitting(false);
-    }
+    saveSchedule(
+      [...schedule.mass_times, formData],
+      'Messe ajoutée avec succès',
+      'Erreur lors de l\'ajout'
+    );
   };
 
-  const handleDeleteMass = async () => {
-    setSubmitting(true);
-    setError(null);
+  const handleUpdateMass = (e) => {
+    e.preventDefault();
+    saveSchedule(
+      schedule.mass_times.map((m) => (m.id === selectedMass.id ? { ...formData, id: m.id } : m)),
+      'Messe modifiée avec succès',
+      'Erreur lors de la modification'
+    );
+  };
 
-    try {
-      await parishService.deleteMassTime(targetParishId, selectedMass.id);
-      setSuccess('Messe supprimée avec succès');
-      await fetchParishData();
-      handleCloseModals();
-      setTimeout(() => setSuccess(null), 3000);
-    } catch (err) {
-      console.error('Error deleting mass:', err);
-      setError(err.response?.data?.detail || 'Erreur lors de la suppression');
-    } finally {
-      setSubmitting(false);
-    }
+  const handleDeleteMass = () => {
+    saveSchedule(
+      schedule.mass_times.filter((m) => m.id !== selectedMass.id),
+      'Messe supprimée avec succès',
+      'Erreur lors de la suppression'
+    );
   };
 
   // Group masses by day
   const groupedMasses = DAY_ORDER.map((day) => ({
     day,
     dayFr: getDayName(day),
-    masses: (parish?.mass_times || [])
+    masses: (schedule?.mass_times || [])
       .filter((m) => m.day_of_week === day)
       .sort((a, b) => a.time.localeCompare(b.time)),
   })).filter((d) => d.masses.length > 0);
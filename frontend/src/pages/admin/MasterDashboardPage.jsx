@@ -1,11 +1,13 @@
-import React, { useState, useEffect } from 'react';
+import React, { useState, useEffect, useRef } from 'react';
 import { useNavigate } from 'react-router-dom';
 import { useAuth } from '../../context/AuthContext';
 import parishService from '../../services/parishService';
 import AdminNavbar from '../../components/layout/AdminNavbar';
 import LoadingSpinner from '../../components/ui/LoadingSpinner';
 import Modal from '../../components/ui/Modal';
-import { Users, Plus, Edit2, Trash2, AlertCircle, Key, CheckCircle, XCircle, Clock, Newspaper } from 'lucide-react';
+import { Users, Plus, Edit2, Trash2, AlertCircle, Key, CheckCircle, XCircle, Clock, Newspaper, Search } from 'lucide-react';
+
+const PAGE_SIZE = 50;
 
 /**
  * Master Admin Dashboard
@@ -16,6 +18,15 @@ const MasterDashboardPage = () => {
   const { isMasterAdmin } = useAuth();
   const [parishes, setParishes] = useState([]);
   const [loading, setLoading] = useState(true);
+
+  // Server-side list: filters, sort and cursor pagination
+  const [search, setSearch] = useState('');
+  const [approvalFilter, setApprovalFilter] = useState('');
+  const [sort, setSort] = useState('name');
+  const [total, setTotal] = useState(0);
+  const [nextCursor, setNextCursor] = useState(null);
+  const [loadingMore, setLoadingMore] = useState(false);
+  const listRequest = useRef(0);
   const [error, setError] = useState(null);
   const [success, setSuccess] = useState(null);
 
@@ -30,6 +41,8 @@ const MasterDashboardPage = () => {
   // Pending registrations
   const [pendingParishes, setPendingParishes] = useState([]);
   const [pendingLoading, setPendingLoading] = useState(true);
+  const [selectedPending, setSelectedPending] = useState([]);
+  const [stats, setStats] = useState(null);
 
   // Form state for parish info
   const [formData, setFormData] = useState({
@@ -63,16 +76,44 @@ const MasterDashboardPage = () => {
       window.location.href = '/admin/dashboard';
       return;
     }
-    fetchParishes();
     fetchPending();
+    fetchStats();
   }, [isMasterAdmin]);
 
+  const fetchStats = async () => {
+    try {
+      setStats(await parishService.getStats({ scope: 'master' }));
+    } catch (err) {
+      console.error('Error fetching stats:', err);
+    }
+  };
+
+  useEffect(() => {
+    if (!isMasterAdmin) return;
+    // Debounce typing in the search box
+    const timer = setTimeout(() => fetchParishes(), search ? 300 : 0);
+    return () => clearTimeout(timer);
+  }, [isMasterAdmin, search, approvalFilter, sort]);
+
+  const listParams = (cursor) => {
+    const params = { sort, limit: PAGE_SIZE };
+    if (search.trim()) params.q = search.trim();
+    if (approvalFilter) params.approved = approvalFilter === 'approved';
+    if (cursor) params.cursor = cursor;
+    return params;
+  };
+
+  // Reloads the first page (after a filter change or an edit)
   const fetchParishes = async () => {
+    const request = ++listRequest.current;
     try {
-      setLoading(true);
       setError(null);
-      const data = await parishService.getAllParishes();
-      setParishes(data);
+      const data = await parishService.getAllParishes(listParams());
+      // Ignore responses to filters the user has since changed
+      if (request !== listRequest.current) return;
+      setParishes(data.items);
+      setTotal(data.total);
+      setNextCursor(data.next_cursor);
     } catch (err) {
       console.error('Error fetching parishes:', err);
       setError('Impossible de charger les paroisses');
@@ -81,11 +122,29 @@ const MasterDashboardPage = () => {
     }
   };
 
+  const fetchMoreParishes = async () => {
+    const request = listRequest.current;
+    try {
+      setLoadingMore(true);
+      const data = await parishService.getAllParishes(listParams(nextCursor));
+      if (request !== listRequest.current) return;
+      setParishes((prev) => [...prev, ...data.items]);
+      setTotal(data.total);
+      setNextCursor(data.next_cursor);
+    } catch (err) {
+      console.error('Error fetching parishes:', err);
+      setError('Impossible de charger les paroisses');
+    } finally {
+      setLoadingMore(false);
+    }
+  };
+
   const fetchPending = async () => {
     try {
       setPendingLoading(true);
       const data = await parishService.getPendingRegistrations();
       setPendingParishes(data);
+      setSelectedPending((prev) => prev.filter((id) => data.some((p) => p.id === id)));
     } catch (err) {
       console.error('Error fetching pending registrations:', err);
     } finally {
@@ -120,6 +179,37 @@ const MasterDashboardPage = () => {
     }
   };
 
+  const togglePending = (parishId) => {
+    setSelectedPending((prev) =>
+      prev.includes(parishId) ? prev.filter((id) => id !== parishId) : [...prev, parishId]
+    );
+  };
+
+  const toggleAllPending = () => {
+    setSelectedPending((prev) =>
+      prev.length === pendingParishes.length ? [] : pendingParishes.map((p) => p.id)
+    );
+  };
+
+  const handleBulkDecision = async (action) => {
+    try {
+      setError(null);
+      const result = await parishService.bulkParishAction(action, selectedPending);
+      setSuccess(
+        action === 'approve'
+          ? `${result.applied} paroisse(s) approuvée(s)`
+          : `${result.applied} inscription(s) rejetée(s)`
+      );
+      setSelectedPending([]);
+      fetchPending();
+      fetchParishes();
+      setTimeout(() => setSuccess(null), 3000);
+    } catch (err) {
+      console.error('Error in bulk action:', err);
+      setError(action === 'approve' ? 'Erreur lors de l\'approbation' : 'Erreur lors du rejet');
+    }
+  };
+
   const handleOpenAdd = () => {
     setFormData({
       name: '',
@@ -357,6 +447,24 @@ const MasterDashboardPage = () => {
           </div>
         </div>
 
+        {/* Platform statistics */}
+        {stats && (
+          <div className="mb-8 grid grid-cols-2 md:grid-cols-5 gap-4">
+            {[
+              ['Paroisses approuvées', stats.parishes.approved],
+              ['En attente', stats.parishes.pending_registrations],
+              ['Sans coordonnées', stats.parishes.without_coordinates],
+              ['Messes actives', stats.masses.active],
+              ['Événements à venir', stats.news.upcoming_events],
+            ].map(([label, value]) => (
+              <div key={label} className="bg-white rounded-lg shadow-md p-4">
+                <p className="text-sm text-gray-600">{label}</p>
+                <p className="text-2xl font-bold text-gray-900">{value}</p>
+              </div>
+            ))}
+          </div>
+        )}
+
         {/* Success/Error Messages */}
         {success && (
           <div className="mb-6 bg-green-50 border border-green-200 rounded-lg p-4 text-green-800">
@@ -378,11 +486,40 @@ const MasterDashboardPage = () => {
               <AlertCircle className="w-6 h-6 text-yellow-500" />
               Inscriptions en attente ({pendingParishes.length})
             </h2>
+            {selectedPending.length > 0 && (
+              <div className="mb-3 flex items-center gap-2">
+                <span className="text-sm text-gray-700">
+                  {selectedPending.length} sélectionnée(s)
+                </span>
+                <button
+                  onClick={() => handleBulkDecision('approve')}
+                  className="flex items-center gap-1 px-3 py-1.5 bg-green-600 text-white text-sm rounded-lg hover:bg-green-700 transition-colors"
+                >
+                  <CheckCircle className="w-4 h-4" />
+                  Approuver la sélection
+                </button>
+                <button
+                  onClick={() => handleBulkDecision('reject')}
+                  className="flex items-center gap-1 px-3 py-1.5 bg-red-600 text-white text-sm rounded-lg hover:bg-red-700 transition-colors"
+                >
+                  <XCircle className="w-4 h-4" />
+                  Rejeter la sélection
+                </button>
+              </div>
+            )}
             <div className="bg-yellow-50 border border-yellow-200 rounded-lg overflow-hidden">
               <div className="overflow-x-auto">
                 <table className="min-w-full divide-y divide-yellow-200">
                   <thead className="bg-yellow-100">
                     <tr>
+                      <th className="px-4 py-3">
+                        <input
+                          type="checkbox"
+                          checked={selectedPending.length === pendingParishes.length}
+                          onChange={toggleAllPending}
+                          aria-label="Tout sélectionner"
+                        />
+                      </th>
                       <th className="px-6 py-3 text-left text-xs font-medium text-yellow-800 uppercase tracking-wider">
                         Nom
                       </th>
@@ -400,6 +537,14 @@ const MasterDashboardPage = () => {
                   <tbody className="divide-y divide-yellow-200">
                     {pendingParishes.map((parish) => (
                       <tr key={parish.id}>
+                        <td className="px-4 py-4">
+                          <input
+                            type="checkbox"
+                            checked={selectedPending.includes(parish.id)}
+                            onChange={() => togglePending(parish.id)}
+                            aria-label={`Sélectionner ${parish.name}`}
+                          />
+                        </td>
                         <td className="px-6 py-4 whitespace-nowrap">
                           <div className="text-sm font-medium text-gray-900">
                             {parish.name}
@@ -443,6 +588,42 @@ const MasterDashboardPage = () => {
           </div>
         )}
 
+        {/* Search, filters and sort */}
+        <div className="mb-4 flex flex-col md:flex-row md:items-center gap-3">
+          <div className="relative flex-1">
+            <Search className="w-5 h-5 text-gray-400 absolute left-3 top-1/2 -translate-y-1/2" />
+            <input
+              type="text"
+              value={search}
+              onChange={(e) => setSearch(e.target.value)}
+              placeholder="Rechercher par nom, ville ou email"
+              className="w-full pl-10 pr-4 py-2 border border-gray-300 rounded-lg focus:ring-2 focus:ring-primary-500 focus:border-transparent"
+            />
+          </div>
+          <select
+            value={approvalFilter}
+            onChange={(e) => setApprovalFilter(e.target.value)}
+            className="px-4 py-2 border border-gray-300 rounded-lg focus:ring-2 focus:ring-primary-500 focus:border-transparent"
+          >
+            <option value="">Toutes</option>
+            <option value="approved">Approuvées</option>
+            <option value="pending">En attente</option>
+          </select>
+          <select
+            value={sort}
+            onChange={(e) => setSort(e.target.value)}
+            className="px-4 py-2 border border-gray-300 rounded-lg focus:ring-2 focus:ring-primary-500 focus:border-transparent"
+          >
+            <option value="name">Nom (A-Z)</option>
+            <option value="-name">Nom (Z-A)</option>
+            <option value="-created_at">Plus récentes</option>
+            <option value="created_at">Plus anciennes</option>
+          </select>
+          <span className="text-sm text-gray-600 whitespace-nowrap">
+            {total} paroisse{total > 1 ? 's' : ''}
+          </span>
+        </div>
+
         {/* Parishes Table */}
         {parishes.length === 0 ? (
           <div className="bg-white rounded-lg shadow-md p-12 text-center">
@@ -451,7 +632,9 @@ const MasterDashboardPage = () => {
               Aucune paroisse
             </h3>
             <p className="text-gray-600 mb-6">
-              Commencez par ajouter une nouvelle paroisse
+              {search.trim() || approvalFilter
+                ? 'Aucune paroisse ne correspond à ces critères'
+                : 'Commencez par ajouter une nouvelle paroisse'}
             </p>
             <button
               onClick={handleOpenAdd}
@@ -543,6 +726,17 @@ const MasterDashboardPage = () => {
                 </tbody>
               </table>
             </div>
+            {nextCursor && (
+              <div className="p-4 text-center border-t border-gray-200">
+                <button
+                  onClick={fetchMoreParishes}
+                  disabled={loadingMore}
+                  className="px-6 py-2 text-primary-600 border border-primary-600 rounded-lg hover:bg-primary-50 transition-colors disabled:opacity-50"
+                >
+                  {loadingMore ? 'Chargement...' : `Afficher plus (${parishes.length} / ${total})`}
+                </button>
+              </div>
+            )}
           </div>
         )}
 
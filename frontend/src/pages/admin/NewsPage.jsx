@@ -7,6 +7,8 @@ import LoadingSpinner from '../../components/ui/LoadingSpinner';
 import Modal from '../../components/ui/Modal';
 import { Newspaper, Plus, Edit2, Trash2, AlertCircle } from 'lucide-react';
 
+const PAGE_SIZE = 20;
+
 /**
  * Parish News Management Page
  * Full CRUD interface for managing parish news and activities
@@ -17,6 +19,9 @@ const NewsPage = () => {
   const [searchParams] = useSearchParams();
   const targetParishId = searchParams.get('parish') ? parseInt(searchParams.get('parish'), 10) : parishInfo?.id;
   const [news, setNews] = useState([]);
+  // The list holds summaries; the full content is loaded when editing
+  const [nextCursor, setNextCursor] = useState(null);
+  const [loadingMore, setLoadingMore] = useState(false);
   const [loading, setLoading] = useState(true);
   const [error, setError] = useState(null);
   const [success, setSuccess] = useState(null);
@@ -41,14 +46,22 @@ const NewsPage = () => {
     fetchNews();
   }, [targetParishId]);
 
+  const fetchNewsPage = (cursor) => {
+    const params = { limit: PAGE_SIZE };
+    if (cursor) params.cursor = cursor;
+    return targetParishId !== parishInfo?.id
+      ? parishService.getAdminParishNews(targetParishId, params)
+      : parishService.getMyParishNews(params);
+  };
+
+  // Reloads the first page (after an add, edit or delete)
   const fetchNews = async () => {
     try {
       setLoading(true);
       setError(null);
-      const data = targetParishId !== parishInfo?.id
-        ? await parishService.getParishNews(targetParishId)
-        : await parishService.getMyParishNews();
-      setNews(data);
+      const data = await fetchNewsPage();
+      setNews(data.items);
+      setNextCursor(data.next_cursor);
     } catch (err) {
       console.error('Error fetching news:', err);
       setError('Impossible de charger les actualités');
@@ -57,6 +70,20 @@ const NewsPage = () => {
     }
   };
 
+  const fetchMoreNews = async () => {
+    try {
+      setLoadingMore(true);
+      const data = await fetchNewsPage(nextCursor);
+      setNews((prev) => [...prev, ...data.items]);
+      setNextCursor(data.next_cursor);
+    } catch (err) {
+      console.error('Error fetching news:', err);
+      setError('Impossible de charger les actualités');
+    } finally {
+      setLoadingMore(false);
+    }
+  };
+
   const handleOpenAdd = () => {
     setFormData({
       title: '',
@@ -68,16 +95,23 @@ const NewsPage = () => {
     setAddModalOpen(true);
   };
 
-  const handleOpenEdit = (newsItem) => {
-    setSelectedNews(newsItem);
-    setFormData({
-      title: newsItem.title,
-      content: newsItem.content,
-      category: newsItem.category || 'General',
-      event_start_date: newsItem.event_start_date || '',
-      event_end_date: newsItem.event_end_date || '',
-    });
-    setEditModalOpen(true);
+  const handleOpenEdit = async (summary) => {
+    try {
+      setError(null);
+      const newsItem = await parishService.getNewsItem(targetParishId, summary.id);
+      setSelectedNews(newsItem);
+      setFormData({
+        title: newsItem.title,
+        content: newsItem.content,
+        category: newsItem.category || 'General',
+        event_start_date: newsItem.event_start_date || '',
+        event_end_date: newsItem.event_end_date || '',
+      });
+      setEditModalOpen(true);
+    } catch (err) {
+      console.error('Error fetching news item:', err);
+      setError('Impossible de charger l\'actualité');
+    }
   };
 
   const handleOpenDelete = (newsItem) => {
@@ -248,7 +282,7 @@ const NewsPage = () => {
                       </span>
                     </div>
                     <p className="text-gray-700 mb-4 whitespace-pre-wrap">
-                      {item.content}
+                      {item.summary}
                     </p>
                     {item.event_start_date && (
                       <p className="text-sm text-primary-700 font-medium mb-2">
@@ -284,6 +318,17 @@ const NewsPage = () => {
                 </div>
               </div>
             ))}
+            {nextCursor && (
+              <div className="text-center">
+                <button
+                  onClick={fetchMoreNews}
+                  disabled={loadingMore}
+                  className="px-6 py-2 text-primary-600 border border-primary-600 rounded-lg hover:bg-primary-50 transition-colors disabled:opacity-50"
+                >
+                  {loadingMore ? 'Chargement...' : 'Afficher plus'}
+                </button>
+              </div>
+            )}
           </div>
         )}
 
@@ -3,17 +3,18 @@ import { useParams, useNavigate } from 'react-router-dom';
 import parishService from '../../services/parishService';
 import LoadingSpinner from '../../components/ui/LoadingSpinner';
 import { ArrowLeft, MapPin, Phone, Globe, Mail, Clock, Newspaper, Copy, Check } from 'lucide-react';
-import { getDayName, getLanguageName, translateMassType, DAY_ORDER, formatTime } from '../../utils/translations';
+import { getDayName, getLanguageName, translateMassType, formatTime } from '../../utils/translations';
 
 // Map JS getDay() (0=Sunday) to English day names
 const JS_DAY_TO_EN = ['Sunday', 'Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday'];
 
 /**
- * Compute the next upcoming mass from a list of mass times.
+ * Compute the next upcoming mass from the schedule (grouped by day, sorted by time).
  * Returns { mass, dayEn, dayFr } or null.
  */
-function getNextMass(massTimes) {
-  if (!massTimes || massTimes.length === 0) return null;
+function getNextMass(schedule) {
+  if (!schedule || schedule.length === 0) return null;
+  const massesByDay = Object.fromEntries(schedule.map((d) => [d.day_of_week, d.masses]));
 
   const now = new Date();
   const currentDayIdx = now.getDay(); // 0=Sunday
@@ -24,9 +25,7 @@ function getNextMass(massTimes) {
   for (let offset = 0; offset < 7; offset++) {
     const dayIdx = (currentDayIdx + offset) % 7;
     const dayEn = JS_DAY_TO_EN[dayIdx];
-    const dayMasses = massTimes
-      .filter((m) => m.day_of_week === dayEn)
-      .sort((a, b) => a.time.localeCompare(b.time));
+    const dayMasses = massesByDay[dayEn] || [];
 
     for (const mass of dayMasses) {
       // For today, skip masses that already happened
@@ -45,21 +44,29 @@ const ParishDetailPage = () => {
   const { id } = useParams();
   const navigate = useNavigate();
   const [parish, setParish] = useState(null);
+  const [schedule, setSchedule] = useState([]);
   const [news, setNews] = useState([]);
+  const [newsCursor, setNewsCursor] = useState(null);
+  const [loadingMoreNews, setLoadingMoreNews] = useState(false);
+  // Full content of the items opened with "Lire la suite", by id
+  const [newsBodies, setNewsBodies] = useState({});
   const [loading, setLoading] = useState(true);
   const [error, setError] = useState(null);
   const [copied, setCopied] = useState(false);
 
   useEffect(() => {
     fetchParish();
-    fetchNews();
   }, [id]);
 
   const fetchParish = async () => {
     try {
       setLoading(true);
-      const data = await parishService.getParishById(id);
-      setParish(data);
+      const data = await parishService.getParishFull(id);
+      setParish(data.parish);
+      setSchedule(data.schedule);
+      setNews(data.news);
+      setNewsCursor(data.news_next_cursor);
+      setNewsBodies({});
     } catch (err) {
       console.error('Error fetching parish:', err);
       setError('Paroisse non trouvée');
@@ -68,32 +75,41 @@ const ParishDetailPage = () => {
     }
   };
 
-  const fetchNews = async () => {
+  const fetchMoreNews = async () => {
     try {
-      const newsData = await parishService.getParishNews(id);
-      setNews(newsData);
+      setLoadingMoreNews(true);
+      const data = await parishService.getParishNews(id, { cursor: newsCursor });
+      setNews((prev) => [...prev, ...data.items]);
+      setNewsCursor(data.next_cursor);
     } catch (err) {
       console.error('Error fetching news:', err);
+    } finally {
+      setLoadingMoreNews(false);
     }
   };
 
-  // Group masses by day
-  const groupedMasses = parish
-    ? DAY_ORDER.map((day) => ({
-        day,
-        dayFr: getDayName(day),
-        masses: (parish.mass_times || [])
-          .filter((m) => m.day_of_week === day)
-          .sort((a, b) => a.time.localeCompare(b.time)),
-      })).filter((d) => d.masses.length > 0)
-    : [];
+  const readMore = async (newsId) => {
+    try {
+      const item = await parishService.getParishNewsItem(id, newsId);
+      setNewsBodies((prev) => ({ ...prev, [newsId]: item.content }));
+    } catch (err) {
+      console.error('Error fetching news item:', err);
+    }
+  };
 
-  // Compute next mass
-  const nextMass = useMemo(
-    () => (parish ? getNextMass(parish.mass_times) : null),
-    [parish]
+  // The server returns the schedule grouped by day, Sunday first, sorted by time
+  const groupedMasses = useMemo(
+    () => schedule.map(({ day_of_week, masses }) => ({
+      day: day_of_week,
+      dayFr: getDayName(day_of_week),
+      masses,
+    })),
+    [schedule]
   );
 
+  // Compute next mass
+  const nextMass = useMemo(() => getNextMass(schedule), [schedule]);
+
   // WhatsApp share
   const handleWhatsAppShare = () => {
     const lines = [`${parish.name} - ${parish.city}`];
@@ -363,8 +379,17 @@ const ParishDetailPage = () => {
                     </span>
                   </div>
                   <p className="text-gray-700 mb-3 whitespace-pre-wrap leading-relaxed">
-                    {item.content}
+                    {newsBodies[item.id] ?? item.summary}
                   </p>
+                  {/* Summaries are cut with an ellipsis when the content is longer */}
+                  {newsBodies[item.id] === undefined && item.summary.endsWith('…') && (
+                    <button
+                      onClick={() => readMore(item.id)}
+                      className="block text-sm text-primary-600 hover:text-primary-700 font-medium mb-3"
+                    >
+                      Lire la suite
+                    </button>
+                  )}
                   {item.event_start_date && (
                     <p className="text-sm text-primary-700 font-medium mb-2">
                       {item.event_end_date
@@ -381,6 +406,17 @@ const ParishDetailPage = () => {
                   </time>
                 </article>
               ))}
+              {newsCursor && (
+                <div className="text-center">
+                  <button
+                    onClick={fetchMoreNews}
+                    disabled={loadingMoreNews}
+                    className="px-6 py-2 text-primary-600 border border-primary-600 rounded-lg hover:bg-primary-50 transition-colors disabled:opacity-50"
+                  >
+                    {loadingMoreNews ? 'Chargement...' : 'Afficher plus'}
+                  </button>
+                </div>
+              )}
             </div>
           )}
         </div>
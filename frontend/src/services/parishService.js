@@ -28,6 +28,16 @@ const parishService = {
     return response.data;
   },
 
+  /**
+   * Get a parish page in one request
+   * @param {number} id - Parish ID
+   * @returns {Promise<Object>} {parish, schedule: [{day_of_week, masses}], news (summaries), news_next_cursor}
+   */
+  getParishFull: async (id) => {
+    const response = await api.get(`/parishes/${id}/full`);
+    return response.data;
+  },
+
   /**
    * Find nearby parishes based on coordinates
    * @param {number} lat - Latitude
@@ -42,6 +52,20 @@ const parishService = {
     return response.data;
   },
 
+  /**
+   * Get events of all parishes overlapping a date range
+   * @param {Object} params - Query parameters
+   * @param {string} params.from - First day (YYYY-MM-DD, default: today)
+   * @param {string} params.to - Last day (YYYY-MM-DD, default: from + 6 days)
+   * @param {string} params.near - "latitude,longitude" (optional)
+   * @param {number} params.radius_km - Search radius with near (default: 10)
+   * @returns {Promise<Array>}
+   */
+  getEvents: async (params = {}) => {
+    const response = await api.get('/events', { params });
+    return response.data;
+  },
+
   // ============ Admin Endpoints (require authentication) ============
 
   /**
@@ -111,24 +135,116 @@ const parishService = {
     return response.data;
   },
 
+  /**
+   * Get the whole weekly schedule, inactive masses included
+   * @param {number} parishId - Parish ID
+   * @returns {Promise<Object>} { version, mass_times }
+   */
+  getSchedule: async (parishId) => {
+    const response = await api.get(`/admin/parishes/${parishId}/schedule`);
+    return response.data;
+  },
+
+  /**
+   * Replace the whole weekly schedule in one request
+   * @param {number} parishId - Parish ID
+   * @param {Array<Object>} massTimes - Complete schedule; keep `id` on existing masses
+   * @param {number} baseVersion - Version from the last load (optional, rejects with 409 if stale)
+   * @returns {Promise<Object>} { version, mass_times }
+   */
+  replaceSchedule: async (parishId, massTimes, baseVersion = null) => {
+    const response = await api.put(
+      `/admin/parishes/${parishId}/schedule`,
+      { mass_times: massTimes, base_version: baseVersion }
+    );
+    return response.data;
+  },
+
   // ============ News Endpoints ============
 
   /**
-   * Get news for a specific parish (public)
+   * Get a page of published news for a specific parish (public)
+   * Items carry a summary; load the content with getParishNewsItem
+   * @param {number} parishId - Parish ID
+   * @param {Object} params - Pagination ({ limit, cursor })
+   * @returns {Promise<Object>} {items, next_cursor}
+   */
+  getParishNews: async (parishId, params = {}) => {
+    const response = await api.get(`/parishes/${parishId}/news`, { params });
+    return response.data;
+  },
+
+  /**
+   * Get a published news item with its full content (public)
+   * @param {number} parishId - Parish ID
+   * @param {number} newsId - News ID
+   * @returns {Promise<Object>}
+   */
+  getParishNewsItem: async (parishId, newsId) => {
+    const response = await api.get(`/parishes/${parishId}/news/${newsId}`);
+    return response.data;
+  },
+
+  /**
+   * Get archived (past) news for a specific parish (public)
    * @param {number} parishId - Parish ID
+   * @param {Object} params - Pagination ({ skip, limit })
    * @returns {Promise<Array>}
    */
-  getParishNews: async (parishId) => {
-    const response = await api.get(`/parishes/${parishId}/news`);
+  getParishNewsArchive: async (parishId, params = {}) => {
+    const response = await api.get(`/parishes/${parishId}/news/archive`, { params });
     return response.data;
   },
 
   /**
-   * Get current authenticated parish news (admin)
+   * Dashboard counts, aggregated server-side
+   * @param {Object} params - Optional {scope: 'parish'|'master', parish_id}
+   * @returns {Promise<Object>} {masses: {...}, news: {...}, parishes: {...} (master scope)}
+   */
+  getStats: async (params = {}) => {
+    const response = await api.get('/admin/stats', { params });
+    return response.data;
+  },
+
+  /**
+   * Get a page of the current authenticated parish news (admin)
+   * @param {Object} params - Pagination ({ limit, cursor })
+   * @returns {Promise<Object>} {items, next_cursor}
+   */
+  getMyParishNews: async (params = {}) => {
+    const response = await api.get('/admin/parish/news', { params });
+    return response.data;
+  },
+
+  /**
+   * Get a page of a parish's news, inactive items included (admin)
+   * @param {number} parishId - Parish ID
+   * @param {Object} params - Pagination ({ limit, cursor })
+   * @returns {Promise<Object>} {items, next_cursor}
+   */
+  getAdminParishNews: async (parishId, params = {}) => {
+    const response = await api.get(`/admin/parishes/${parishId}/news`, { params });
+    return response.data;
+  },
+
+  /**
+   * Get a news item with its full content, active or not (admin)
+   * @param {number} parishId - Parish ID
+   * @param {number} newsId - News ID
+   * @returns {Promise<Object>}
+   */
+  getNewsItem: async (parishId, newsId) => {
+    const response = await api.get(`/admin/parishes/${parishId}/news/${newsId}`);
+    return response.data;
+  },
+
+  /**
+   * Get current authenticated parish archived news (admin)
+   * @param {Object} params - Pagination ({ skip, limit })
    * @returns {Promise<Array>}
    */
-  getMyParishNews: async () => {
-    const response = await api.get('/admin/parish/news');
+  getMyParishNewsArchive: async (params = {}) => {
+    const response = await api.get('/admin/parish/news/archive', { params });
     return response.data;
   },
 
@@ -177,11 +293,12 @@ const parishService = {
   // ============ Master Admin Endpoints ============
 
   /**
-   * Get all parishes (Master Admin only)
-   * @returns {Promise<Array>}
+   * Get a page of parishes (Master Admin only)
+   * @param {Object} params - Optional {q, approved, city, diocese_id, sort, limit, cursor}
+   * @returns {Promise<Object>} {items, total, next_cursor}
    */
-  getAllParishes: async () => {
-    const response = await api.get('/admin/master/parishes');
+  getAllParishes: async (params = {}) => {
+    const response = await api.get('/admin/master/parishes', { params });
     return response.data;
   },
 
@@ -245,6 +362,39 @@ const parishService = {
     return response.data;
   },
 
+  /**
+   * Approve, reject or delete several parishes in one request (Master Admin only)
+   * @param {string} action - 'approve', 'reject' or 'delete'
+   * @param {Array<number>} ids - Parish IDs
+   * @returns {Promise<Object>} {action, applied, results: [{id, status, detail}]}
+   */
+  bulkParishAction: async (action, ids) => {
+    const response = await api.post('/admin/master/parishes/bulk', { action, ids });
+    return response.data;
+  },
+
+  /**
+   * Email an announcement to every approved parish admin (Master Admin only)
+   * @param {string} subject - Email subject
+   * @param {string} message - Plain text, blank lines between paragraphs
+   * @returns {Promise<Object>} Broadcast with delivery counts
+   */
+  sendBroadcast: async (subject, message) => {
+    const response = await api.post('/admin/master/broadcasts', { subject, message });
+    return response.data;
+  },
+
+  /**
+   * Delivery status of a broadcast, per recipient (Master Admin only)
+   * @param {number} broadcastId - Broadcast ID
+   * @param {Object} params - Optional {status, skip, limit}
+   * @returns {Promise<Object>}
+   */
+  getBroadcast: async (broadcastId, params = {}) => {
+    const response = await api.get(`/admin/master/broadcasts/${broadcastId}`, { params });
+    return response.data;
+  },
+
   changePassword: async (currentPassword, newPassword) => {
     const response = await api.put('/admin/change-password', {
       current_password: currentPassword,